@@ -16,18 +16,18 @@ import json
 import mimetypes
 import os
 import random
-import re
 import socket
 import sys  # helps build file paths
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import joblib  # used to load my saved ML model
 from docx import Document
 from dotenv import load_dotenv
 
 # Flask basics for building APIs
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file
 from flask_cors import CORS  # lets my Chrome extension call this API without CORS errors
 
 # --------- Text extractors ----------
@@ -39,10 +39,36 @@ from werkzeug.exceptions import HTTPException
 # === Import matchers ===
 # - BaselineMatcher: TF-IDF + cosine similarity
 # - MatcherEmbeddings: Sentence-BERT embeddings + semantic similarity
-from ml.matcher_baseline import BaselineMatcher
+from matcher.baseline_matcher import NORMALIZE_MODE, lemma_cache_info, normalize_text
+from matcher.text_cache import NORMALIZER_VERSION, NormalizedTextCache
+from ml.corpus_idf import CorpusIdfStore
+from ml.corpus_idf import tokenize as corpus_tokenize
+from ml.embedding_backends import backend_tag as embedding_backend_tag
+from ml.embedding_backends import expected_tag as expected_embedding_tag
+from ml.embedding_backends import make_backend as make_embedding_backend
+from ml.embedding_cache import EmbeddingCache
+from ml.keyword_extractor import SpacyKeywordExtractor
+from ml.match_matrix import embedding_matrix, tfidf_matrix
+from ml.matcher_baseline import CUSTOM_STOPWORDS, BaselineMatcher
 from ml.matcher_embeddings import MatcherEmbeddings
 
-from .matcher.resume_selector import select_best_resume
+from .fill_plan import FlatProfileCache, build_fill_plan
+from .inference.background import BackgroundLoader
+from .inference.cache import PredictionCache
+from .inference.cascade import EmbeddingLabelTier, FormLabelCascade
+from .inference.exact_match import ExactLabelIndex
+from .inference.manager import ModelManager
+from .inference.stream import (
+    NDJSON_MEDIA_TYPE,
+    PredictionStream,
+    chunked,
+    labels_from_json,
+    read_ndjson_labels,
+)
+from .matcher.resume_index import ResumeTfidfIndexStore
+from .matcher.resume_selector import SELECT_METHODS, prep_text, select_best_resume
+from .matcher.skill_vocab import SkillVocabulary
+from .resume_features import ResumeFeatures, ResumeFeatureStore, feature_version
 from .storage.s3_storage import delete_object, get_bytes, put_bytes
 
 # Load .env early so S3/boto3 see AWS_* variables before we import s3_storage
@@ -75,6 +101,10 @@ MODEL_PATH = os.path.join(
     "models",  # into models/ folder
     "form_model.pkl",  # the actual pickle file
 )
+# Lean numpy export of the same model (vocab/idf/coef .npy files), written by
+# models/train_form_model.py. SFF_MODEL_BACKEND = auto | sklearn | numpy
+MODEL_ARTIFACT_DIR = os.path.join(os.path.dirname(MODEL_PATH), "form_model_np")
+MODEL_BACKEND = os.getenv("SFF_MODEL_BACKEND", "auto")
 
 # --------- App / DB setup ----------
 BASE_DIR = Path(__file__).resolve().parent
@@ -216,21 +246,251 @@ engine = create_engine(f"sqlite:///{DB_PATH}", future=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
-# === Load model once when the server starts ===
+# === Load model when the server starts (and hot-reload it after that) ===
+# A background thread checks form_model.pkl every SFF_MODEL_POLL_SECONDS and swaps
+# in a retrained model without a restart (0 turns the watcher off).
+MODEL_POLL_SECONDS = float(os.getenv("SFF_MODEL_POLL_SECONDS", "5"))
 try:
-    model = joblib.load(MODEL_PATH)
-    print(f"=== Loaded model from {MODEL_PATH} ===")
+    model_manager = ModelManager(
+        MODEL_PATH, MODEL_ARTIFACT_DIR, backend=MODEL_BACKEND, poll_seconds=MODEL_POLL_SECONDS
+    )
+    print(
+        f"=== Loaded model from {MODEL_PATH} "
+        f"({type(model_manager.model).__name__}, version {model_manager.version}) ==="
+    )
 except Exception as e:
     raise RuntimeError(f"=== Could not load model from {MODEL_PATH}: {e} ===")
+model_manager.start()
+
+# === Prediction cache ===
+# Most forms reuse the same labels, so I keep an LRU of normalized label -> prediction.
+PREDICT_CACHE_SIZE = int(os.getenv("SFF_PREDICT_CACHE_SIZE", "4096"))
+prediction_cache = PredictionCache(maxsize=PREDICT_CACHE_SIZE)
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Shared prediction cache, wiped automatically when a new model version is swapped in."""
+    prediction_cache.bind(model_manager.version)
+    return prediction_cache
+
+
+# === Exact-match tier ===
+# Labels I trained on are answered straight from the CSV (confidence 1.0).
+# Only unseen labels go through the sklearn Pipeline. Rebuilt for the new
+# classes_ whenever a reloaded model is swapped in (rebuild_label_tiers).
+LABELS_CSV_PATH = os.getenv(
+    "SFF_LABELS_CSV",
+    os.path.join(os.path.dirname(__file__), "..", "dataset", "form_labels_balanced.csv"),
+)
+exact_index = ExactLabelIndex.from_csv(
+    LABELS_CSV_PATH, classes=getattr(model_manager.model, "classes_", None)
+)
+
+
+# === Normalized text cache ===
+# normalize_text (tokenize + POS tag + lemmatize) is the slow part of /match.
+# Results are keyed by a hash of the raw text: memory LRU -> STORAGE_DIR/normalized
+# -> S3 (users/<id>/normalized/, when USE_S3_TEXT), so a stored resume only goes
+# through NLTK once.
+NORMALIZED_CACHE_SIZE = int(os.getenv("SFF_NORMALIZED_CACHE_SIZE", "256"))
+normalized_cache = NormalizedTextCache(
+    normalize_text,
+    maxsize=NORMALIZED_CACHE_SIZE,
+    disk_dir=STORAGE_DIR / "normalized",
+    remote_get=get_bytes if USE_S3_TEXT else None,
+    remote_put=put_bytes if USE_S3_TEXT else None,
+    remote_delete=delete_object if USE_S3_TEXT else None,
+    version=f"{NORMALIZER_VERSION}-{NORMALIZE_MODE}",  # full / fast outputs differ
+)
+
+
+def _owner_from_s3_path(path) -> str | None:
+    """s3://bucket/users/<id>/... -> <id>, else None (local paths)."""
+    if not _is_s3_url(path):
+        return None
+    _, key = _split_s3_url(path)
+    parts = key.split("/")
+    return parts[1] if len(parts) > 2 and parts[0] == "users" else None
+
+
+def normalize_stored_text(text: str, text_path: str = "") -> str:
+    """normalize_text() for a stored resume, through the persistent cache."""
+    return normalized_cache.normalize(text or "", user_id=_owner_from_s3_path(text_path))
+
+
+def normalize_adhoc_text(text: str) -> str:
+    """normalize_text() for request-only text (JDs, pasted resumes): memory LRU only."""
+    return normalized_cache.normalize(text or "", persist=False)
+
 
 # === Instantiate matchers ===
-tfidf_matcher = BaselineMatcher()  # baseline TF-IDF matcher
-try:
-    embedding_matcher = MatcherEmbeddings()  # try to load embedding model
-except Exception as e:
-    # If embeddings fail to load (e.g. no GPU, missing package), fall back to TF-IDF only
-    embedding_matcher = None
-    print(f"[WARNING] Could not load embeddings matcher: {e}")
+# SFF_MATCHER_IDF=corpus fits the TF-IDF IDF once over dataset/jobs_clean +
+# dataset/resumes_clean + every uploaded resume, so /match only transforms.
+# "pair" (default) keeps the original fit-on-resume+JD behaviour.
+MATCHER_IDF_MODE = os.getenv("SFF_MATCHER_IDF", "pair").lower()
+DATASET_DIR = BASE_DIR.parent / "dataset"
+corpus_idf = None
+if MATCHER_IDF_MODE == "corpus":
+    corpus_idf = CorpusIdfStore.from_folders(
+        [DATASET_DIR / "jobs_clean", DATASET_DIR / "resumes_clean"],
+        preprocess=normalized_cache.normalize,  # restarts reuse the disk cache
+        store_path=STORAGE_DIR / "corpus_idf.json",
+    )
+tfidf_matcher = BaselineMatcher(corpus_idf=corpus_idf)  # baseline TF-IDF matcher
+
+
+def index_resume(rid: str, text: str, text_path: str = "", pdf_path: str = "") -> None:
+    """Called by both backends after an upload: fold the resume into derived indexes."""
+    # the DB row is already committed: a derived index failing must not fail the upload
+    owner = _resume_owner_key(pdf_path)
+    try:
+        vocab = skill_vocab.current
+        vocab.index.add(owner, rid, vocab.matcher.extract(text or ""))
+    except Exception as e:
+        print(f"[skills] could not index resume {rid}: {e}")
+    try:
+        select_index.add(owner, rid, prep_text(text or ""), text or "")
+    except Exception as e:
+        print(f"[select_index] could not index resume {rid}: {e}")
+    try:
+        # also warms the normalized text cache, so the first /match skips NLTK
+        clean = normalize_stored_text(text, text_path)
+    except Exception as e:
+        print(f"[text_cache] could not normalize resume {rid}: {e}")
+        return
+    if corpus_idf is not None:
+        try:
+            corpus_idf.add_document(rid, clean)
+        except Exception as e:
+            print(f"[corpus_idf] could not index resume {rid}: {e}")
+    # skills / embedding / TF features run in the background; reads wait or compute
+    feature_store.submit(rid, text, user_id=_owner_from_s3_path(pdf_path))
+
+
+def unindex_resume(
+    rid: str, text: str | None = None, text_path: str = "", pdf_path: str = ""
+) -> None:
+    """Called by both backends after a delete (text = the resume text, if it was readable)."""
+    if corpus_idf is not None:
+        try:
+            corpus_idf.remove_document(rid)
+        except Exception as e:
+            print(f"[corpus_idf] could not unindex resume {rid}: {e}")
+    if text is not None:
+        normalized_cache.forget(text, user_id=_owner_from_s3_path(text_path))
+        matcher = get_embedding_matcher()
+        if matcher is not None:
+            matcher.keywords.forget([text])
+            matcher.cache.forget([text])  # memory + sqlite; other workers' LRUs age it out
+    feature_store.delete(rid, user_id=_owner_from_s3_path(pdf_path))
+    owner = _resume_owner_key(pdf_path)
+    skill_vocab.current.index.remove(owner, rid)  # in-memory only
+    try:
+        select_index.remove(owner, rid)
+    except Exception as e:
+        print(f"[select_index] could not unindex resume {rid}: {e}")
+
+
+# Embedding cache: sha256(model + text) -> vector, memory LRU + sqlite (float16) on disk,
+# so the JD the extension sends over and over is only encoded once.
+EMBED_CACHE_SIZE = int(os.getenv("SFF_EMBED_CACHE_SIZE", "1024"))
+EMBED_CACHE_DISK = os.getenv("SFF_EMBED_CACHE_DISK", "true").lower() == "true"
+EMBED_CACHE_DISK_ROWS = int(os.getenv("SFF_EMBED_CACHE_DISK_ROWS", "50000"))  # 0 = no cap
+EMBED_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+KEYWORD_CACHE_SIZE = int(os.getenv("SFF_KEYWORD_CACHE_SIZE", "512"))
+# "torch" (sentence-transformers) or "onnx" (int8 export, see scripts/export_onnx_embeddings.py)
+EMBED_BACKEND = os.getenv("SFF_EMBED_BACKEND", "torch").lower()
+EMBED_ONNX_DIR = os.getenv("SFF_EMBED_ONNX_DIR") or None
+
+# Loading: "background" (default) loads torch / sentence-transformers / spaCy on a
+# thread after import so the app serves right away; "lazy" waits for the first
+# request that wants it; "eager" blocks import like before; "off" = TF-IDF only.
+# Until it's ready, method=embedding answers with TF-IDF + an X-SFF-Fallback header.
+EMBED_LOAD = os.getenv("SFF_EMBED_LOAD", "background").lower()
+# what the vectors will come from, known before the model is loaded (feature version)
+EMBED_ID = None if EMBED_LOAD == "off" else expected_embedding_tag(EMBED_BACKEND, EMBED_MODEL_NAME)
+FALLBACK_HEADER = "X-SFF-Fallback"
+
+
+def build_embedding_matcher() -> MatcherEmbeddings:
+    embed_backend = make_embedding_backend(EMBED_BACKEND, EMBED_MODEL_NAME, EMBED_ONNX_DIR)
+    return MatcherEmbeddings(
+        EMBED_MODEL_NAME,
+        backend=embed_backend,
+        cache=EmbeddingCache(
+            embedding_backend_tag(embed_backend),  # int8 vectors get their own keys
+            maxsize=EMBED_CACHE_SIZE,
+            db_path=STORAGE_DIR / "embeddings.sqlite3" if EMBED_CACHE_DISK else None,
+            disk_maxrows=EMBED_CACHE_DISK_ROWS,
+        ),
+        # trimmed spaCy (tagger only) + keyword cache; stored resumes keep a DocBin on disk
+        keywords=SpacyKeywordExtractor(
+            cache_size=KEYWORD_CACHE_SIZE, doc_cache_dir=STORAGE_DIR / "spacy_docs"
+        ),
+    )
+
+
+embedding_loader = BackgroundLoader("embeddings matcher", build_embedding_matcher, EMBED_LOAD)
+
+
+def get_embedding_matcher() -> MatcherEmbeddings | None:
+    """The embedding matcher if it's loaded, else None (never waits for it)."""
+    return embedding_loader.get()
+
+
+def embedding_fallback_reason() -> str:
+    """Value for the X-SFF-Fallback header when embeddings were asked for but not used."""
+    state = embedding_loader.state
+    return "embeddings-loading" if state in ("pending", "loading") else f"embeddings-{state}"
+
+
+# === Form label cascade ===
+# exact CSV tier -> form model -> (optional) embedding nearest-neighbour tier.
+# The embedding tier only runs for labels the model is unsure about
+# (confidence < SFF_CASCADE_THRESHOLD) and reuses the MatcherEmbeddings model.
+# It's attached once the embedding matcher has loaded; until then the cascade
+# just stops at the form model.
+CASCADE_THRESHOLD = float(os.getenv("SFF_CASCADE_THRESHOLD", "0.5"))
+CASCADE_MIN_SIMILARITY = float(os.getenv("SFF_CASCADE_MIN_SIMILARITY", "0.6"))
+CASCADE_EMBEDDINGS = os.getenv("SFF_CASCADE_EMBEDDINGS", "false").lower() == "true"
+
+form_cascade = FormLabelCascade(
+    exact=exact_index,
+    heavy=None,
+    threshold=CASCADE_THRESHOLD,
+    min_similarity=CASCADE_MIN_SIMILARITY,
+)
+
+
+def attach_embedding_tier(matcher: MatcherEmbeddings) -> None:
+    try:
+        form_cascade.heavy = EmbeddingLabelTier.from_csv(
+            LABELS_CSV_PATH,
+            matcher.model,
+            classes=getattr(model_manager.model, "classes_", None),
+        )
+    except Exception as e:
+        print(f"[WARNING] Embedding tier disabled: {e}")
+
+
+def rebuild_label_tiers(model, version: str) -> None:
+    """
+    After a model swap: both extra tiers only answer with classes the model knows,
+    so recompile them against the new classes_ (runs in the model watcher thread).
+    """
+    global exact_index
+    classes = getattr(model, "classes_", None)
+    exact_index = ExactLabelIndex.from_csv(LABELS_CSV_PATH, classes=classes)
+    form_cascade.exact = exact_index
+    matcher = embedding_loader.get() if form_cascade.heavy is not None else None
+    if matcher is not None:
+        attach_embedding_tier(matcher)
+
+
+model_manager.on_swap(rebuild_label_tiers)
+if CASCADE_EMBEDDINGS:
+    embedding_loader.on_ready(attach_embedding_tier)
+embedding_loader.start()
 
 
 class Resume(Base):
@@ -248,11 +508,15 @@ Base.metadata.create_all(engine)
 
 
 # I keep the skill terms in a plain .txt so I can update without touching code.
-def load_skill_terms() -> list[str]:
-    # default location sits right next to the DB/data we already track
-    default_path = Path(__file__).resolve().parent / "skill_terms.txt"
-    terms_file = Path(os.getenv("SKILL_TERMS_FILE", str(default_path)))
+# default location sits right next to the DB/data we already track
+SKILL_TERMS_PATH = Path(
+    os.getenv("SKILL_TERMS_FILE", str(Path(__file__).resolve().parent / "skill_terms.txt"))
+)
+# how often I check the file for edits (seconds, 0 = only at startup)
+SKILL_RELOAD_SECONDS = float(os.getenv("SFF_SKILL_RELOAD_SECONDS", "5"))
 
+
+def load_skill_terms(terms_file: Path = SKILL_TERMS_PATH) -> list[str]:
     seen = set()
     terms: list[str] = []
 
@@ -274,8 +538,10 @@ def load_skill_terms() -> list[str]:
     return terms
 
 
-# loading once at import-time is perfect for my use-case
-SKILL_TERMS = load_skill_terms()
+# compiled matcher + per-user bitset index (/skills/gap) + version, swapped as one
+# snapshot when the file changes; grab skill_vocab.current once per request
+skill_vocab = SkillVocabulary(SKILL_TERMS_PATH, load=load_skill_terms)
+skill_vocab.watch(SKILL_RELOAD_SECONDS)
 
 
 # --- Helpers for /skills/by_resume ---
@@ -363,25 +629,39 @@ def get_resume_name_by_id(rid: str) -> str:
         return ""
 
 
-def _normalize(s: str) -> str:
-    return " ".join(s.lower().split())
+def get_resume_owner_by_id(rid: str) -> str | None:
+    """S3 owner of the resume (where its derived files are mirrored), None for local ones."""
+    try:
+        with SessionLocal() as s:
+            r = s.get(Resume, str(rid))
+            return _owner_from_s3_path(getattr(r, "pdf_path", "") or "")
+    except Exception:
+        return None
 
 
 def extract_skills_from_text(text: str):
-    t = _normalize(text)
-    hits = set()
-    multi = [s for s in SKILL_TERMS if " " in s]
-    single = [s for s in SKILL_TERMS if " " not in s]
-    # exact substring for multi-word
-    for m in multi:
-        if m in t:
-            hits.add(m)
-    # token presence for single words
-    tokens = set(re.split(r"[^a-z0-9\+#\.]+", t))
-    for s in single:
-        if s in tokens:
-            hits.add(s)
-    return sorted(hits)
+    # compiled from skill_terms.txt, recompiled when it changes (backend/matcher/skill_vocab.py)
+    return skill_vocab.current.matcher.extract(text or "")
+
+
+def extract_resume_skills(rid: str, text: str, feats: ResumeFeatures | None = None) -> list:
+    """
+    Skills of a stored resume's text. Stored features whose skills came from an
+    older vocabulary get the fresh list + stamp saved back (nothing else recomputed).
+    """
+    vocab = skill_vocab.current
+    skills = vocab.matcher.extract(text or "")
+    if feats is not None and feats.skills_version != vocab.version:
+        fresh = feats.replace(skills=skills, skills_version=vocab.version)
+        feature_store.save(rid, fresh, user_id=get_resume_owner_by_id(rid))
+    return skills
+
+
+def stored_skills(feats: ResumeFeatures | None) -> list | None:
+    """feats.skills if they were extracted with the current vocabulary, else None."""
+    if feats is not None and feats.skills_version == skill_vocab.version:
+        return feats.skills
+    return None
 
 
 def _find_pdf_for_id(rid: str):
@@ -453,6 +733,316 @@ def count_resumes(session):
     return session.query(Resume).count()
 
 
+# === Resume feature store ===
+# Upload computes normalized text, term counts, selector text, skills and (if the
+# embedding matcher is loaded) the MiniLM vector + keywords once per resume; the
+# read paths load them. Keyed by resume id + feature version, .npz under
+# STORAGE_DIR/features, mirrored to users/<id>/features/ on S3 when USE_S3 is on.
+FEATURE_CACHE_SIZE = int(os.getenv("SFF_FEATURE_CACHE_SIZE", "128"))
+
+
+def compute_resume_features(text: str) -> ResumeFeatures:
+    clean = normalize_stored_text(text)
+    counts = Counter(corpus_tokenize(clean))
+    embedding, keywords = None, None
+    matcher = get_embedding_matcher()  # still loading -> no vector yet, backfilled later
+    if matcher is not None:
+        embedding = matcher.embed_vector(text)
+        keywords = sorted(matcher.extract_keywords(text, persist=True))
+    vocab = skill_vocab.current
+    return ResumeFeatures(
+        normalized=clean,
+        selector_text=prep_text(text),
+        skills=vocab.matcher.extract(text),
+        skills_version=vocab.version,
+        terms=list(counts),
+        counts=list(counts.values()),
+        embedding=embedding,
+        keywords=keywords,
+    )
+
+
+feature_store = ResumeFeatureStore(
+    STORAGE_DIR / "features",
+    version=feature_version(
+        normalizer=normalized_cache.version,
+        embedding=EMBED_ID,  # skills carry their own vocabulary stamp (skills_version)
+    ),
+    compute=compute_resume_features,
+    remote_get=get_bytes if (USE_S3 and S3_BUCKET) else None,
+    remote_put=put_bytes if (USE_S3 and S3_BUCKET) else None,
+    remote_delete=delete_object if (USE_S3 and S3_BUCKET) else None,
+    cache_size=FEATURE_CACHE_SIZE,
+)
+
+
+def resume_features_for(r: Resume, text: str) -> ResumeFeatures | None:
+    """
+    Stored features for a DB row; computed + saved on a miss (resumes from before).
+    Features saved while the embedding matcher was still loading get recomputed in
+    the background once it's up (this call still returns them as they are).
+    """
+    user_id = _owner_from_s3_path(r.pdf_path)
+    try:
+        feats = feature_store.get(r.id, lambda: text, user_id=user_id)
+    except Exception as e:
+        print(f"[features] falling back to raw text for {r.id}: {e}")
+        return None
+    if feats.embedding is None and embedding_loader.ready and not feature_store.pending(r.id):
+        feature_store.submit(r.id, text, user_id=user_id)
+    return feats
+
+
+def match_with_embeddings(resume_text: str, jd_text: str, feats: ResumeFeatures | None = None):
+    """
+    MatcherEmbeddings.match_resume_job, reusing the stored resume vector when there
+    is one. Only call it once get_embedding_matcher() is not None.
+    """
+    matcher = get_embedding_matcher()
+    if feats is not None and feats.embedding is not None:
+        return matcher.match_precomputed(feats.embedding, feats.keywords, jd_text)
+    return matcher.match_resume_job(resume_text, jd_text)
+
+
+# /select_resume "hybrid" = alpha * tfidf + (1 - alpha) * embedding cosine
+SELECT_HYBRID_ALPHA = float(os.getenv("SFF_SELECT_HYBRID_ALPHA", "0.5"))
+# per-user resume term counts for /select_resume's TF-IDF, STORAGE_DIR/select_index/<user>.npz
+select_index = ResumeTfidfIndexStore(STORAGE_DIR / "select_index")
+
+
+def select_resume_with(
+    jd: str, items: list, prepped: list, vectors: list, method: str, tfidf_sims=None
+):
+    """
+    select_best_resume for both backends; returns (best, ranking, method used).
+    Embedding modes score every resume with one batched encode (cached / stored
+    vectors skip the model) and fall back to TF-IDF when embeddings aren't loaded
+    (yet); the handlers then add the X-SFF-Fallback header.
+    """
+    matcher = get_embedding_matcher()
+    used = method
+    if method != "tfidf" and matcher is None:
+        used = f"{method}-fallback"
+    best, ranking = select_best_resume(
+        jd,
+        items,
+        prepped,
+        method=method if matcher is not None else "tfidf",
+        embed_many=matcher.embed_many if matcher is not None else None,
+        vectors=vectors,
+        alpha=SELECT_HYBRID_ALPHA,
+        tfidf_sims=tfidf_sims,
+    )
+    return best, ranking, used
+
+
+def _read_text_or_empty(text_path) -> str:
+    try:
+        return _read_text_any(text_path)
+    except Exception:
+        return ""
+
+
+def load_selector_row(r: Resume) -> tuple[str, str]:
+    """(selector text, raw text) of a stored resume, for the /select_resume index."""
+    text = _read_text_any(r.text_path)
+    feats = resume_features_for(r, text)
+    return (feats.selector_text if feats is not None else prep_text(text)), text
+
+
+def run_select_resume(jd: str, method: str, user_id: str) -> dict:
+    """
+    Shared body of /select_resume: TF-IDF from the user's select index (only the
+    JD is analyzed; resume texts are read once, when they first enter the index),
+    stored vectors for the embedding modes. Ranking order / ties are the DB's
+    newest-first order, same as before.
+    """
+    user_key = request_owner_key(user_id)
+    with SessionLocal() as s:
+        rows = [
+            r
+            for r in s.query(Resume).order_by(Resume.created_at.desc()).all()
+            if _resume_owner_key(r.pdf_path) == user_key
+        ]
+        index = select_index.sync(user_key, [(r.id, r) for r in rows], load_selector_row)
+        by_id = {r.id: (r.original_name, r.text_path) for r in rows}
+
+    ids, sims = index.scores(prep_text(jd))
+    pos = {rid: i for i, rid in enumerate(ids)}
+    order = [r.id for r in rows if r.id in pos]
+    items = [
+        {"id": rid, "name": by_id[rid][0], "bump_terms": index.bumps.get(rid, ())}
+        for rid in order
+    ]
+    tfidf_sims = sims[[pos[rid] for rid in order]] if order else sims
+
+    vectors = None
+    if method != "tfidf" and get_embedding_matcher() is not None:
+        vectors = []
+        for item in items:
+            feats = feature_store.load(item["id"])
+            vec = feats.embedding if feats is not None else None
+            if vec is None:  # encoded from the text in the same batch as the JD
+                item["text"] = _read_text_or_empty(by_id[item["id"]][1])
+            vectors.append(vec)
+
+    best, ranking, used = select_resume_with(jd, items, None, vectors, method, tfidf_sims)
+    if best is not None:
+        best = {
+            "id": best["id"],
+            "name": best["name"],
+            "text": best.get("text") or _read_text_or_empty(by_id[best["id"]][1]),
+        }
+    return {"best": best, "ranking": ranking, "method": used}
+
+
+def match_with_tfidf(
+    resume_text: str,
+    jd_text: str,
+    feats: ResumeFeatures | None = None,
+    stored_text_path: str | None = None,
+):
+    """tfidf_matcher.get_similarity_and_missing, skipping normalize_text wherever possible."""
+    counts = None
+    if feats is not None:
+        resume_clean, counts = feats.normalized, feats.term_counts()
+    elif stored_text_path is not None:
+        resume_clean = normalize_stored_text(resume_text, stored_text_path)
+    else:
+        resume_clean = normalize_adhoc_text(resume_text)
+    return tfidf_matcher.get_similarity_and_missing(
+        resume_text,
+        jd_text,
+        resume_clean=resume_clean,
+        jd_clean=normalize_adhoc_text(jd_text),
+        resume_counts=counts,
+    )
+
+
+# === Resume x JD matrix ===
+# /match_matrix: every resume against every JD in one request. Each document is
+# normalized (or embedded) once and the scores come from one sparse / dense matmul
+# (ml/match_matrix.py); every cell matches what /match returns for that pair.
+MATCH_MATRIX_MAX = int(os.getenv("SFF_MATCH_MATRIX_MAX", "50"))  # per side
+
+
+def load_stored_resumes(resume_ids: list) -> tuple[list, list]:
+    """([{id, name, text, text_path, feats}], ids that weren't found / readable)."""
+    rows, missing = [], []
+    with SessionLocal() as s:
+        for rid in resume_ids:
+            r = s.get(Resume, rid)
+            if not r:
+                missing.append(rid)
+                continue
+            try:
+                text_path = r.text_path
+                if not text_path or not _is_s3_url(text_path):
+                    text_path = ensure_text_exists(s, r)
+                text = _read_text_any(text_path)
+            except Exception as e:
+                print(f"[match_matrix] could not read resume {rid}: {e}")
+                missing.append(rid)
+                continue
+            rows.append(
+                {
+                    "id": r.id,
+                    "name": r.original_name,
+                    "text": text,
+                    "text_path": str(text_path),
+                    "feats": resume_features_for(r, text),
+                }
+            )
+    return rows, missing
+
+
+def match_matrix(rows: list, jd_texts: list, method: str = "tfidf", top_k: int = 10) -> dict:
+    """
+    rows: load_stored_resumes() rows and/or {"text": ...} for raw resume text.
+    Returns scores[resume][jd] + missing_keywords[resume][jd] and the method used
+    ("embedding-fallback" while the embedding model isn't loaded).
+    """
+    matcher = get_embedding_matcher() if method == "embedding" else None
+    if matcher is not None:
+        stored = [
+            r["feats"] if r.get("feats") is not None and r["feats"].embedding is not None else None
+            for r in rows
+        ]
+        # one batched encode + one nlp.pipe run for everything that isn't stored
+        todo = [r["text"] for r, f in zip(rows, stored) if f is None] + list(jd_texts)
+        fresh_vecs = iter(matcher.embed_many(todo))
+        fresh_kws = iter(matcher.keywords.extract_many(todo))
+        resume_vecs, resume_kws = [], []
+        for f in stored:
+            if f is not None:
+                resume_vecs.append(f.embedding)
+                resume_kws.append(set(f.keywords))
+            else:
+                resume_vecs.append(next(fresh_vecs))
+                resume_kws.append(next(fresh_kws))
+        jd_vecs, jd_kws = list(fresh_vecs), list(fresh_kws)
+        scores, missing = embedding_matrix(resume_vecs, jd_vecs, resume_kws, jd_kws, top_k)
+        used = "embedding"
+    else:
+        cleans, counts = [], []
+        for r in rows:
+            feats = r.get("feats")
+            if feats is not None:
+                cleans.append(feats.normalized)
+                counts.append(feats.term_counts())
+            elif r.get("text_path"):
+                cleans.append(normalize_stored_text(r["text"], r["text_path"]))
+                counts.append(None)
+            else:
+                cleans.append(normalize_adhoc_text(r["text"]))
+                counts.append(None)
+        jd_cleans = [normalize_adhoc_text(jd) for jd in jd_texts]
+        snapshot = corpus_idf.snapshot() if tfidf_matcher.corpus_idf is not None else None
+        scores, missing = tfidf_matrix(
+            cleans, jd_cleans, snapshot, counts, top_k=top_k, stopwords=CUSTOM_STOPWORDS
+        )
+        used = "tfidf" if method != "embedding" else "embedding-fallback"
+    return {
+        "scores": [[round(float(x), 3) for x in row] for row in scores],
+        "missing_keywords": missing,
+        "method": used,
+    }
+
+
+def parse_match_matrix_body(data: dict) -> tuple[list, list, list, str, int]:
+    """(resume_ids, resume_texts, jd_texts, method, top_k); ValueError -> 400."""
+    resume_ids = list(data.get("resume_ids") or [])
+    resume_texts = [str(t) for t in (data.get("resumes") or [])]
+    jd_texts = [str(t) for t in (data.get("job_descriptions") or [])]
+    method = (data.get("method") or "tfidf").lower()
+    if not jd_texts or not any(t.strip() for t in jd_texts):
+        raise ValueError("job_descriptions (list of texts) is required")
+    if not resume_ids and not resume_texts:
+        raise ValueError("resume_ids and/or resumes (list of texts) is required")
+    if method not in ("tfidf", "embedding"):
+        raise ValueError("method must be tfidf or embedding")
+    if len(resume_ids) + len(resume_texts) > MATCH_MATRIX_MAX or len(jd_texts) > MATCH_MATRIX_MAX:
+        raise ValueError(f"at most {MATCH_MATRIX_MAX} resumes and {MATCH_MATRIX_MAX} JDs per call")
+    try:
+        top_k = max(0, int(data.get("top_k", 10)))
+    except (TypeError, ValueError):
+        raise ValueError("top_k must be an integer")
+    return resume_ids, resume_texts, jd_texts, method, top_k
+
+
+def run_match_matrix(data: dict) -> dict:
+    """Shared body of /match_matrix for both backends (ValueError -> 400)."""
+    resume_ids, resume_texts, jd_texts, method, top_k = parse_match_matrix_body(data)
+    rows, missing_ids = load_stored_resumes(resume_ids)
+    rows += [{"text": t, "index": i} for i, t in enumerate(resume_texts)]
+    result = match_matrix(rows, jd_texts, method, top_k)
+    result["resumes"] = [
+        {"id": r["id"], "name": r["name"]} if "id" in r else {"index": r["index"]} for r in rows
+    ]
+    result["not_found"] = missing_ids
+    return result
+
+
 # --- Deep merge ---
 def deep_merge(a: dict, b: dict) -> dict:
     for k, v in (b or {}).items():
@@ -466,7 +1056,14 @@ def deep_merge(a: dict, b: dict) -> dict:
 @app.get("/debug/skills")
 def debug_skills():
     # sanity check endpoint so I can see first 20 terms without digging logs
-    return {"count": len(SKILL_TERMS), "sample": SKILL_TERMS[:20]}
+    vocab = skill_vocab.current
+    return {
+        "count": len(vocab.terms),
+        "sample": list(vocab.terms[:20]),
+        "vocabulary": skill_vocab.stats(),
+        "matcher": vocab.matcher.stats(),
+        "index": vocab.index.stats(),
+    }
 
 
 @app.post("/skills/extract")
@@ -492,6 +1089,14 @@ def skills_by_resume():
     if not rid:
         return jsonify({"error": "resumeId required"}), 400
 
+    # 0) Skills precomputed at upload (resume feature store): no text needed at all,
+    #    unless skill_terms.txt changed since (then the text path below restamps them)
+    feats = feature_store.load(rid)
+    skills = stored_skills(feats)
+    if skills is not None:
+        name = get_resume_name_by_id(rid) or rid
+        return jsonify({"id": rid, "name": name, "skills": skills}), 200
+
     text = ""
     name = ""
 
@@ -532,10 +1137,208 @@ def skills_by_resume():
                 # Read from S3 or local
                 text = _read_text_any(text_path)
 
-    skills = extract_skills_from_text(text or "")
+    skills = extract_resume_skills(rid, text, feats)
     return jsonify({"id": rid, "name": name, "skills": skills}), 200
 
 
+# === Batch skill extraction ===
+SKILLS_BATCH_MAX = int(os.getenv("SFF_SKILLS_BATCH_MAX", "100"))  # texts + resume ids
+SKILLS_LOAD_WORKERS = int(os.getenv("SFF_SKILLS_LOAD_WORKERS", "8"))
+
+
+def load_resume_for_skills(rid: str):
+    """
+    {id, name, skills} from the feature store, {id, name, text, feats} otherwise,
+    None if the resume doesn't exist. Same lookup order as /skills/by_resume.
+    """
+    feats = feature_store.load(rid)
+    skills = stored_skills(feats)
+    if skills is not None:
+        return {"id": rid, "name": get_resume_name_by_id(rid) or rid, "skills": skills}
+
+    text = get_resume_text_by_id(rid) or ""
+    name = get_resume_name_by_id(rid) or ""
+    if not text.strip():
+        with SessionLocal() as s:
+            r = s.get(Resume, rid)
+            if not r:
+                return None
+            name = name or r.original_name or rid
+            text_path = r.text_path
+            if not text_path or (not _is_s3_url(text_path) and not os.path.exists(text_path)):
+                text_path = ensure_text_exists(s, r)
+            text = _read_text_any(text_path)
+    return {"id": rid, "name": name or rid, "text": text, "feats": feats}
+
+
+def parse_skills_batch_body(data: dict) -> tuple[dict, list]:
+    """({key: text}, resume_ids); texts can be a list (keys "0", "1", ...) or a dict."""
+    texts = data.get("texts") or {}
+    if isinstance(texts, list):
+        texts = {str(i): t for i, t in enumerate(texts)}
+    if not isinstance(texts, dict):
+        raise ValueError("texts must be a list or an object of texts")
+    resume_ids = data.get("resume_ids") or []
+    if not isinstance(resume_ids, list):
+        raise ValueError("resume_ids must be a list")
+    resume_ids = list(dict.fromkeys(str(r) for r in resume_ids if r))
+    if not texts and not resume_ids:
+        raise ValueError("texts and/or resume_ids is required")
+    if len(texts) + len(resume_ids) > SKILLS_BATCH_MAX:
+        raise ValueError(f"at most {SKILLS_BATCH_MAX} texts + resume_ids per call")
+    return {str(k): str(v or "") for k, v in texts.items()}, resume_ids
+
+
+def load_resume_skills(resume_ids: list) -> tuple[dict, list]:
+    """({rid: {id, name, skills}}, ids that weren't found / readable)."""
+    # stored texts come from disk / S3, so load them side by side; matching is CPU-only
+    loaded, not_found = {}, []
+    if not resume_ids:
+        return loaded, not_found
+    workers = max(1, min(SKILLS_LOAD_WORKERS, len(resume_ids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skills-load") as pool:
+        futures = {rid: pool.submit(load_resume_for_skills, rid) for rid in resume_ids}
+    for rid, fut in futures.items():
+        try:
+            row = fut.result()
+        except Exception as e:
+            print(f"[skills] could not read resume {rid}: {e}")
+            row = None
+        if row is None:
+            not_found.append(rid)
+            continue
+        if "skills" in row:
+            skills = row["skills"]
+        else:
+            skills = extract_resume_skills(rid, row["text"], row.get("feats"))
+        loaded[rid] = {"id": rid, "name": row["name"], "skills": skills}
+    return loaded, not_found
+
+
+def run_skills_batch(data: dict) -> dict:
+    """Shared body of /skills/extract_batch for both backends (ValueError -> 400)."""
+    texts, resume_ids = parse_skills_batch_body(data)
+    resumes, not_found = load_resume_skills(resume_ids)
+    return {
+        "texts": {key: {"skills": extract_skills_from_text(t)} for key, t in texts.items()},
+        "resumes": resumes,
+        "not_found": not_found,
+    }
+
+
+def _resume_owner_key(pdf_path) -> str:
+    """Per-user index key of a stored resume: its S3 owner, "local" for local files."""
+    return _owner_from_s3_path(pdf_path) or "local"
+
+
+def request_owner_key(user_id: str) -> str:
+    """Per-user index key for a request's userId (everything is "local" without S3)."""
+    return user_id if (USE_S3 and S3_BUCKET) else "local"
+
+
+def sync_skill_index(index, user_key: str) -> dict:
+    """
+    Every /skills/gap: line the user's rows up with the DB, since uploads / deletes
+    handled by another gunicorn worker never reached this worker's index. Only
+    resumes the index doesn't have yet are read. Returns {rid: original_name}.
+    """
+    with SessionLocal() as s:
+        rows = s.query(Resume.id, Resume.original_name, Resume.pdf_path).all()
+    names = {rid: name for rid, name, pdf_path in rows if _resume_owner_key(pdf_path) == user_key}
+
+    def load(rids):
+        loaded, _ = load_resume_skills(rids)
+        return [(rid, row["skills"]) for rid, row in loaded.items()]
+
+    index.sync(user_key, list(names), load)
+    return names
+
+
+def run_skills_gap(data: dict, user_id: str) -> dict:
+    """Shared body of /skills/gap for both backends (ValueError -> 400)."""
+    jd = str(data.get("job_description") or "")
+    if not jd.strip():
+        raise ValueError("job_description is required")
+    user_key = request_owner_key(user_id)
+    vocab = skill_vocab.current  # index + JD skills from the same vocabulary
+    names = sync_skill_index(vocab.index, user_key)
+    gap = vocab.index.gap(user_key, vocab.matcher.extract(jd))
+
+    resumes = []
+    for i, rid in enumerate(gap["ids"]):
+        if rid not in names:  # uploaded after the DB read above; next query has it
+            continue
+        resumes.append(
+            {
+                "id": rid,
+                "name": names[rid],
+                "coverage": gap["coverage"][i],
+                "covered_count": gap["covered_count"][i],
+                "covered": gap["covered"][i],
+                "missing": gap["missing"][i],
+            }
+        )
+    resumes.sort(key=lambda r: (-r["coverage"], r["name"] or ""))
+    return {"jd_skills": gap["jd_skills"], "resumes": resumes}
+
+
+@app.post("/skills/gap")
+def skills_gap():
+    """
+    POST { "job_description": "..." }
+      -> { "jd_skills": [...],
+           "resumes": [{"id", "name", "coverage", "covered_count", "covered", "missing"}] }
+    Every resume of the user against the JD's skills, best coverage first.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        return jsonify(run_skills_gap(data, _user_id_from_request())), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@app.post("/skills/extract_batch")
+def skills_extract_batch():
+    """
+    POST { "texts": ["...", ...] | {"<key>": "..."}, "resume_ids": ["<id>", ...] }
+      -> { "texts": {"<key>": {"skills": [...]}},
+           "resumes": {"<id>": {"id", "name", "skills": [...]}},
+           "not_found": ["<id>", ...] }
+    One request for a whole dashboard of resumes instead of one /skills/by_resume each.
+    """
+    try:
+        return jsonify(run_skills_batch(request.get_json(silent=True) or {})), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# === Flattened profile cache (for /fill_plan) ===
+PROFILE_CACHE_TTL = float(os.getenv("SFF_PROFILE_CACHE_TTL", "30"))
+profile_cache = FlatProfileCache(ttl_seconds=PROFILE_CACHE_TTL)
+
+
+def _profile_cache_key(user_id: str) -> str:
+    # local dev has one shared profile.json, so every user maps to the same entry
+    return user_id if (USE_S3_PROFILE and S3_BUCKET) else "local"
+
+
+def load_profile_for_user(user_id: str) -> dict:
+    """Raw profile JSON for a user (S3 or the local profile.json), {} if there is none."""
+    if USE_S3_PROFILE and S3_BUCKET:
+        try:
+            return json.loads(get_bytes(_s3_key_profile(user_id)).decode("utf-8")) or {}
+        except Exception:
+            return {}
+    if not PROFILE_PATH.exists():
+        return {}
+    with open(PROFILE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f) or {}
+
+
+def get_flat_profile(user_id: str) -> dict:
+    return profile_cache.get(_profile_cache_key(user_id), lambda: load_profile_for_user(user_id))
+
+
 @app.get("/profile")
 def get_profile():
     user_id = _user_id_from_request()
@@ -572,6 +1375,7 @@ def put_profile():
                 json.dumps(data, ensure_ascii=False).encode("utf-8"),
                 content_type="application/json; charset=utf-8",
             )
+            profile_cache.invalidate(_profile_cache_key(user_id))
             return jsonify({"ok": True, "updated_at": dt.datetime.utcnow().isoformat() + "Z"})
         except Exception as e:
             return jsonify({"error": f"Failed to write profile to S3: {e}"}), 500
@@ -581,6 +1385,7 @@ def put_profile():
         PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
         with open(PROFILE_PATH, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        profile_cache.invalidate(_profile_cache_key(user_id))
         return jsonify({"ok": True, "updated_at": dt.datetime.utcnow().isoformat() + "Z"})
     except Exception as e:
         return jsonify({"error": f"Failed to write profile: {e}"}), 500
@@ -622,6 +1427,7 @@ def patch_profile():
                 json.dumps(merged, ensure_ascii=False).encode("utf-8"),
                 content_type="application/json; charset=utf-8",
             )
+            profile_cache.invalidate(_profile_cache_key(user_id))
             return jsonify(merged)
         except Exception as e:
             return jsonify({"error": f"Failed to write profile to S3: {e}"}), 500
@@ -630,6 +1436,7 @@ def patch_profile():
         PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
         with open(PROFILE_PATH, "w", encoding="utf-8") as f:
             json.dump(merged, f, ensure_ascii=False, indent=2)
+        profile_cache.invalidate(_profile_cache_key(user_id))
     except Exception as e:
         return jsonify({"error": f"Failed to write profile: {e}"}), 500
 
@@ -779,6 +1586,7 @@ def upload_resume():
             s.add(rec)
             s.commit()
 
+        index_resume(rid, text_out, text_path_db, pdf_path_db)
         return jsonify({"item": {"id": rid, "original_name": f.filename}}), 201
 
     except Exception as e:
@@ -904,6 +1712,13 @@ def delete_resume(rid):
         if not r:
             return jsonify({"error": "Not found"}), 404
 
+        # read the text first so its normalized-text cache entry can go too
+        text_path, pdf_path = r.text_path, r.pdf_path
+        try:
+            old_text = _read_text_any(text_path) if text_path else None
+        except Exception:
+            old_text = None
+
         try:
             # Delete PDF (S3 or local)
             if _is_s3_url(r.pdf_path):
@@ -926,6 +1741,7 @@ def delete_resume(rid):
         s.delete(r)
         s.commit()
 
+    unindex_resume(rid, old_text, text_path, pdf_path)
     return jsonify({"ok": True})
 
 
@@ -933,20 +1749,16 @@ def delete_resume(rid):
 def select_resume_api():
     if request.method == "OPTIONS":
         return ("", 204)
-    jd = (request.json or {}).get("job_description", "") or ""
-    # Build a list like your old JSON format, but from the DB
-    items = []
-    with SessionLocal() as s:
-        for r in s.query(Resume).order_by(Resume.created_at.desc()).all():
-            try:
-                with open(r.text_path, "r", encoding="utf-8") as fh:
-                    txt = fh.read()
-                items.append({"id": r.id, "name": r.original_name, "text": txt})
-            except Exception:
-                continue
-    # Reuse your existing selector
-    best, ranking = select_best_resume(jd, items)
-    return jsonify({"best": best, "ranking": ranking})
+    data = request.get_json(silent=True) or {}
+    jd = data.get("job_description", "") or ""
+    method = (data.get("method") or "tfidf").lower()
+    if method not in SELECT_METHODS:
+        return jsonify({"error": f"method must be one of {', '.join(SELECT_METHODS)}"}), 400
+    result = run_select_resume(jd, method, _user_id_from_request())
+    response = jsonify(result)
+    if result["method"].endswith("-fallback"):
+        response.headers[FALLBACK_HEADER] = embedding_fallback_reason()
+    return response
 
 
 @app.route("/match", methods=["POST", "OPTIONS"])
@@ -979,6 +1791,8 @@ def match():
     jd_text = data["job_description"]
     resume_text = (data.get("resume") or "").strip()
     rid = data.get("resume_id")
+    stored_text_path = None  # set when the resume comes from storage
+    feats = None  # precomputed resume features, same
 
     # If caller didn’t send raw text, allow resume_id
     if not resume_text and rid:
@@ -995,11 +1809,14 @@ def match():
 
                 # Read text from either S3 or local
                 resume_text = _read_text_any(text_path)
+                stored_text_path = str(text_path)
             except FileNotFoundError as e:
                 return jsonify({"error": str(e)}), 404
             except Exception as e:
                 return jsonify({"error": f"Failed to load resume text: {e}"}), 500
 
+            feats = resume_features_for(r, resume_text)
+
     if not resume_text:
         return jsonify({"error": "resume (text) or resume_id is required"}), 400
 
@@ -1007,8 +1824,8 @@ def match():
     method = data.get("method", "tfidf").lower()
 
     # === Embeddings Matcher ===
-    if method == "embedding" and embedding_matcher:
-        result = embedding_matcher.match_resume_job(resume_text, jd_text)
+    if method == "embedding" and get_embedding_matcher() is not None:
+        result = match_with_embeddings(resume_text, jd_text, feats)
         return jsonify(
             {
                 "similarity_score": round(float(result["match_score"]), 3),
@@ -1018,15 +1835,45 @@ def match():
         )
 
     # === TF-IDF Baseline Matcher (default) ===
-    similarity, missing_keywords = tfidf_matcher.get_similarity_and_missing(resume_text, jd_text)
+    # stored resumes use their precomputed features / the normalized text cache
+    similarity, missing_keywords = match_with_tfidf(resume_text, jd_text, feats, stored_text_path)
 
-    return jsonify(
+    response = jsonify(
         {
             "similarity_score": round(float(similarity), 3),
             "missing_keywords": missing_keywords,
             "method": "tfidf",
         }
     )
+    if method == "embedding":  # asked for embeddings, but they aren't loaded (yet)
+        response.headers[FALLBACK_HEADER] = embedding_fallback_reason()
+    return response
+
+
+@app.route("/match_matrix", methods=["POST", "OPTIONS"])
+def match_matrix_api():
+    """
+    Every resume against every JD in one call.
+
+    Body:
+        { "resume_ids": ["..."], "resumes": ["raw text", ...],
+          "job_descriptions": ["...", ...], "method": "tfidf" | "embedding", "top_k": 10 }
+    Response:
+        { "scores": [[...]], "missing_keywords": [[...]],   # [resume][jd]
+          "resumes": [{id, name} | {index}], "not_found": [...], "method": "..." }
+    Rows are stored resumes (in resume_ids order, unknown ids skipped) then raw texts.
+    """
+    if request.method == "OPTIONS":
+        return ("", 204)
+    data = request.get_json(silent=True) or {}
+    try:
+        result = run_match_matrix(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify(result)
+    if result["method"].endswith("-fallback"):
+        response.headers[FALLBACK_HEADER] = embedding_fallback_reason()
+    return response
 
 
 # === Health check endpoint ===
@@ -1040,6 +1887,27 @@ def health():
     return jsonify({"ok": True})
 
 
+def readiness() -> tuple[bool, dict]:
+    """
+    Per-model warm state for /ready (both backends). "ready" is False only while
+    something is still loading; a model that failed or is off won't get any
+    warmer, so it doesn't hold the worker out of rotation.
+    """
+    models = {
+        "form_model": {"state": "ready", "version": model_manager.version},
+        "embeddings": {**embedding_loader.status(), "backend": EMBED_BACKEND},
+    }
+    return embedding_loader.settled, models
+
+
+# === Readiness endpoint ===
+@app.route("/ready", methods=["GET"])
+def ready():
+    """/health says the process is up; this says which models are warm (503 while loading)."""
+    ok, models = readiness()
+    return jsonify({"ready": ok, "models": models}), (200 if ok else 503)
+
+
 # === Single prediction endpoint ===
 @app.route("/predict", methods=["POST", "OPTIONS"])
 def predict():
@@ -1059,7 +1927,8 @@ def predict():
         {
           "label": "Email Address",
           "prediction": "email",
-          "confidence": 0.91
+          "confidence": 0.91,
+          "model_version": "aa54ae3e1c0f"
         }
     """
     payload = request.get_json(force=True, silent=True) or {}
@@ -1069,23 +1938,11 @@ def predict():
     if not text.strip():
         return jsonify({"error": "empty label"}), 400
 
-    # Model makes prediction
-    prediction = model.predict([text])[0]
-
-    # If model supports probabilities, grab the highest one
-    if hasattr(model, "predict_proba"):
-        probs = model.predict_proba([text])[0]
-        confidence = float(max(probs))
-    else:
-        confidence = 1.0  # fallback if model doesn’t support probabilities
-
-    return jsonify(
-        {
-            "label": text,
-            "prediction": prediction,
-            "confidence": round(confidence, 3),  # round for readability
-        }
-    )
+    # Model makes prediction + confidence in one pass (see backend/inference/engine.py).
+    # One snapshot per request, so a hot reload mid-request can't mix versions.
+    model, version = model_manager.current()
+    item = form_cascade.predict_label(model, text, cache=get_prediction_cache(), version=version)
+    return jsonify(item)
 
 
 # === Batch prediction endpoint ===
@@ -1098,14 +1955,16 @@ def predict_batch():
         { "labels": ["First Name", "Phone Number"] }
 
     What happens:
-    - Loop through each label
-    - Predict field type + confidence
-    - Collect all results in a list
+    - Vectorize every label in one go
+    - Run predict_proba once for the whole batch
+    - Take prediction + confidence from the argmax of each row
 
     Output:
         [
-          {"label": "First Name", "prediction": "name", "confidence": 0.87},
-          {"label": "Phone Number", "prediction": "phone", "confidence": 0.76}
+          {"label": "First Name", "prediction": "name", "confidence": 0.87,
+           "model_version": "aa54ae3e1c0f"},
+          {"label": "Phone Number", "prediction": "phone", "confidence": 0.76,
+           "model_version": "aa54ae3e1c0f"}
         ]
     """
     data = request.get_json(force=True, silent=True) or {}
@@ -1115,23 +1974,156 @@ def predict_batch():
     if not isinstance(labels, list):
         return jsonify({"error": "labels must be a list"}), 400
 
-    results = []
-    for text in labels:
-        if not text.strip():
-            results.append({"label": text, "prediction": None, "confidence": 0})
-            continue
+    # Vectorize the whole list once and score it with a single predict_proba call
+    model, version = model_manager.current()
+    results = form_cascade.predict_labels(
+        model, labels, cache=get_prediction_cache(), version=version
+    )
+    return jsonify(results)
+
+
+# === Streaming prediction endpoint (NDJSON) ===
+# Labels per predict_proba call while streaming; small enough that the first
+# lines go out quickly, big enough to keep the batched engine busy.
+STREAM_CHUNK_SIZE = int(os.getenv("SFF_STREAM_CHUNK_SIZE", "32"))
+
 
-        pred = model.predict([text])[0]
+@app.route("/predict_stream", methods=["POST", "OPTIONS"])
+def predict_stream():
+    if request.method == "OPTIONS":
+        return ("", 204)
+    """
+    Input, either:
+        { "labels": ["First Name", "Phone Number", ...] }   (application/json)
+    or NDJSON, one label per line (can be sent chunked):
+        "First Name"
+        {"label": "Phone Number"}
+
+    Output (application/x-ndjson), one line per label as soon as its chunk is scored:
+        {"index": 0, "label": "First Name", "prediction": "name", "confidence": 0.87, ...}
+        {"index": 1, ...}
+        {"done": true, "total": 2, "model_version": "aa54ae3e1c0f"}
+    """
+    model, version = model_manager.current()
+    cache = get_prediction_cache()
 
-        if hasattr(model, "predict_proba"):
-            probs = model.predict_proba([text])[0]
-            conf = float(max(probs))
+    def score(labels):
+        return form_cascade.predict_labels(model, labels, cache=cache, version=version)
+
+    stream = PredictionStream(score, version=version)
+
+    try:
+        if request.is_json:
+            labels = labels_from_json(request.get_json(force=True, silent=False))
         else:
-            conf = 1.0
+            # NDJSON (possibly chunked): parse lines as they come off the wire
+            labels = read_ndjson_labels(iter(lambda: request.stream.read(64 * 1024), b""))
+    except Exception as e:
+        return jsonify({"error": f"bad request body: {e}"}), 400
 
-        results.append({"label": text, "prediction": str(pred), "confidence": round(conf, 3)})
+    chunks = chunked(labels, STREAM_CHUNK_SIZE)
+    return Response(
+        stream.iter_lines(chunks),
+        mimetype=NDJSON_MEDIA_TYPE,
+        headers={"X-Model-Version": version, "Cache-Control": "no-store"},
+    )
 
-    return jsonify(results)
+
+# === Whole-form fill plan ===
+@app.route("/fill_plan", methods=["POST", "OPTIONS"])
+def fill_plan():
+    if request.method == "OPTIONS":
+        return ("", 204)
+    """
+    Input (every field on the page in one go):
+        {
+          "fields": [
+            {"label": "First Name", "name": "fname", "id": "fn", "type": "text"},
+            {"label": "Country", "name": "country", "options": ["United States", "Canada"]}
+          ],
+          "min_confidence": 0.0   # optional
+        }
+
+    What happens:
+    - One batched prediction for all the fields
+    - Each prediction is resolved against the cached, flattened profile
+      (same rules as helpers.js: first/last name, address parts, select options)
+
+    Output:
+        {
+          "fields": [
+            {"key": "fn", "label": "First Name", "prediction": "name", "confidence": 0.93,
+             "profile_key": "firstName", "value": "Jane", "status": "filled"},
+            ...
+          ],
+          "filled": 2,
+          "total": 2,
+          "model_version": "aa54ae3e1c0f"
+        }
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    fields = data.get("fields", [])
+    if not isinstance(fields, list):
+        return jsonify({"error": "fields must be a list"}), 400
+    try:
+        min_conf = float(data.get("min_confidence", 0.0) or 0.0)
+    except (TypeError, ValueError):
+        return jsonify({"error": "min_confidence must be a number"}), 400
+
+    flat = get_flat_profile(_user_id_from_request())
+    model, version = model_manager.current()
+    plan = build_fill_plan(
+        fields,
+        model,
+        flat,
+        min_confidence=min_conf,
+        cache=get_prediction_cache(),
+        version=version,
+        cascade=form_cascade,
+    )
+    filled = sum(1 for f in plan if f["status"] == "filled")
+    return jsonify({"fields": plan, "filled": filled, "total": len(plan), "model_version": version})
+
+
+# === Prediction cache stats ===
+@app.get("/debug/predict_cache")
+def debug_predict_cache():
+    # hits / misses / evictions so I can see if the cache size is right
+    return jsonify(get_prediction_cache().stats())
+
+
+# === Matcher IDF mode ===
+@app.get("/debug/matcher")
+def debug_matcher():
+    # pair vs corpus IDF, corpus size, text/lemma cache hits, resume feature store
+    stats = corpus_idf.stats() if corpus_idf is not None else {}
+    matcher = get_embedding_matcher()
+    return jsonify(
+        {
+            "mode": tfidf_matcher.mode,
+            **stats,
+            "normalized_cache": normalized_cache.stats(),
+            "lemma_cache": lemma_cache_info(),
+            "features": feature_store.stats(),
+            "select_index": select_index.stats(),
+            "embeddings": matcher.cache.stats() if matcher else None,
+            "keywords": matcher.keywords.stats() if matcher else None,
+        }
+    )
+
+
+# === Cascade tier stats ===
+@app.get("/debug/cascade")
+def debug_cascade():
+    # how many labels each tier answered and how long it took
+    return jsonify(form_cascade.describe())
+
+
+# === Model version / hot reload status ===
+@app.get("/debug/model")
+def debug_model():
+    # which model version is live, when it loaded, and whether reloads are failing
+    return jsonify(model_manager.stats())
 
 
 def choose_dev_port():
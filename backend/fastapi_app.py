@@ -21,13 +21,23 @@ import sys
 import uuid
 from typing import Any, Dict, List, Optional
 
-from fastapi import Body, FastAPI, File, HTTPException, Request, UploadFile
+from fastapi import Body, FastAPI, File, HTTPException, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 
 # I reuse everything from my existing Flask api.py so I don't duplicate logic.
 # All the DB models, S3 helpers, and ML pieces still live there.
 from . import api as legacy  # type: ignore[attr-defined]
+from .fill_plan import build_fill_plan
+from .inference.batcher import MicroBatcher
+from .inference.stream import (
+    NDJSON_MEDIA_TYPE,
+    NDJSONLabelReader,
+    PredictionStream,
+    chunked,
+    labels_from_json,
+)
 
 # Short aliases so the rest of this file reads cleaner.
 SessionLocal = legacy.SessionLocal
@@ -61,11 +71,35 @@ get_bytes = legacy.get_bytes
 put_bytes = legacy.put_bytes
 delete_object = legacy.delete_object
 
-model = legacy.model
+model_manager = legacy.model_manager
+get_prediction_cache = legacy.get_prediction_cache
+form_cascade = legacy.form_cascade
+profile_cache = legacy.profile_cache
+get_flat_profile = legacy.get_flat_profile
+_profile_cache_key = legacy._profile_cache_key
 tfidf_matcher = legacy.tfidf_matcher
-embedding_matcher = getattr(legacy, "embedding_matcher", None)
+# loaded in the background by api.py; None until it's ready (or if it failed)
+get_embedding_matcher = legacy.get_embedding_matcher
+FALLBACK_HEADER = legacy.FALLBACK_HEADER
 select_best_resume = legacy.select_best_resume
 
+# === Micro-batching for /predict ===
+# Concurrent single-label /predict calls that land within PREDICT_BATCH_WINDOW_MS
+# (or until PREDICT_BATCH_MAX_SIZE labels are queued) get scored in one model call.
+# Set the window to 0 to turn batching off.
+PREDICT_BATCH_WINDOW_MS = float(os.getenv("SFF_BATCH_WINDOW_MS", "2"))
+PREDICT_BATCH_MAX_SIZE = int(os.getenv("SFF_BATCH_MAX_SIZE", "64"))
+
+
+def _score_batch(labels: List[str]) -> List[Dict[str, Any]]:
+    model, version = model_manager.current()
+    return form_cascade.predict_labels(model, labels, cache=get_prediction_cache(), version=version)
+
+
+predict_batcher = MicroBatcher(
+    _score_batch, window_ms=PREDICT_BATCH_WINDOW_MS, max_batch=PREDICT_BATCH_MAX_SIZE
+)
+
 app = FastAPI(title="Smart Form Filler – FastAPI backend")
 
 # For now I keep CORS wide open so the Chrome extension + local React dev server
@@ -102,6 +136,13 @@ async def health() -> Dict[str, Any]:
     return {"ok": True}
 
 
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """Per-model warm state, same as Flask /ready (503 while a model is still loading)."""
+    ok, models = legacy.readiness()
+    return JSONResponse({"ready": ok, "models": models}, status_code=200 if ok else 503)
+
+
 # === Profile ===
 
 
@@ -161,6 +202,7 @@ async def put_profile(
                 json.dumps(data, ensure_ascii=False).encode("utf-8"),
                 content_type="application/json; charset=utf-8",
             )
+            profile_cache.invalidate(_profile_cache_key(user_id))
             return JSONResponse(content=data, status_code=200)
         except Exception as e:  # pragma: no cover
             raise HTTPException(status_code=500, detail=f"Failed to write profile to S3: {e}")
@@ -170,6 +212,7 @@ async def put_profile(
         PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
         with open(PROFILE_PATH, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        profile_cache.invalidate(_profile_cache_key(user_id))
     except Exception as e:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Failed to write profile: {e}")
 
@@ -215,6 +258,7 @@ async def patch_profile(
                 json.dumps(merged, ensure_ascii=False).encode("utf-8"),
                 content_type="application/json; charset=utf-8",
             )
+            profile_cache.invalidate(_profile_cache_key(user_id))
             return JSONResponse(content=merged, status_code=200)
         except Exception as e:  # pragma: no cover
             raise HTTPException(status_code=500, detail=f"Failed to write profile to S3: {e}")
@@ -223,6 +267,7 @@ async def patch_profile(
         PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
         with open(PROFILE_PATH, "w", encoding="utf-8") as f:
             json.dump(merged, f, ensure_ascii=False, indent=2)
+        profile_cache.invalidate(_profile_cache_key(user_id))
     except Exception as e:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Failed to write profile: {e}")
 
@@ -359,6 +404,7 @@ async def upload_resume(
             s.add(rec)
             s.commit()
 
+        legacy.index_resume(rid, text_out, text_path_db, pdf_path_db)
         return JSONResponse(
             content={"item": {"id": rid, "original_name": file.filename}}, status_code=201
         )
@@ -472,6 +518,13 @@ async def delete_resume(rid: str) -> Dict[str, bool]:
         if not r:
             raise HTTPException(status_code=404, detail="Not found")
 
+        # read the text first so its normalized-text cache entry can go too
+        text_path, pdf_path = r.text_path, r.pdf_path
+        try:
+            old_text = _read_text_any(text_path) if text_path else None
+        except Exception:
+            old_text = None
+
         try:
             # Delete PDF
             if _is_s3_url(r.pdf_path):
@@ -492,6 +545,7 @@ async def delete_resume(rid: str) -> Dict[str, bool]:
         s.delete(r)
         s.commit()
 
+    legacy.unindex_resume(rid, old_text, text_path, pdf_path)
     return {"ok": True}
 
 
@@ -504,7 +558,14 @@ async def debug_skills() -> Dict[str, Any]:
     Quick sanity endpoint so I can see how many skill terms are loaded
     and peek at the first few.
     """
-    return {"count": len(legacy.SKILL_TERMS), "sample": legacy.SKILL_TERMS[:20]}
+    vocab = legacy.skill_vocab.current
+    return {
+        "count": len(vocab.terms),
+        "sample": list(vocab.terms[:20]),
+        "vocabulary": legacy.skill_vocab.stats(),
+        "matcher": vocab.matcher.stats(),
+        "index": vocab.index.stats(),
+    }
 
 
 @app.post("/skills/extract")
@@ -530,6 +591,14 @@ async def skills_by_resume(body: Dict[str, Any] = Body(default_factory=dict)) ->
     if not rid:
         raise HTTPException(status_code=400, detail="resumeId required")
 
+    # 0) Skills precomputed at upload (resume feature store): no text needed at all,
+    #    unless skill_terms.txt changed since (then the text path below restamps them)
+    feats = legacy.feature_store.load(rid)
+    skills = legacy.stored_skills(feats)
+    if skills is not None:
+        name = legacy.get_resume_name_by_id(rid) or rid
+        return JSONResponse(content={"id": rid, "name": name, "skills": skills}, status_code=200)
+
     text = ""
     name = ""
 
@@ -568,45 +637,77 @@ async def skills_by_resume(body: Dict[str, Any] = Body(default_factory=dict)) ->
 
                 text = _read_text_any(text_path)
 
-    skills = extract_skills_from_text(text or "")
+    skills = legacy.extract_resume_skills(rid, text, feats)
     return JSONResponse(content={"id": rid, "name": name, "skills": skills}, status_code=200)
 
 
+@app.post("/skills/gap")
+async def skills_gap(
+    request: Request, body: Dict[str, Any] = Body(default_factory=dict)
+) -> Dict[str, Any]:
+    """
+    JD skill coverage for every resume of the user at once (bitset index),
+    same body / response as the Flask endpoint.
+    """
+    try:
+        return await run_in_threadpool(
+            legacy.run_skills_gap, body or {}, _user_id_from_request(request)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/skills/extract_batch")
+async def skills_extract_batch(body: Dict[str, Any] = Body(default_factory=dict)) -> Dict[str, Any]:
+    """
+    Skills for many raw texts and stored resume ids in one call, same body /
+    response as the Flask endpoint (results keyed by text key / resume id).
+    """
+    try:
+        return await run_in_threadpool(legacy.run_skills_batch, body or {})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # === Matching & selection ===
 
 
 @app.post("/select_resume")
-async def select_resume_api(body: Dict[str, Any] = Body(default_factory=dict)) -> Dict[str, Any]:
+async def select_resume_api(
+    request: Request, response: Response, body: Dict[str, Any] = Body(default_factory=dict)
+) -> Dict[str, Any]:
     """
     Given a job description, pick the best resume I have stored.
 
-    For now this just reuses select_best_resume from my matcher module
-    and reads resume text straight from disk (same as Flask).
+    Same as Flask: TF-IDF scores come from the user's persistent select index
+    (only the JD gets analyzed per call), then select_best_resume ranks them.
+    "method": "tfidf" (default) | "embedding" | "hybrid"; the embedding modes
+    score all resumes with one batched encode and fall back to TF-IDF without
+    the embedding model ("<method>-fallback" in the response + X-SFF-Fallback header).
     """
     jd = (body or {}).get("job_description", "") or ""
-    items: List[Dict[str, Any]] = []
-
-    with SessionLocal() as s:
-        for r in s.query(Resume).order_by(Resume.created_at.desc()).all():
-            try:
-                with open(r.text_path, "r", encoding="utf-8") as fh:
-                    txt = fh.read()
-                items.append({"id": r.id, "name": r.original_name, "text": txt})
-            except Exception:
-                continue
-
-    best, ranking = select_best_resume(jd, items)
-    return {"best": best, "ranking": ranking}
+    method = ((body or {}).get("method") or "tfidf").lower()
+    if method not in legacy.SELECT_METHODS:
+        raise HTTPException(
+            status_code=400, detail=f"method must be one of {', '.join(legacy.SELECT_METHODS)}"
+        )
+    result = await run_in_threadpool(
+        legacy.run_select_resume, jd, method, _user_id_from_request(request)
+    )
+    if result["method"].endswith("-fallback"):
+        response.headers[FALLBACK_HEADER] = legacy.embedding_fallback_reason()
+    return result
 
 
 @app.post("/match")
-async def match(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+async def match(response: Response, body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     """
     Compare a resume against a job description.
 
     Supports:
     - classic TF-IDF baseline (default)
-    - embedding matcher (Sentence-BERT) if it's available
+    - embedding matcher (Sentence-BERT) if it's available; while it's still
+      loading the answer is TF-IDF with an X-SFF-Fallback header
     """
 
     if not body or "job_description" not in body:
@@ -619,6 +720,8 @@ async def match(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     # Prefer explicit resume text if provided
     resume_text = (body.get("resume") or "").strip()
     rid = body.get("resume_id")
+    stored_text_path = None  # set when the resume comes from storage
+    feats = None  # precomputed resume features, same
 
     # Allow callers to send just a resume id and pull the text on my side.
     if not resume_text and rid:
@@ -632,6 +735,8 @@ async def match(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
                     if not text_path or not _is_s3_url(text_path):
                         text_path = ensure_text_exists(s, r)
                     resume_text = _read_text_any(text_path)
+                    stored_text_path = str(text_path)
+                    feats = legacy.resume_features_for(r, resume_text)
         except FileNotFoundError as e:
             print(f"[match] text file missing for resume {rid}: {e}")
             resume_text = ""
@@ -651,9 +756,9 @@ async def match(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
         }
 
     # Embedding-based matcher (if I have it loaded and requested).
-    if method == "embedding" and embedding_matcher:
+    if method == "embedding" and get_embedding_matcher() is not None:
         try:
-            result = embedding_matcher.match_resume_job(resume_text, jd_text)
+            result = legacy.match_with_embeddings(resume_text, jd_text, feats)
             return {
                 "similarity_score": round(float(result["match_score"]), 3),
                 "missing_keywords": result.get("missing_skills", []),
@@ -664,7 +769,12 @@ async def match(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
             print(f"[match] embedding matcher failed, falling back to tfidf: {e}")
 
     # TF-IDF baseline matcher (default path / embedding fallback).
-    similarity, missing_keywords = tfidf_matcher.get_similarity_and_missing(resume_text, jd_text)
+    # Stored resumes use their precomputed features / the normalized text cache.
+    similarity, missing_keywords = legacy.match_with_tfidf(
+        resume_text, jd_text, feats, stored_text_path
+    )
+    if method == "embedding":
+        response.headers[FALLBACK_HEADER] = legacy.embedding_fallback_reason()
     return {
         "similarity_score": round(float(similarity), 3),
         "missing_keywords": missing_keywords,
@@ -672,6 +782,24 @@ async def match(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     }
 
 
+@app.post("/match_matrix")
+async def match_matrix(
+    response: Response, body: Dict[str, Any] = Body(default_factory=dict)
+) -> Dict[str, Any]:
+    """
+    Every resume (resume_ids and/or raw "resumes" texts) against every JD in
+    "job_descriptions", same body / response as the Flask endpoint:
+    scores[resume][jd] + missing_keywords[resume][jd] from one matmul.
+    """
+    try:
+        result = await run_in_threadpool(legacy.run_match_matrix, body or {})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result["method"].endswith("-fallback"):
+        response.headers[FALLBACK_HEADER] = legacy.embedding_fallback_reason()
+    return result
+
+
 # === Prediction ===
 
 
@@ -687,25 +815,19 @@ async def predict(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
         {
           "label": "Email Address",
           "prediction": "...",
-          "confidence": 0.91
+          "confidence": 0.91,
+          "model_version": "aa54ae3e1c0f"
         }
     """
     text = (body or {}).get("label", "") or ""
     if not text.strip():
         raise HTTPException(status_code=400, detail="empty label")
 
-    prediction = model.predict([text])[0]
-    if hasattr(model, "predict_proba"):
-        probs = model.predict_proba([text])[0]
-        confidence = float(max(probs))
-    else:
-        confidence = 1.0
-
-    return {
-        "label": text,
-        "prediction": str(prediction),
-        "confidence": round(confidence, 3),
-    }
+    if predict_batcher.enabled:
+        # Shares one model call with any other /predict requests in the same window.
+        return await predict_batcher.submit(text)
+    model, version = model_manager.current()
+    return form_cascade.predict_label(model, text, cache=get_prediction_cache(), version=version)
 
 
 @app.post("/predict_batch")
@@ -726,22 +848,138 @@ async def predict_batch(body: Dict[str, Any] = Body(...)) -> List[Dict[str, Any]
     if not isinstance(labels, list):
         raise HTTPException(status_code=400, detail="labels must be a list")
 
-    results: List[Dict[str, Any]] = []
-    for text in labels:
-        if not isinstance(text, str) or not text.strip():
-            results.append({"label": text, "prediction": None, "confidence": 0})
-            continue
+    # One vectorizer pass + one predict_proba call for the whole list.
+    model, version = model_manager.current()
+    return form_cascade.predict_labels(model, labels, cache=get_prediction_cache(), version=version)
+
+
+@app.post("/predict_stream")
+async def predict_stream(request: Request) -> StreamingResponse:
+    """
+    Streaming version of /predict_batch.
+
+    Accepts a JSON list / {"labels": [...]} or an NDJSON body (one label per
+    line, can be chunked) and streams NDJSON results back as each chunk is
+    scored. Same line format as the Flask endpoint:
+        {"index": 0, "label": "...", "prediction": "...", "confidence": 0.87, ...}
+        ...
+        {"done": true, "total": N, "model_version": "..."}
+    """
+    model, version = model_manager.current()
+    cache = get_prediction_cache()
+    size = legacy.STREAM_CHUNK_SIZE
+
+    def score(labels: List[Any]) -> List[Dict[str, Any]]:
+        return form_cascade.predict_labels(model, labels, cache=cache, version=version)
+
+    stream = PredictionStream(score, version=version)
 
-        pred = model.predict([text])[0]
-        if hasattr(model, "predict_proba"):
-            probs = model.predict_proba([text])[0]
-            conf = float(max(probs))
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            labels = labels_from_json(await request.json())
         else:
-            conf = 1.0
+            # NDJSON (possibly chunked): parse lines as the body arrives
+            reader = NDJSONLabelReader()
+            labels = []
+            async for data in request.stream():
+                labels.extend(reader.feed(data))
+            labels.extend(reader.close())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"bad request body: {e}")
+
+    async def body():
+        # score chunk by chunk off the event loop, sending each chunk as it's ready
+        for part in chunked(labels, size):
+            yield await run_in_threadpool(stream.render, part)
+        yield stream.trailer()
+
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Model-Version": version, "Cache-Control": "no-store"},
+    )
+
 
-        results.append({"label": text, "prediction": str(pred), "confidence": round(conf, 3)})
+@app.post("/fill_plan")
+async def fill_plan(request: Request, body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """
+    Whole-form fill plan: every field descriptor on the page in, field -> value out.
+
+    Input:
+        { "fields": [ {"label", "name", "id", "placeholder", "type", "options"}, ... ],
+          "min_confidence": 0.0 }
 
-    return results
+    One batched prediction for all fields, resolved against the cached, flattened
+    profile. Same payload as the Flask endpoint.
+    """
+    fields = (body or {}).get("fields", [])
+    if not isinstance(fields, list):
+        raise HTTPException(status_code=400, detail="fields must be a list")
+    try:
+        min_conf = float((body or {}).get("min_confidence", 0.0) or 0.0)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="min_confidence must be a number")
+
+    flat = get_flat_profile(_user_id_from_request(request))
+    model, version = model_manager.current()
+    plan = build_fill_plan(
+        fields,
+        model,
+        flat,
+        min_confidence=min_conf,
+        cache=get_prediction_cache(),
+        version=version,
+        cascade=form_cascade,
+    )
+    filled = sum(1 for f in plan if f["status"] == "filled")
+    return {"fields": plan, "filled": filled, "total": len(plan), "model_version": version}
+
+
+@app.get("/debug/predict_cache")
+async def debug_predict_cache() -> Dict[str, Any]:
+    """
+    Hit/miss/eviction counters for the label prediction cache.
+    Same payload as the Flask endpoint.
+    """
+    return get_prediction_cache().stats()
+
+
+@app.get("/debug/matcher")
+async def debug_matcher() -> Dict[str, Any]:
+    """TF-IDF matcher IDF mode, corpus size, text caches and feature store, same as Flask."""
+    stats = legacy.corpus_idf.stats() if legacy.corpus_idf is not None else {}
+    matcher = get_embedding_matcher()
+    return {
+        "mode": tfidf_matcher.mode,
+        **stats,
+        "normalized_cache": legacy.normalized_cache.stats(),
+        "lemma_cache": legacy.lemma_cache_info(),
+        "features": legacy.feature_store.stats(),
+        "select_index": legacy.select_index.stats(),
+        "embeddings": matcher.cache.stats() if matcher else None,
+        "keywords": matcher.keywords.stats() if matcher else None,
+    }
+
+
+@app.get("/debug/cascade")
+async def debug_cascade() -> Dict[str, Any]:
+    """Per-tier label counts + latencies for the form label cascade (same as Flask)."""
+    return form_cascade.describe()
+
+
+@app.get("/debug/model")
+async def debug_model() -> Dict[str, Any]:
+    """Live model version, load time and hot-reload counters (same as Flask)."""
+    return model_manager.stats()
+
+
+@app.get("/debug/batcher")
+async def debug_batcher() -> Dict[str, Any]:
+    """
+    Micro-batcher settings + batch-size histogram for /predict,
+    so I can tune the window against tail latency.
+    """
+    return predict_batcher.stats()
 
 
 def choose_dev_port_v2() -> int:
@@ -0,0 +1,387 @@
+"""
+Server-side fill plan for a whole form
+--------------------------------------
+
+Today the extension sends bare label strings to /predict_batch and then
+resolves values itself in JS (background.js flattens the profile, helpers.js
+picks first/last name, address parts, select options...). That's several round
+trips per page.
+
+/fill_plan takes the full field descriptors for a page instead:
+    { "label", "name", "id", "placeholder", "type", "options" }
+runs ONE batched prediction for all of them, resolves each prediction against
+a cached, pre-flattened profile, and returns the complete field -> value plan.
+
+The resolution rules here mirror extension/helpers.js (resolveValueAndKey,
+chooseSelectOption) and tests/value_resolver.py (flatten_profile), so the
+server and the extension agree on what goes where.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .inference.engine import predict_labels
+
+# --- Profile flattening -------------------------------------------------------
+
+
+def _month_year(month, year) -> str:
+    if month and year:
+        try:
+            return f"{int(month):02d}/{year}"
+        except (TypeError, ValueError):
+            return ""
+    return ""
+
+
+def flatten_profile(p: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Flatten the nested profile.json into the single-level keys the filler uses.
+    Same keys as tests/value_resolver.flatten_profile, plus education/eligibility.
+    """
+    p = dict(p or {})
+    personal = p.get("personal", p) or {}
+    address = p.get("address", {}) or {}
+    links = p.get("links", {}) or {}
+    elig = p.get("eligibility", {}) or {}
+
+    exp = p.get("experience")
+    exp0 = (exp or [{}])[0] if isinstance(exp, list) else (exp or {})
+    edu = p.get("education")
+    edu0 = (edu or [{}])[0] if isinstance(edu, list) else (edu or {})
+    exp0, edu0 = exp0 or {}, edu0 or {}
+
+    first = (personal.get("firstName") or "").strip()
+    last = (personal.get("lastName") or "").strip()
+    full = (personal.get("fullName") or "").strip()
+    if not full and (first or last):
+        full = f"{first} {last}".strip()
+
+    phone = re.sub(r"\s+", "", str(personal.get("phoneNumber") or personal.get("phone") or ""))
+
+    flat = {
+        "firstName": first or (full.split()[0] if full else ""),
+        "lastName": last or (full.split()[-1] if full and len(full.split()) > 1 else ""),
+        "fullName": full,
+        "email": personal.get("email", ""),
+        "phoneNumber": phone,
+        "dob": personal.get("dob", "") or personal.get("date_of_birth", ""),
+        "gender": personal.get("gender", ""),
+        "street": address.get("street", "")
+        or address.get("address1", "")
+        or address.get("address_line1", ""),
+        "city": address.get("city", "") or address.get("town", ""),
+        "state": address.get("state", "")
+        or address.get("province", "")
+        or address.get("region", ""),
+        "zip": address.get("zip", "")
+        or address.get("postal", "")
+        or address.get("postcode", "")
+        or address.get("zipcode", ""),
+        "country": address.get("country", ""),
+        "county": address.get("county", ""),
+        "linkedin": links.get("linkedin", ""),
+        "github": links.get("github", "") or links.get("portfolio", ""),
+        "website": links.get("website", ""),
+        "company": exp0.get("company", ""),
+        "jobTitle": exp0.get("jobTitle", ""),
+        "roleDescription": exp0.get("description", ""),
+        "start_date": _month_year(exp0.get("startMonth"), exp0.get("startYear")),
+        "end_date": _month_year(exp0.get("endMonth"), exp0.get("endYear")),
+        "school": edu0.get("school", ""),
+        "degree": edu0.get("degreeLong", "") or edu0.get("degreeShort", ""),
+        "fieldOfStudy": edu0.get("field", ""),
+        "graduationYear": str(edu0.get("endYear", "") or ""),
+        "highestEducation": p.get("highestEducation", "") or p.get("educationHighest", ""),
+        "yearsOfExperience": str(p.get("yearsOfExperience", "") or ""),
+        "ethnicity": elig.get("ethnicity", ""),
+        "race": elig.get("race", ""),
+        "veteran": elig.get("veteran", ""),
+        "disability": elig.get("disability", ""),
+        "workAuthorization": str(
+            elig.get("workAuthorization", "")
+            or elig.get("authUS", "")
+            or personal.get("workAuthorization", "")
+        ),
+        "requiresSponsorship": str(
+            elig.get("requiresSponsorship", "")
+            or elig.get("sponsorship", "")
+            or personal.get("requiresSponsorship", "")
+        ),
+    }
+    return {k: (v if isinstance(v, str) else str(v or "")) for k, v in flat.items()}
+
+
+class FlatProfileCache:
+    """
+    Per-user cache of the flattened profile.
+
+    Profile writes (PUT/PATCH /profile) call invalidate() once the write went
+    through; the TTL covers writes that happened in another gunicorn worker.
+    A load that was already running when invalidate() came in may have read the
+    old profile, so its result is returned but not cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl = float(ttl_seconds)
+        self._data: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._generation = 0  # bumped by every invalidate()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Dict[str, Any]]) -> Dict[str, str]:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+            generation = self._generation
+        flat = flatten_profile(loader() or {})
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = (now + self.ttl, flat)
+        return flat
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+# --- Field text + value resolution (mirrors extension/helpers.js) ------------
+
+
+def _humanize(token: str) -> str:
+    """'firstName' / 'first_name' / 'first-name' -> 'first name'."""
+    token = re.sub(r"([a-z])([A-Z])", r"\1 \2", token or "")
+    return " ".join(re.split(r"[_\-\.\[\]\s]+", token)).strip().lower()
+
+
+def field_text(field: Dict[str, Any]) -> str:
+    """Best text to classify: visible label, then placeholder, then name/id."""
+    for key in ("label", "placeholder", "aria_label", "ariaLabel"):
+        val = field.get(key)
+        if isinstance(val, str) and val.strip():
+            return val.strip()
+    for key in ("name", "id"):
+        val = field.get(key)
+        if isinstance(val, str) and val.strip():
+            return _humanize(val)
+    return ""
+
+
+def _infer_name_part(text: str) -> Optional[str]:
+    t = text.lower()
+    if re.search(r"\b(first|given)\b", t):
+        return "firstName"
+    if re.search(r"\b(last|surname|family)\b", t):
+        return "lastName"
+    return None
+
+
+def _infer_address_part(text: str) -> Optional[str]:
+    t = text.lower()
+    if re.search(r"\bzip\b|\bpostal\s*code\b|\bpostcode\b", t):
+        return "zip"
+    if re.search(r"\bcity\b|\btown\b", t):
+        return "city"
+    if re.search(r"\bstate\b|\bprovince\b|\bregion\b", t):
+        return "state"
+    if re.search(r"\bcountry\b|\bnation\b", t):
+        return "country"
+    if re.search(r"\bcounty\b", t):
+        return "county"
+    if re.search(r"street|address\s*line\s*1|\baddress\b|\bline\s*1\b|\baddr\b", t):
+        return "street"
+    return None
+
+
+def _first_hint(text: str, rules: List[Tuple[str, str]], default: Optional[str]) -> Optional[str]:
+    t = text.lower()
+    for pattern, key in rules:
+        if re.search(pattern, t):
+            return key
+    return default
+
+
+_SOCIAL_RULES = [
+    (r"linked\s*in", "linkedin"),
+    (r"git\s*hub|portfolio", "github"),
+    (r"web", "website"),
+]
+_EDU_RULES = [
+    (r"degree", "degree"),
+    (r"major|field|study|concentration", "fieldOfStudy"),
+    (r"graduat|year", "graduationYear"),
+    (r"school|university|college|institut", "school"),
+]
+_DEMO_RULES = [
+    (r"gender|sex\b", "gender"),
+    (r"ethnic|hispanic|latin", "ethnicity"),
+    (r"race", "race"),
+    (r"veteran", "veteran"),
+    (r"disab", "disability"),
+]
+
+# Model field_type -> profile key when the label itself doesn't say more.
+CLASS_TO_KEY = {
+    "name": "fullName",
+    "email": "email",
+    "phone": "phoneNumber",
+    "birth_date": "dob",
+    "company": "company",
+    "job_title": "jobTitle",
+    "start_date": "start_date",
+    "end_date": "end_date",
+    "role_description": "roleDescription",
+    "highest_education": "highestEducation",
+    "years_of_experience": "yearsOfExperience",
+}
+
+
+def resolve_profile_key(prediction: Optional[str], text: str) -> Optional[str]:
+    """Pick the flattened-profile key for a predicted field_type + its label text."""
+    if not prediction:
+        return None
+
+    if prediction == "name":
+        return _infer_name_part(text) or "fullName"
+    if re.search(r"highest\s+(education|degree)", text, re.I):
+        return "highestEducation"
+    if re.search(r"years?\s+of\s+(professional\s+)?experience", text, re.I):
+        return "yearsOfExperience"
+    if prediction == "address":
+        return _infer_address_part(text) or "street"
+    if prediction == "social":
+        return _first_hint(text, _SOCIAL_RULES, "linkedin")
+    if prediction == "education":
+        return _first_hint(text, _EDU_RULES, "school")
+    if prediction == "demographics":
+        return _first_hint(text, _DEMO_RULES, None)
+    if prediction == "work_auth":
+        return "requiresSponsorship" if re.search(r"sponsor", text, re.I) else "workAuthorization"
+    return CLASS_TO_KEY.get(prediction)
+
+
+def _norm(s: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "", str(s or "").lower())
+
+
+def match_option(value: str, options: List[Any]) -> Optional[str]:
+    """
+    Same order as chooseSelectOption in content.js:
+    exact normalized text/value first, then "contains" match.
+    Options can be plain strings or {"text": ..., "value": ...}.
+    """
+    want = _norm(value)
+    if not want:
+        return None
+    opts = []
+    for opt in options or []:
+        if isinstance(opt, dict):
+            text, val = str(opt.get("text", "") or ""), str(opt.get("value", "") or "")
+        else:
+            text = val = str(opt)
+        opts.append((val or text, _norm(text), _norm(val)))
+
+    for val, ntext, nval in opts:
+        if want in (ntext, nval):
+            return val
+    for val, ntext, nval in opts:
+        if (ntext and want in ntext) or (nval and want in nval):
+            return val
+    return None
+
+
+def _format_for_input(value: str, input_type: str) -> str:
+    """Massage dates into what <input type="date|month"> expects."""
+    input_type = (input_type or "").lower()
+    if input_type not in ("date", "month") or not value:
+        return value
+    m = re.match(r"^(\d{1,2})/(\d{4})$", value)  # MM/YYYY from the profile
+    if m:
+        yyyy, mm = m.group(2), m.group(1).zfill(2)
+        return f"{yyyy}-{mm}" if input_type == "month" else f"{yyyy}-{mm}-01"
+    m = re.match(r"^(\d{1,2})/(\d{1,2})/(\d{4})$", value)  # MM/DD/YYYY
+    if m:
+        value = f"{m.group(3)}-{m.group(1).zfill(2)}-{m.group(2).zfill(2)}"
+    if input_type == "month" and re.match(r"^\d{4}-\d{2}-\d{2}$", value):
+        return value[:7]
+    return value
+
+
+def _field_key(field: Dict[str, Any], index: int) -> str:
+    for key in ("key", "id", "name"):
+        val = field.get(key)
+        if isinstance(val, str) and val.strip():
+            return val
+    return str(index)
+
+
+def build_fill_plan(
+    fields: List[Any],
+    model,
+    flat: Dict[str, str],
+    min_confidence: float = 0.0,
+    cache=None,
+    exact=None,
+    version: Optional[str] = None,
+    cascade=None,
+) -> List[Dict[str, Any]]:
+    """
+    Predict every field in one call and resolve each one to a profile value.
+    With a `cascade` (inference/cascade.py) its tiers replace the exact + model pass.
+    """
+    fields = [f if isinstance(f, dict) else {"label": f} for f in fields]
+    texts = [field_text(f) for f in fields]
+    if cascade is not None:
+        predictions = cascade.predict_labels(model, texts, cache=cache, version=version)
+    else:
+        predictions = predict_labels(model, texts, cache=cache, exact=exact, version=version)
+
+    plan: List[Dict[str, Any]] = []
+    for i, (field, text, pred) in enumerate(zip(fields, texts, predictions)):
+        entry = {
+            "key": _field_key(field, i),
+            "label": text,
+            "prediction": pred["prediction"],
+            "confidence": pred["confidence"],
+            "profile_key": None,
+            "value": None,
+            "status": "skipped",
+        }
+        plan.append(entry)
+
+        if not pred["prediction"]:
+            entry["reason"] = "no label text"
+            continue
+        if pred["confidence"] < min_confidence:
+            entry["reason"] = "low confidence"
+            continue
+
+        profile_key = resolve_profile_key(pred["prediction"], text)
+        entry["profile_key"] = profile_key
+        value = flat.get(profile_key, "") if profile_key else ""
+        if not value:
+            entry["reason"] = "no profile value"
+            continue
+
+        options = field.get("options")
+        if options:
+            chosen = match_option(value, options)
+            if chosen is None:
+                entry["reason"] = "no matching option"
+                continue
+            value = chosen
+        else:
+            value = _format_for_input(value, field.get("type", ""))
+
+        entry["value"] = value
+        entry["status"] = "filled"
+    return plan
@@ -0,0 +1,141 @@
+"""
+Background model loading
+------------------------
+
+api.py used to build MatcherEmbeddings at import time, so torch,
+sentence-transformers and spaCy all had to load before the app could answer
+even /health. Every gunicorn worker boot and uvicorn reload paid for that.
+
+BackgroundLoader owns one heavy object instead:
+
+- mode "background": start() loads it on a daemon thread right after import
+- mode "lazy":       the first get() kicks off that same thread load
+- mode "eager":      start() loads it in the caller's thread (the old behaviour)
+- mode "off":        never loaded
+
+get() never blocks: it's the object once it's ready, None before that (or if
+loading failed), so callers fall back (TF-IDF for method=embedding) instead of
+waiting. status() is what /ready reports.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+MODES = ("background", "lazy", "eager", "off")
+
+
+class BackgroundLoader:
+    def __init__(self, name: str, factory: Callable[[], Any], mode: str = "background"):
+        if mode not in MODES:
+            raise ValueError(f"unknown load mode {mode!r}, expected one of {MODES}")
+        self.name = name
+        self.factory = factory
+        self.mode = mode
+
+        self._value: Any = None
+        self._state = "off" if mode == "off" else "pending"
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._callbacks: List[Callable[[Any], None]] = []
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.load_ms: Optional[float] = None
+        if mode == "off":
+            self._done.set()
+
+    # --- loading ---
+
+    def start(self) -> None:
+        """Begin loading per the mode ("lazy" and "off" wait for / ignore get())."""
+        if self.mode == "eager":
+            self._begin(threaded=False)
+        elif self.mode == "background":
+            self._begin(threaded=True)
+
+    def _begin(self, threaded: bool) -> None:
+        with self._lock:
+            if self._state != "pending":
+                return  # already loading / loaded / failed
+            self._state = "loading"
+            self.started_at = time.time()
+        if threaded:
+            threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True).start()
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        t0 = time.perf_counter()
+        callbacks: List[Callable[[Any], None]] = []
+        try:
+            value = self.factory()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            with self._lock:
+                self._state = "failed"
+            print(f"[WARNING] Could not load {self.name}: {e}")
+        else:
+            with self._lock:
+                self._value = value
+                self._state = "ready"
+                callbacks, self._callbacks = self._callbacks, []
+            print(f"=== {self.name} ready ({(time.perf_counter() - t0):.1f}s) ===")
+        finally:
+            self.load_ms = round((time.perf_counter() - t0) * 1000.0, 1)
+            self._done.set()
+        for callback in callbacks:
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"[WARNING] {self.name} on_ready hook failed: {e}")
+
+    def on_ready(self, callback: Callable[[Any], None]) -> None:
+        """Run callback(value) once loaded (right away if it already is)."""
+        with self._lock:
+            ready = self._state == "ready"
+            if not ready:
+                self._callbacks.append(callback)
+        if ready:
+            callback(self._value)
+
+    # --- reading ---
+
+    def get(self) -> Any:
+        """The loaded object, or None while it's loading / if it failed / is off."""
+        if self._state == "ready":
+            return self._value
+        if self.mode == "lazy" and self._state == "pending":
+            self._begin(threaded=True)
+        return None
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """get(), but block up to `timeout` seconds for a load in progress."""
+        value = self.get()
+        if value is None and self._state == "loading":
+            self._done.wait(timeout)
+            value = self.get()
+        return value
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def ready(self) -> bool:
+        return self._state == "ready"
+
+    @property
+    def settled(self) -> bool:
+        """Nothing left to wait for: ready, failed, off, or lazy and not asked for yet."""
+        return self._state != "loading"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self._state,
+            "mode": self.mode,
+            "started_at": self.started_at,
+            "load_ms": self.load_ms,
+            "error": self.error,
+        }
@@ -0,0 +1,152 @@
+"""
+Async micro-batcher for /predict
+--------------------------------
+
+When lots of extension users fill forms at the same time, FastAPI gets a
+stream of tiny /predict calls (one label each). Scoring them one by one
+wastes the batched engine, so this collects labels that arrive within a short
+window (default 2 ms) or until max_batch labels are queued, scores them with
+one vectorized call, and resolves each caller's future.
+
+- scoring runs in the default thread pool so the event loop stays free
+- per-batch sizes go into a histogram so window/max_batch can be tuned
+  against tail latency
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Tuple
+
+ScoreFn = Callable[[List[str]], List[Dict[str, Any]]]
+
+
+class _LoopQueue:
+    """Pending labels for one event loop (TestClient can spin up several loops)."""
+
+    def __init__(self) -> None:
+        self.items: List[Tuple[str, asyncio.Future, float]] = []
+        self.timer: asyncio.TimerHandle | None = None
+        self.tasks: set = set()  # keep refs so in-flight batches aren't garbage collected
+
+
+class MicroBatcher:
+    def __init__(self, score_fn: ScoreFn, window_ms: float = 2.0, max_batch: int = 64):
+        self.score_fn = score_fn
+        self.window_ms = float(window_ms)
+        self.max_batch = max(1, int(max_batch))
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopQueue]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        # stats
+        self._lock = threading.Lock()
+        self._edges = self._bucket_edges(self.max_batch)
+        self._hist = [0] * len(self._edges)
+        self.batches = 0
+        self.labels = 0
+        self.flush_full = 0
+        self.flush_timer = 0
+        self.max_wait_ms = 0.0
+        self._wait_ms_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_ms > 0 and self.max_batch > 1
+
+    @staticmethod
+    def _bucket_edges(max_batch: int) -> List[int]:
+        # 1, 2, 4, 8, ... up to (and including) max_batch
+        edges, n = [], 1
+        while n < max_batch:
+            edges.append(n)
+            n *= 2
+        edges.append(max_batch)
+        return edges
+
+    async def submit(self, label: str) -> Dict[str, Any]:
+        """Queue one label and wait for its batched result."""
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = self._queues[loop] = _LoopQueue()
+
+        fut: asyncio.Future = loop.create_future()
+        queue.items.append((label, fut, time.perf_counter()))
+
+        if len(queue.items) >= self.max_batch:
+            self._flush(loop, queue, reason="full")
+        elif queue.timer is None:
+            delay = self.window_ms / 1000.0
+            queue.timer = loop.call_later(delay, self._flush, loop, queue, "timer")
+
+        return await fut
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, queue: _LoopQueue, reason: str) -> None:
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+
+        while queue.items:
+            batch = queue.items[: self.max_batch]
+            del queue.items[: self.max_batch]
+            self._record(batch, reason)
+            task = loop.create_task(self._run(loop, batch))
+            queue.tasks.add(task)
+            task.add_done_callback(queue.tasks.discard)
+
+    async def _run(self, loop: asyncio.AbstractEventLoop, batch) -> None:
+        labels = [label for label, _, _ in batch]
+        try:
+            results = await loop.run_in_executor(None, self.score_fn, labels)
+        except Exception as e:  # hand the error to every waiting caller
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut, _), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    def _record(self, batch, reason: str) -> None:
+        now = time.perf_counter()
+        waits = [(now - t0) * 1000.0 for _, _, t0 in batch]
+        size = len(batch)
+        with self._lock:
+            self.batches += 1
+            self.labels += size
+            if reason == "full":
+                self.flush_full += 1
+            else:
+                self.flush_timer += 1
+            for i, edge in enumerate(self._edges):
+                if size <= edge:
+                    self._hist[i] += 1
+                    break
+            self._wait_ms_total += sum(waits)
+            self.max_wait_ms = max(self.max_wait_ms, max(waits))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hist, lower = {}, 1
+            for edge, count in zip(self._edges, self._hist):
+                key = str(edge) if lower == edge else f"{lower}-{edge}"
+                hist[key] = count
+                lower = edge + 1
+            return {
+                "enabled": self.enabled,
+                "window_ms": self.window_ms,
+                "max_batch": self.max_batch,
+                "batches": self.batches,
+                "labels": self.labels,
+                "mean_batch_size": round(self.labels / self.batches, 2) if self.batches else 0.0,
+                "batch_size_histogram": hist,
+                "flush_reasons": {"full": self.flush_full, "timer": self.flush_timer},
+                "mean_queue_wait_ms": (
+                    round(self._wait_ms_total / self.labels, 3) if self.labels else 0.0
+                ),
+                "max_queue_wait_ms": round(self.max_wait_ms, 3),
+            }
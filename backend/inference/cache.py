@@ -0,0 +1,104 @@
+"""
+LRU cache in front of the form model
+------------------------------------
+
+The same few hundred labels ("First Name", "Email Address", "Zip / Postal Code")
+show up on almost every ATS form, so there is no point re-running the full
+Pipeline for them on every /predict call.
+
+- keys are normalized labels (see normalize.py)
+- values are (prediction, confidence) tuples
+- bounded: oldest entry is evicted once maxsize is reached
+- tied to a model "version": if the version changes, everything is dropped,
+  and reads/writes tagged with an older version are ignored (a request that
+  started before a hot reload can't poison the cache for the new model)
+- thread-safe (gunicorn runs the Flask app with several threads)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+CachedPrediction = Tuple[str, float]
+
+
+def model_file_signature(path: str) -> str:
+    """
+    Cheap fingerprint of the model file (mtime + size).
+
+    One os.stat per request is basically free compared to a predict_proba call,
+    and it changes whenever a retrained form_model.pkl is copied over.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+class PredictionCache:
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = max(0, int(maxsize))
+        self._data: "OrderedDict[str, CachedPrediction]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def bind(self, version: str) -> None:
+        """Attach the cache to a model version; a different version wipes it."""
+        with self._lock:
+            if self._version == version:
+                return
+            if self._version is not None:
+                self._data.clear()
+                self.invalidations += 1
+            self._version = version
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[CachedPrediction]:
+        with self._lock:
+            value = self._data.get(key) if version in (None, self._version) else None
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: CachedPrediction, version: Optional[str] = None) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "model_version": self._version,
+            }
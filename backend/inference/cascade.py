@@ -0,0 +1,259 @@
+"""
+Confidence-tiered cascade for form labels
+-----------------------------------------
+
+Every label used to go through the same TF-IDF + LogisticRegression model.
+The cascade keeps cheap labels cheap and only pays for a heavier model when
+LR isn't sure:
+
+1. "exact"     - labels from the training CSV (normalized dict lookup, conf 1.0)
+2. "model"     - the form model (batched, behind the prediction cache)
+3. "embedding" - optional: nearest neighbour over the embedded training labels,
+                 using the same SentenceTransformer as MatcherEmbeddings.
+                 Only runs for labels whose LR confidence is below `threshold`,
+                 and only wins if its cosine similarity clears `min_similarity`.
+
+Every result gets a "tier" field, and per-tier label counts + latencies are kept
+so the expensive tier's share can be watched on /debug/cascade.
+"""
+
+from __future__ import annotations
+
+import csv
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import PredictionCache
+from .engine import predict_labels
+from .exact_match import ExactLabelIndex
+from .normalize import normalize_label
+
+TIERS = ("exact", "model", "embedding")
+
+
+class EmbeddingLabelTier:
+    """
+    Nearest-neighbour classifier over the embedded training labels.
+
+    `encoder` is anything with SentenceTransformer's encode(list_of_texts, ...).
+    The training labels are embedded lazily on first use so startup isn't
+    slowed down for a tier that may never be hit.
+    """
+
+    def __init__(self, encoder, labels: Sequence[str], field_types: Sequence[str]):
+        self.encoder = encoder
+        self.labels = list(labels)
+        self.field_types = np.asarray(list(field_types))
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path,
+        encoder,
+        classes: Optional[Iterable[str]] = None,
+        label_col: str = "label_text",
+        type_col: str = "field_type",
+    ) -> "EmbeddingLabelTier":
+        allowed = {str(c) for c in classes} if classes is not None else None
+        pairs: Dict[Tuple[str, str], str] = {}
+        with open(Path(csv_path), "r", encoding="utf-8", newline="") as fh:
+            for row in csv.DictReader(fh):
+                label = (row.get(label_col) or "").strip()
+                field_type = (row.get(type_col) or "").strip()
+                if not label or not field_type:
+                    continue
+                if allowed is not None and field_type not in allowed:
+                    continue
+                pairs.setdefault((normalize_label(label), field_type), label)
+        return cls(encoder, list(pairs.values()), [ft for _, ft in pairs])
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        vecs = self.encoder.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        vecs = np.asarray(vecs, dtype=np.float32)
+        # normalize again in case the encoder ignored normalize_embeddings
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        return vecs / np.where(norms > 0, norms, 1.0)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    self._matrix = self._encode(self.labels)
+        return self._matrix
+
+    def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """(field_type, cosine similarity) of the closest training label, per text."""
+        if not texts or not self.labels:
+            return []
+        sims = self._encode(texts) @ self.matrix.T
+        best = sims.argmax(axis=1)
+        return [(str(self.field_types[j]), float(sims[i, j])) for i, j in enumerate(best)]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class CascadeStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.labels = {tier: 0 for tier in TIERS}
+        self.calls = {tier: 0 for tier in TIERS}
+        self.ms = {tier: 0.0 for tier in TIERS}
+        self.escalated = 0
+        self.overridden = 0
+
+    def bump(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def record(self, tier: str, n_labels: int, ms: float) -> None:
+        with self._lock:
+            self.labels[tier] += n_labels
+            self.calls[tier] += 1
+            self.ms[tier] += ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.labels.values())
+            tiers = {}
+            for tier in TIERS:
+                calls, ms = self.calls[tier], self.ms[tier]
+                tiers[tier] = {
+                    "labels": self.labels[tier],
+                    "share": round(self.labels[tier] / total, 4) if total else 0.0,
+                    "calls": calls,
+                    "total_ms": round(ms, 3),
+                    "mean_ms_per_call": round(ms / calls, 3) if calls else 0.0,
+                }
+            return {
+                "labels": total,
+                "tiers": tiers,
+                "escalated": self.escalated,
+                "overridden": self.overridden,
+            }
+
+
+class FormLabelCascade:
+    def __init__(
+        self,
+        exact: Optional[ExactLabelIndex] = None,
+        heavy: Optional[EmbeddingLabelTier] = None,
+        threshold: float = 0.5,
+        min_similarity: float = 0.6,
+        heavy_cache_size: int = 1024,
+    ):
+        self.exact = exact
+        self.heavy = heavy
+        self.threshold = float(threshold)
+        self.min_similarity = float(min_similarity)
+        # the heavy tier gets its own small LRU; the model's cache only holds LR answers
+        self.heavy_cache = PredictionCache(maxsize=heavy_cache_size)
+        self.stats = CascadeStats()
+
+    def predict_labels(
+        self,
+        model,
+        labels: List[Any],
+        cache: Optional[PredictionCache] = None,
+        version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Same output as engine.predict_labels, plus a "tier" field per scored label."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(labels)
+        rest: List[int] = []
+
+        # --- tier 1: exact ---
+        t0 = time.perf_counter()
+        n_exact = 0
+        for i, text in enumerate(labels):
+            known = None
+            if self.exact is not None and isinstance(text, str) and text.strip():
+                known = self.exact.lookup_normalized(normalize_label(text))
+            if known is None:
+                rest.append(i)
+                continue
+            results[i] = {"label": text, "prediction": known, "confidence": 1.0, "tier": "exact"}
+            n_exact += 1
+        if n_exact:
+            self.stats.record("exact", n_exact, (time.perf_counter() - t0) * 1000.0)
+
+        # --- tier 2: LR model (blank labels come back as prediction None) ---
+        if rest:
+            t0 = time.perf_counter()
+            scored = predict_labels(model, [labels[i] for i in rest], cache=cache, version=version)
+            n_scored = sum(1 for item in scored if item["prediction"] is not None)
+            if n_scored:
+                self.stats.record("model", n_scored, (time.perf_counter() - t0) * 1000.0)
+            for i, item in zip(rest, scored):
+                if item["prediction"] is not None:
+                    item["tier"] = "model"
+                results[i] = item
+
+        # --- tier 3: embeddings, only for unsure LR answers ---
+        if self.heavy is not None:
+            unsure = [
+                i
+                for i in rest
+                if results[i]["prediction"] is not None
+                and results[i]["confidence"] < self.threshold
+            ]
+            if unsure:
+                self._escalate(labels, unsure, results, version)
+
+        if version is not None:
+            for item in results:
+                item["model_version"] = version
+        return results  # type: ignore[return-value]
+
+    def _escalate(self, labels, unsure: List[int], results, version) -> None:
+        self.stats.bump("escalated", len(unsure))
+        self.heavy_cache.bind(version or "")
+
+        keys = {i: normalize_label(labels[i]) for i in unsure}
+        answers: Dict[str, Tuple[str, float]] = {}
+        todo: List[str] = []
+        for key in dict.fromkeys(keys.values()):
+            hit = self.heavy_cache.get(key)
+            if hit is not None:
+                answers[key] = hit
+            else:
+                todo.append(key)
+
+        t0 = time.perf_counter()
+        if todo:
+            for key, answer in zip(todo, self.heavy.predict(todo)):
+                answers[key] = answer
+                self.heavy_cache.put(key, answer)
+        self.stats.record("embedding", len(unsure), (time.perf_counter() - t0) * 1000.0)
+
+        for i in unsure:
+            pred, sim = answers[keys[i]]
+            if sim >= self.min_similarity:
+                results[i] = {
+                    "label": labels[i],
+                    "prediction": pred,
+                    "confidence": round(sim, 3),
+                    "tier": "embedding",
+                }
+                self.stats.bump("overridden")
+
+    def predict_label(self, model, text: str, cache=None, version=None) -> Dict[str, Any]:
+        return self.predict_labels(model, [text], cache=cache, version=version)[0]
+
+    def describe(self) -> Dict[str, Any]:
+        out = self.stats.snapshot()
+        out.update(
+            {
+                "threshold": self.threshold,
+                "min_similarity": self.min_similarity,
+                "embedding_tier": self.heavy is not None,
+                "exact_labels": len(self.exact) if self.exact is not None else 0,
+            }
+        )
+        return out
@@ -0,0 +1,122 @@
+"""
+Form-field inference engine
+---------------------------
+
+Both backends (Flask in api.py and FastAPI in fastapi_app.py) used to loop
+over the labels and call model.predict([text]) and then
+model.predict_proba([text]) for every single field. That runs the char_wb
+TF-IDF vectorizer twice per label, which adds up fast on 100+ field forms.
+
+This module does it in one pass:
+- answer labels we trained on straight from the exact-match index (conf 1.0)
+- look up each normalized label in the (optional) LRU cache
+- vectorize the remaining unique labels once
+- call predict_proba once
+- take prediction + confidence from the argmax of that one matrix
+
+Results come back in the exact shape the endpoints already return:
+    { "label": "...", "prediction": "...", "confidence": 0.87 }
+plus "model_version" when the caller passes one (see manager.py).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import PredictionCache
+from .exact_match import ExactLabelIndex
+from .normalize import normalize_label
+
+
+def _is_scorable(text: Any) -> bool:
+    """Only non-empty strings go to the model; everything else gets a blank row."""
+    return isinstance(text, str) and bool(text.strip())
+
+
+def _empty_result(text: Any) -> Dict[str, Any]:
+    # Same placeholder the batch endpoints have always used for blank labels.
+    return {"label": text, "prediction": None, "confidence": 0}
+
+
+def _result(text: str, prediction: str, confidence: float) -> Dict[str, Any]:
+    return {"label": text, "prediction": prediction, "confidence": round(confidence, 3)}
+
+
+def score_texts(model, texts: List[str]) -> Tuple[List[str], List[float]]:
+    """Run the model once over `texts` and return (predictions, confidences)."""
+    if hasattr(model, "predict_proba"):
+        # One vectorizer pass + one sklearn dispatch for the whole batch.
+        probs = np.asarray(model.predict_proba(texts))
+        best = probs.argmax(axis=1)
+        confs = probs[np.arange(len(texts)), best]
+        preds = np.asarray(model.classes_)[best]
+    else:
+        # Models without probabilities: still batch, but confidence is fixed.
+        preds = model.predict(texts)
+        confs = np.ones(len(texts))
+    return [str(p) for p in preds], [float(c) for c in confs]
+
+
+def predict_labels(
+    model,
+    labels: List[Any],
+    cache: Optional[PredictionCache] = None,
+    exact: Optional[ExactLabelIndex] = None,
+    version: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score a whole list of labels with (at most) a single model call.
+
+    Blank / non-string entries keep their slot in the output (prediction None,
+    confidence 0) so the caller can zip results back onto its fields.
+    Labels that normalize to the same key are only scored once.
+    `version` tags every result and guards the cache against stale writes.
+    """
+    results: List[Dict[str, Any]] = [_empty_result(text) for text in labels]
+
+    # normalized key -> every position in `labels` that maps to it
+    pending: Dict[str, List[int]] = {}
+    for i, text in enumerate(labels):
+        if not _is_scorable(text):
+            continue
+        key = normalize_label(text)
+        known = exact.lookup_normalized(key) if exact is not None else None
+        if known is not None:
+            results[i] = _result(text, known, 1.0)
+            continue
+        if key in pending:
+            pending[key].append(i)
+            continue
+        hit = cache.get(key, version) if cache is not None else None
+        if hit is not None:
+            results[i] = _result(text, *hit)
+            continue
+        pending[key] = [i]
+
+    if pending:
+        keys = list(pending)
+        preds, confs = score_texts(model, [labels[pending[k][0]] for k in keys])
+
+        for key, pred, conf in zip(keys, preds, confs):
+            if cache is not None:
+                cache.put(key, (pred, conf), version)
+            for i in pending[key]:
+                results[i] = _result(labels[i], pred, conf)
+
+    if version is not None:
+        for item in results:
+            item["model_version"] = version
+    return results
+
+
+def predict_label(
+    model,
+    text: str,
+    cache: Optional[PredictionCache] = None,
+    exact: Optional[ExactLabelIndex] = None,
+    version: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Single-label convenience wrapper around predict_labels()."""
+    return predict_labels(model, [text], cache=cache, exact=exact, version=version)[0]
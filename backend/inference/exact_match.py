@@ -0,0 +1,81 @@
+"""
+Exact-match tier for known form labels
+--------------------------------------
+
+dataset/form_labels_balanced.csv already has ~1,600 label -> field_type pairs.
+There is no reason to run LogisticRegression over char n-grams for a label we
+literally trained on, so at model load I compile the CSV into a dict keyed by
+the normalized label. Known labels are answered in O(1) with confidence 1.0;
+anything unseen falls through to the sklearn Pipeline.
+
+Labels that appear in the CSV with more than one field_type (e.g. "github" is
+both "social" and "key_skill") are left out on purpose so the model decides.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+from .normalize import normalize_label
+
+
+class ExactLabelIndex:
+    def __init__(self, mapping: Optional[Dict[str, str]] = None):
+        # normalized label -> field_type
+        self._mapping: Dict[str, str] = dict(mapping or {})
+
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path,
+        classes: Optional[Iterable[str]] = None,
+        label_col: str = "label_text",
+        type_col: str = "field_type",
+    ) -> "ExactLabelIndex":
+        """
+        Build the index from the training CSV.
+
+        If `classes` is given (model.classes_), rows whose field_type the model
+        doesn't know are skipped, so both tiers always speak the same labels.
+        """
+        path = Path(csv_path)
+        if not path.exists():
+            print(f"[exact_match] heads up: {path} not found; exact tier disabled")
+            return cls()
+
+        allowed: Optional[Set[str]] = {str(c) for c in classes} if classes is not None else None
+        seen: Dict[str, Set[str]] = defaultdict(set)
+
+        with open(path, "r", encoding="utf-8", newline="") as fh:
+            for row in csv.DictReader(fh):
+                label = (row.get(label_col) or "").strip()
+                field_type = (row.get(type_col) or "").strip()
+                if not label or not field_type:
+                    continue
+                if allowed is not None and field_type not in allowed:
+                    continue
+                seen[normalize_label(label)].add(field_type)
+
+        # Only keep labels the CSV is unanimous about.
+        mapping = {key: next(iter(types)) for key, types in seen.items() if len(types) == 1}
+        print(
+            f"[exact_match] compiled {len(mapping)} known labels from {path} "
+            f"({len(seen) - len(mapping)} ambiguous skipped)"
+        )
+        return cls(mapping)
+
+    def lookup_normalized(self, key: str) -> Optional[str]:
+        """Lookup by an already-normalized key (the engine normalizes once per label)."""
+        return self._mapping.get(key)
+
+    def lookup(self, text: str) -> Optional[str]:
+        return self._mapping.get(normalize_label(text))
+
+    def __len__(self) -> int:
+        return len(self._mapping)
+
+    def __contains__(self, text: str) -> bool:
+        return normalize_label(text) in self._mapping
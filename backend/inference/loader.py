@@ -0,0 +1,51 @@
+"""
+Pick which form-model backend to serve.
+
+- "sklearn": always joblib.load(form_model.pkl)  (the original behaviour)
+- "numpy":   always use the exported .npy artifact (error if it's missing)
+- "auto":    use the artifact when it exists and was exported from the exact
+             pickle on disk (sha256 in meta.json), otherwise fall back to the pickle
+
+"auto" is the default so a stale artifact can never shadow a retrained model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import joblib
+
+from .numpy_scorer import NumpyFormScorer, artifact_exists, read_artifact_meta
+
+BACKENDS = ("auto", "sklearn", "numpy")
+
+
+def file_sha256(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_form_model(pkl_path, artifact_dir, backend: str = "auto"):
+    """Load the form model with the requested backend (see module docstring)."""
+    backend = (backend or "auto").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown model backend {backend!r}; expected one of {BACKENDS}")
+
+    pkl = Path(pkl_path)
+
+    if backend == "numpy":
+        if not artifact_exists(artifact_dir):
+            raise FileNotFoundError(f"numpy model artifact not found in {artifact_dir}")
+        return NumpyFormScorer(artifact_dir)
+
+    if backend == "auto" and artifact_exists(artifact_dir):
+        meta = read_artifact_meta(artifact_dir)
+        if not pkl.exists() or meta.get("source_sha256") == file_sha256(pkl):
+            return NumpyFormScorer(artifact_dir)
+        print(f"[loader] {artifact_dir} was exported from a different pickle; using {pkl}")
+
+    return joblib.load(pkl)
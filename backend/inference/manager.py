@@ -0,0 +1,207 @@
+"""
+Hot-reloadable form model
+-------------------------
+
+api.py used to load form_model.pkl once at import, so shipping a retrained
+model meant restarting every gunicorn/uvicorn worker. ModelManager owns the
+loaded model instead:
+
+- a daemon thread polls the pickle (and the numpy artifact's meta.json) with
+  a cheap mtime+size check
+- when that changes, the new model is loaded and warmed up in that thread,
+  so requests never wait on joblib.load
+- the swap is one attribute assignment of an immutable (model, version) state,
+  so in-flight requests keep scoring with the model they started with
+- the version is the first 12 hex chars of a sha256 over the pickle and,
+  unless the backend is "sklearn", the numpy artifact's files, which is what
+  the endpoints report as "model_version" (so a re-exported artifact next to
+  an unchanged pickle still counts as a new model)
+- on_swap() hooks run after each swap, for state derived from the model
+  (api.py rebuilds the exact-match / embedding tiers for the new classes_)
+
+If a load fails (say the file is still being copied) the old model stays up
+and the next poll tries again. Copying the new pickle in with an atomic rename
+(`mv`) avoids that window entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import model_file_signature
+from .engine import score_texts
+from .loader import file_sha256, load_form_model
+from .numpy_scorer import ARTIFACT_FILES
+
+# A few labels every form has; scoring them once after a load pays the first-call
+# costs (numpy/sklearn lazy init, page faults on the coef matrix) before the swap.
+DEFAULT_WARMUP_LABELS = ("First Name", "Email Address", "Phone Number", "Zip Code")
+
+
+class _ModelState(NamedTuple):
+    model: Any
+    version: str
+    signature: str
+    loaded_at: float
+
+
+class ModelManager:
+    def __init__(
+        self,
+        pkl_path,
+        artifact_dir,
+        backend: str = "auto",
+        poll_seconds: float = 0.0,
+        warmup_labels: Sequence[str] = DEFAULT_WARMUP_LABELS,
+        loader: Optional[Callable[[], Any]] = None,
+    ):
+        self.pkl_path = Path(pkl_path)
+        self.artifact_dir = Path(artifact_dir)
+        self.backend = backend
+        self.poll_seconds = float(poll_seconds)
+        self.warmup_labels = list(warmup_labels)
+        self._loader = loader or (
+            lambda: load_form_model(self.pkl_path, self.artifact_dir, backend=self.backend)
+        )
+
+        self._reload_lock = threading.Lock()
+        self._swap_hooks: List[Callable[[Any, str], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+        self.last_load_ms = 0.0
+
+        # First load happens in the caller's thread: the app can't serve without it.
+        self._state = self._load()
+
+    # --- reading the current model ---
+
+    def current(self) -> Tuple[Any, str]:
+        """(model, version) from one consistent state; use this once per request."""
+        state = self._state
+        return state.model, state.version
+
+    @property
+    def model(self):
+        return self._state.model
+
+    @property
+    def version(self) -> str:
+        return self._state.version
+
+    # --- loading / swapping ---
+
+    def _signature(self) -> str:
+        meta = self.artifact_dir / "meta.json"
+        return f"{model_file_signature(str(self.pkl_path))}|{model_file_signature(str(meta))}"
+
+    def _version(self) -> str:
+        files = [self.pkl_path]
+        if self.backend != "sklearn":
+            files += [self.artifact_dir / name for name in ARTIFACT_FILES]
+        h = hashlib.sha256()
+        found = False
+        for path in files:
+            if path.exists():
+                h.update(f"{path.name}:{file_sha256(path)}\n".encode("utf-8"))
+                found = True
+        return h.hexdigest()[:12] if found else "unknown"
+
+    def _load(self) -> _ModelState:
+        t0 = time.perf_counter()
+        signature = self._signature()
+        version = self._version()
+        model = self._loader()
+        if self.warmup_labels:
+            score_texts(model, self.warmup_labels)
+        self.last_load_ms = round((time.perf_counter() - t0) * 1000.0, 1)
+        return _ModelState(model, version, signature, time.time())
+
+    def changed(self) -> bool:
+        return self._signature() != self._state.signature
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load + warm up the model on disk and swap it in if its version differs.
+        Returns True if a new model was swapped in.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False  # another thread is already loading it
+        try:
+            if not force and not self.changed():
+                return False
+            try:
+                new = self._load()
+            except Exception as e:
+                # keep serving the old model; the next poll retries
+                self.failed_reloads += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"[model] reload of {self.pkl_path} failed, keeping {self.version}: {e}")
+                return False
+
+            old = self._state
+            self.last_error = None
+            if new.version == old.version and not force:
+                # touched but same bytes (e.g. re-copied); just remember the new stat
+                self._state = old._replace(signature=new.signature)
+                return False
+            self._state = new
+            self.reloads += 1
+            print(f"[model] swapped {old.version} -> {new.version} ({self.last_load_ms} ms)")
+            self._run_swap_hooks(new)
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def on_swap(self, callback: Callable[[Any, str], None]) -> None:
+        """Call callback(model, version) after every swap (in the reloading thread)."""
+        self._swap_hooks.append(callback)
+
+    def _run_swap_hooks(self, state: _ModelState) -> None:
+        for callback in self._swap_hooks:
+            try:
+                callback(state.model, state.version)
+            except Exception as e:
+                print(f"[WARNING] model on_swap hook failed: {e}")
+
+    # --- background watcher ---
+
+    def start(self) -> None:
+        """Start polling for a new model (no-op if poll_seconds <= 0)."""
+        if self.poll_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            if self.changed():
+                self.reload()
+
+    def stats(self) -> Dict[str, Any]:
+        state = self._state
+        return {
+            "model_version": state.version,
+            "model_type": type(state.model).__name__,
+            "loaded_at": state.loaded_at,
+            "last_load_ms": self.last_load_ms,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+            "poll_seconds": self.poll_seconds,
+            "watching": self._thread is not None,
+        }
@@ -0,0 +1,36 @@
+"""
+Label normalization shared by the prediction tiers.
+
+The form model's TfidfVectorizer (see models/train_form_model.py) runs with
+lowercase=True, strip_accents="unicode" and analyzer="char_wb". char_wb splits
+on whitespace before building n-grams, so extra/leading/trailing spaces never
+change the features. That means two labels with the same normalized form
+always get the same prediction, which is what makes them safe cache keys.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+
+
+def strip_accents(text: str) -> str:
+    """Same behaviour as sklearn's strip_accents_unicode (NFKD + drop combining marks)."""
+    try:
+        # Fast path: plain ASCII has nothing to strip.
+        text.encode("ASCII", errors="strict")
+        return text
+    except UnicodeEncodeError:
+        decomposed = unicodedata.normalize("NFKD", text)
+        return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize_label(text: str) -> str:
+    """
+    Case-fold, strip accents and collapse whitespace, in the same order the
+    vectorizer does it (lowercase first, then accents).
+
+    I use str.lower() instead of str.casefold() on purpose: casefold turns
+    "ß" into "ss", which the vectorizer does not, so the key would stop
+    matching what the model actually sees.
+    """
+    return " ".join(strip_accents(text.lower()).split())
@@ -0,0 +1,243 @@
+"""
+Lean numpy scorer for the form model
+------------------------------------
+
+Serving used to unpickle the whole sklearn Pipeline (TfidfVectorizer char_wb
+2-6 grams + LogisticRegression) in every gunicorn worker and pay the
+Pipeline/validation overhead on every call. All the model really needs at
+predict time is:
+
+- the n-gram vocabulary (feature index order)
+- the IDF vector
+- the coefficient matrix + intercepts
+- the class names
+
+export_numpy_artifact() writes those as plain .npy files (float32 for the
+numeric ones) plus a meta.json with the vectorizer settings, and
+NumpyFormScorer reproduces predict_proba from them with numpy only.
+It exposes classes_ / predict / predict_proba so the inference engine can use
+it as a drop-in for the pickle.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .normalize import strip_accents
+
+ARTIFACT_FORMAT = 1
+
+ARTIFACT_FILES = ("vocab.npy", "idf.npy", "coef.npy", "intercept.npy", "classes.npy", "meta.json")
+
+
+def export_numpy_artifact(pipeline, out_dir, source_sha256: str = "") -> Path:
+    """
+    Dump a fitted (TfidfVectorizer -> LogisticRegression) Pipeline into out_dir.
+
+    Raises ValueError if the pipeline uses settings the numpy scorer can't
+    reproduce exactly (so we never silently serve a different model).
+    """
+    steps = getattr(pipeline, "named_steps", {})
+    vec = steps.get("tfidf")
+    clf = steps.get("clf")
+    if vec is None or clf is None:
+        raise ValueError("expected a Pipeline with 'tfidf' and 'clf' steps")
+
+    if vec.analyzer != "char_wb":
+        raise ValueError(f"unsupported analyzer {vec.analyzer!r} (only 'char_wb')")
+    if vec.strip_accents not in (None, "unicode"):
+        raise ValueError(f"unsupported strip_accents {vec.strip_accents!r}")
+    if vec.preprocessor is not None or vec.binary or vec.norm not in (None, "l2"):
+        raise ValueError("unsupported vectorizer options for numpy export")
+
+    n_features = len(vec.vocabulary_)
+    vocab = np.empty(n_features, dtype=object)
+    for gram, idx in vec.vocabulary_.items():
+        vocab[idx] = gram
+    vocab = vocab.astype(str)
+
+    if vec.use_idf:
+        idf = np.asarray(vec.idf_, dtype=np.float32)
+    else:
+        idf = np.ones(n_features, dtype=np.float32)
+
+    # Same rule LogisticRegression.predict_proba uses to pick OvR vs softmax.
+    multi_class = getattr(clf, "multi_class", "auto")
+    ovr = multi_class in ("ovr", "warn") or (
+        multi_class in ("auto", "deprecated")
+        and (len(clf.classes_) <= 2 or clf.solver == "liblinear")
+    )
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / "vocab.npy", vocab)
+    np.save(out / "idf.npy", idf)
+    np.save(out / "coef.npy", np.asarray(clf.coef_, dtype=np.float32))
+    np.save(out / "intercept.npy", np.asarray(clf.intercept_, dtype=np.float32))
+    np.save(out / "classes.npy", np.asarray(clf.classes_).astype(str))
+
+    meta = {
+        "format": ARTIFACT_FORMAT,
+        "analyzer": vec.analyzer,
+        "ngram_range": list(vec.ngram_range),
+        "lowercase": bool(vec.lowercase),
+        "strip_accents": vec.strip_accents,
+        "sublinear_tf": bool(vec.sublinear_tf),
+        "norm": vec.norm,
+        "ovr": bool(ovr),
+        "n_features": n_features,
+        "source_sha256": source_sha256,
+    }
+    (out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return out
+
+
+def artifact_exists(path) -> bool:
+    p = Path(path)
+    return all((p / name).exists() for name in ARTIFACT_FILES)
+
+
+def read_artifact_meta(path) -> Dict[str, Any]:
+    return json.loads((Path(path) / "meta.json").read_text(encoding="utf-8"))
+
+
+class NumpyFormScorer:
+    def __init__(self, artifact_dir):
+        path = Path(artifact_dir)
+        self.meta = read_artifact_meta(path)
+        if self.meta.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"unknown artifact format {self.meta.get('format')!r} in {path}")
+
+        vocab = np.load(path / "vocab.npy")
+        self.vocabulary: Dict[str, int] = {str(g): i for i, g in enumerate(vocab)}
+        self.idf = np.load(path / "idf.npy")
+        # Transposed once so each n-gram's weights are a contiguous row.
+        self.coef_t = np.ascontiguousarray(np.load(path / "coef.npy").T)
+        self.intercept = np.load(path / "intercept.npy")
+        self.classes_ = np.load(path / "classes.npy")
+
+        self._min_n, self._max_n = self.meta["ngram_range"]
+        self._lowercase = self.meta["lowercase"]
+        self._strip = self.meta["strip_accents"] == "unicode"
+        self._sublinear = self.meta["sublinear_tf"]
+        self._l2 = self.meta["norm"] == "l2"
+        self._ovr = self.meta["ovr"]
+
+    # --- featurization (mirrors TfidfVectorizer char_wb) ---
+
+    def _ngrams(self, text: str) -> List[str]:
+        if self._lowercase:
+            text = text.lower()
+        if self._strip:
+            text = strip_accents(text)
+
+        min_n, max_n = self._min_n, self._max_n
+        grams: List[str] = []
+        extend = grams.extend
+        for w in text.split():
+            w = " " + w + " "
+            w_len = len(w)
+            for n in range(min_n, max_n + 1):
+                if w_len <= n:
+                    # short word: counted once, then longer n-grams are the same string
+                    grams.append(w)
+                    break
+                extend([w[i:i + n] for i in range(w_len - n + 1)])
+        return grams
+
+    def _batch_features(self, texts: Sequence[str]):
+        """
+        Featurize a whole batch at once.
+
+        Returns (rows, starts, idx, weights): `rows` are the texts that have at
+        least one known n-gram, `starts` is where each of those rows begins in
+        the flat idx/weights arrays, and weights are tf-idf, l2-normalized per row.
+        The only per-label Python work is n-gram generation + a dict lookup;
+        counting, idf weighting and normalization happen once for the batch.
+        """
+        vocab_get = self.vocabulary.get
+        ids: List[int] = []
+        lengths: List[int] = []
+        for text in texts:
+            grams = self._ngrams(text)
+            ids.extend(map(vocab_get, grams, repeat(-1, len(grams))))
+            lengths.append(len(grams))
+
+        n_features = len(self.vocabulary)
+        ids_arr = np.asarray(ids, dtype=np.int64)
+        row_of = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        known = ids_arr >= 0
+
+        # (row, feature) pairs -> unique keys + term counts; np.unique sorts them,
+        # so entries end up grouped by row and in feature order within a row.
+        keys, counts = np.unique(row_of[known] * n_features + ids_arr[known], return_counts=True)
+        row_ids = keys // n_features
+        idx = (keys % n_features).astype(np.intp)
+        if not keys.size:
+            return [], [], idx, np.empty(0, dtype=np.float32)
+
+        starts = np.flatnonzero(np.r_[True, row_ids[1:] != row_ids[:-1]])
+        rows = row_ids[starts]
+
+        tf = counts.astype(np.float32)
+        if self._sublinear:
+            tf = 1.0 + np.log(tf)
+        weights = tf * self.idf[idx]
+        if self._l2:
+            norms = np.sqrt(np.add.reduceat(weights * weights, starts))
+            lengths_per_row = np.diff(np.append(starts, len(weights)))
+            weights /= np.repeat(np.where(norms > 0, norms, 1.0), lengths_per_row)
+        return rows, starts, idx, weights
+
+    # --- sklearn-compatible API ---
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        n_out = self.coef_t.shape[1]
+        scores = np.tile(self.intercept, (len(texts), 1)).astype(np.float64)
+
+        # One fancy-index + segmented sum scores the whole batch.
+        rows, starts, idx, weights = self._batch_features(texts)
+        if len(rows):
+            contrib = self.coef_t[idx] * weights[:, None]
+            scores[rows] += np.add.reduceat(contrib, starts, axis=0)
+
+        return scores if n_out > 1 else scores[:, 0]
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        decision = self.decision_function(texts)
+        if self._ovr:
+            prob = 1.0 / (1.0 + np.exp(-decision))
+            if prob.ndim == 1:
+                return np.vstack([1 - prob, prob]).T
+            return prob / prob.sum(axis=1, keepdims=True)
+
+        if decision.ndim == 1:
+            decision = np.c_[-decision, decision]
+        decision = decision - decision.max(axis=1, keepdims=True)
+        exp = np.exp(decision)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        return self.classes_[self.predict_proba(texts).argmax(axis=1)]
+
+
+# === Export an existing pickle without retraining ===
+# python -m backend.inference.numpy_scorer [models/form_model.pkl] [models/form_model_np]
+if __name__ == "__main__":
+    import sys
+
+    import joblib
+
+    from .loader import file_sha256
+
+    repo = Path(__file__).resolve().parents[2]
+    pkl_path = Path(sys.argv[1]) if len(sys.argv) > 1 else repo / "models" / "form_model.pkl"
+    out_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else repo / "models" / "form_model_np"
+
+    export_numpy_artifact(joblib.load(pkl_path), out_dir, source_sha256=file_sha256(pkl_path))
+    print(f"=== Exported {pkl_path} -> {out_dir} ===")
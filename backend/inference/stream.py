@@ -0,0 +1,120 @@
+"""
+NDJSON streaming for /predict_stream
+------------------------------------
+
+/predict_batch returns nothing until every label is scored, which is slow on
+portals with hundreds of fields. /predict_stream writes one JSON line per
+label as soon as its chunk is scored, so the extension can start filling the
+first fields right away.
+
+Request body, either:
+- a JSON list / {"labels": [...]}            (whole list known up front)
+- NDJSON, one label per line, optionally sent with chunked encoding;
+  a line can be "First Name", {"label": "First Name"} or a list of labels
+
+The NDJSON body is parsed as it arrives, but scoring starts once it's complete:
+a bad line still gets a clean 400, and in FastAPI, Starlette's disconnect
+listener would otherwise be reading the same receive channel as the body.
+
+Response (application/x-ndjson):
+    {"index": 0, "label": "First Name", "prediction": "name", "confidence": 0.93, ...}
+    {"index": 1, ...}
+    {"done": true, "total": 2, "model_version": "..."}
+
+The trailing "done" line lets the client tell a finished stream from a cut one.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+ScoreFn = Callable[[List[Any]], List[Dict[str, Any]]]
+
+
+class NDJSONLabelReader:
+    """Turns arbitrary byte chunks into labels, one NDJSON line at a time."""
+
+    def __init__(self) -> None:
+        self._buf = b""
+
+    @staticmethod
+    def _labels_from_line(line: bytes) -> List[Any]:
+        line = line.strip()
+        if not line:
+            return []
+        obj = json.loads(line)
+        if isinstance(obj, list):
+            return obj
+        if isinstance(obj, dict):
+            return [obj.get("label", "")]
+        return [obj]
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Labels from every complete line seen so far (the tail waits for more bytes)."""
+        self._buf += data
+        *lines, self._buf = self._buf.split(b"\n")
+        out: List[Any] = []
+        for line in lines:
+            out.extend(self._labels_from_line(line))
+        return out
+
+    def close(self) -> List[Any]:
+        """Labels from a last line that had no trailing newline."""
+        tail, self._buf = self._buf, b""
+        return self._labels_from_line(tail)
+
+
+def labels_from_json(payload: Any) -> List[Any]:
+    """Accept a bare JSON list or the /predict_batch shape {"labels": [...]}."""
+    labels = payload.get("labels", []) if isinstance(payload, dict) else payload
+    if not isinstance(labels, list):
+        raise ValueError("labels must be a list")
+    return labels
+
+
+def chunked(labels: List[Any], size: int) -> Iterator[List[Any]]:
+    size = max(1, size)  # SFF_STREAM_CHUNK_SIZE <= 0 means one label per chunk
+    for start in range(0, len(labels), size):
+        yield labels[start:start + size]
+
+
+def read_ndjson_labels(byte_chunks: Iterable[bytes]) -> List[Any]:
+    """All labels from an NDJSON body; raises ValueError on a bad line."""
+    reader = NDJSONLabelReader()
+    labels: List[Any] = []
+    for data in byte_chunks:
+        labels.extend(reader.feed(data))
+    labels.extend(reader.close())
+    return labels
+
+
+def ndjson_line(obj: Dict[str, Any]) -> str:
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+class PredictionStream:
+    """Scores label chunks and renders the NDJSON lines, keeping a running index."""
+
+    def __init__(self, score_fn: ScoreFn, version: Optional[str] = None):
+        self.score_fn = score_fn
+        self.version = version
+        self.total = 0
+
+    def render(self, labels: List[Any]) -> str:
+        lines = []
+        for item in self.score_fn(labels):
+            lines.append(ndjson_line({"index": self.total, **item}))
+            self.total += 1
+        return "".join(lines)
+
+    def trailer(self) -> str:
+        return ndjson_line({"done": True, "total": self.total, "model_version": self.version})
+
+    def iter_lines(self, chunks: Iterable[List[Any]]) -> Iterator[str]:
+        for labels in chunks:
+            if labels:
+                yield self.render(labels)
+        yield self.trailer()
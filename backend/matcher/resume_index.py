@@ -0,0 +1,290 @@
+"""
+Per-user TF-IDF resume index for /select_resume
+-----------------------------------------------
+
+select_best_resume refits TfidfVectorizer(ngram_range=(1, 2), stop_words=
+"english") on [JD] + every resume per call, after /select_resume re-read every
+resume text from disk. The JD is part of that fit, so the IDF changes with it,
+but only in a way that factors out. With N resumes, smooth idf and df(t) =
+number of resumes with term t:
+
+    idf0(t) = ln((N + 2) / (df(t) + 1)) + 1     term not in the JD
+    idf1(t) = ln((N + 2) / (df(t) + 2)) + 1     term in the JD
+
+so for resume term counts R and JD counts q over the JD's terms J:
+
+    dot[i]   = R[:, J] @ (q * idf1^2)
+    |r_i|^2  = R^2 @ idf0^2 - R^2[:, J] @ (idf0[J]^2 - idf1^2)
+    |q|^2    = sum((q * idf1)^2)
+    sim      = dot / (|r| * |q|)
+
+which is the refit's cosine_similarity up to float rounding. R^2 @ idf0^2
+only depends on the resumes, so it's cached until the next upload / delete;
+a query is the JD analysis plus two sparse mat-vecs over the JD's columns.
+
+Per user I keep each resume's term counts (so df / the vocabulary can be
+rebuilt), the matrix built from them, and which BUMP_TERMS its text has
+(select_best_resume's bonus looks at the raw text). One .npz per user on disk.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .resume_selector import BUMP_TERMS, TFIDF_PARAMS
+
+INDEX_SCHEMA = 1
+
+_analyze = TfidfVectorizer(**TFIDF_PARAMS).build_analyzer()
+
+
+def bump_terms_in(text: str) -> Tuple[str, ...]:
+    """BUMP_TERMS that select_best_resume's bonus would find in this resume text."""
+    low = (text or "").lower()
+    return tuple(t for t in BUMP_TERMS if t in low)
+
+
+class UserTfidfIndex:
+    def __init__(self):
+        self.ids: List[str] = []
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.bumps: Dict[str, Tuple[str, ...]] = {}
+        self.nonempty: Dict[str, bool] = {}  # prepped text wasn't "" (the refit checks this)
+        self._lock = threading.Lock()
+        self._matrix = None  # (vocab, df, R, R2, base) until the next change
+
+    def __contains__(self, rid: str) -> bool:
+        return rid in self.counts
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --- updates ---
+
+    def add(self, rid: str, prepped: str, text: str) -> None:
+        """Insert / replace a resume: prepped = prep_text(text) (feature store selector_text)."""
+        rid = str(rid)
+        with self._lock:
+            if rid not in self.counts:
+                self.ids.append(rid)
+            self.counts[rid] = dict(Counter(_analyze(prepped or "")))
+            self.bumps[rid] = bump_terms_in(text)
+            self.nonempty[rid] = bool(prepped)
+            self._matrix = None
+
+    def remove(self, rid: str) -> bool:
+        rid = str(rid)
+        with self._lock:
+            if rid not in self.counts:
+                return False
+            self.ids.remove(rid)
+            del self.counts[rid], self.bumps[rid], self.nonempty[rid]
+            self._matrix = None
+            return True
+
+    # --- queries ---
+
+    def _build(self):
+        vocab: Dict[str, int] = {}
+        rows, cols, vals = [], [], []
+        for i, rid in enumerate(self.ids):
+            for term, tf in self.counts[rid].items():
+                rows.append(i)
+                cols.append(vocab.setdefault(term, len(vocab)))
+                vals.append(tf)
+        R = sparse.csc_matrix(
+            (np.asarray(vals, dtype=np.float64), (rows, cols)), shape=(len(self.ids), len(vocab))
+        )
+        df = np.diff(R.indptr).astype(np.float64)  # csc: nonzeros per column = resumes per term
+        R2 = R.multiply(R).tocsc()
+        n = len(self.ids)
+        idf0 = np.log((n + 2) / (df + 1)) + 1.0
+        base = R2 @ (idf0 * idf0)
+        return vocab, df, R, R2, base
+
+    def scores(self, jd_prepped: str) -> Tuple[List[str], np.ndarray]:
+        """(ids, TF-IDF cosine of each resume vs the JD), same numbers as the refit."""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = self._build()
+            vocab, df, R, R2, base = self._matrix
+            ids = list(self.ids)
+            any_text = any(self.nonempty.values())
+        if not ids:
+            return ids, np.zeros(0)
+        if not jd_prepped and not any_text:
+            raise ValueError("JD and resumes are empty after preprocessing.")
+        if not any_text:
+            raise ValueError("All resume texts are empty after preprocessing.")
+
+        q = Counter(_analyze(jd_prepped))
+        if not vocab and not q:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        n = len(ids)
+        known = [(vocab[t], tf) for t, tf in q.items() if t in vocab]
+        unknown = np.asarray([tf for t, tf in q.items() if t not in vocab], dtype=np.float64)
+
+        # JD terms no resume has: df 0, only in |q|
+        q_sq = float(np.sum((unknown * (np.log((n + 2) / 2.0) + 1.0)) ** 2))
+        r_sq = base.copy()
+        dot = np.zeros(n)
+        if known:
+            cols = np.asarray([c for c, _ in known])
+            qk = np.asarray([tf for _, tf in known], dtype=np.float64)
+            idf1 = np.log((n + 2) / (df[cols] + 2)) + 1.0
+            idf0 = np.log((n + 2) / (df[cols] + 1)) + 1.0
+            q_sq += float(np.sum((qk * idf1) ** 2))
+            dot = R[:, cols] @ (qk * idf1 * idf1)
+            r_sq -= R2[:, cols] @ (idf0 * idf0 - idf1 * idf1)
+
+        denom = np.sqrt(np.maximum(r_sq, 0.0)) * np.sqrt(q_sq)
+        return ids, np.divide(dot, denom, out=np.zeros(n), where=denom > 0)
+
+    # --- .npz (no pickle) ---
+
+    def to_bytes(self) -> bytes:
+        with self._lock:
+            ids = list(self.ids)
+            terms, tfs, lengths = [], [], []
+            for rid in ids:
+                terms += list(self.counts[rid])
+                tfs += list(self.counts[rid].values())
+                lengths.append(len(self.counts[rid]))
+            arrays = {
+                "schema": np.array(INDEX_SCHEMA),
+                "ids": np.array(ids, dtype=str),
+                "terms": np.array(terms, dtype=str),
+                "tfs": np.array(tfs, dtype=np.int32),
+                "lengths": np.array(lengths, dtype=np.int32),
+                "bumps": np.array([" ".join(self.bumps[rid]) for rid in ids], dtype=str),
+                "nonempty": np.array([self.nonempty[rid] for rid in ids], dtype=bool),
+            }
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **arrays)
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "UserTfidfIndex":
+        index = cls()
+        with np.load(io.BytesIO(data), allow_pickle=False) as z:
+            if int(z["schema"]) != INDEX_SCHEMA:
+                raise ValueError("index schema changed")
+            terms, tfs = z["terms"].tolist(), z["tfs"].tolist()
+            start = 0
+            for rid, length, bumps, nonempty in zip(
+                z["ids"].tolist(), z["lengths"].tolist(), z["bumps"].tolist(), z["nonempty"]
+            ):
+                index.ids.append(rid)
+                end = start + length
+                index.counts[rid] = dict(zip(terms[start:end], tfs[start:end]))
+                index.bumps[rid] = tuple(bumps.split())
+                index.nonempty[rid] = bool(nonempty)
+                start = end
+        return index
+
+
+class ResumeTfidfIndexStore:
+    """UserTfidfIndex per user: memory -> STORAGE_DIR/select_index/<user>.npz."""
+
+    def __init__(self, root: os.PathLike):
+        self.root = Path(root)
+        self._users: Dict[str, UserTfidfIndex] = {}
+        self._lock = threading.Lock()
+
+    def path(self, user: str) -> Path:
+        return self.root / f"{user}.npz"
+
+    def get(self, user: str) -> Optional[UserTfidfIndex]:
+        """Loaded index for user (from disk if needed), None if there is none yet."""
+        with self._lock:
+            index = self._users.get(user)
+            if index is not None:
+                return index
+            path = self.path(user)
+            if not path.exists():
+                return None
+            try:
+                index = UserTfidfIndex.from_bytes(path.read_bytes())
+            except Exception as e:
+                print(f"[select_index] rebuilding {path.name}: {e}")
+                return None
+            self._users[user] = index
+            return index
+
+    def get_or_create(self, user: str) -> UserTfidfIndex:
+        index = self.get(user)
+        if index is None:
+            with self._lock:
+                index = self._users.setdefault(user, UserTfidfIndex())
+        return index
+
+    def save(self, user: str) -> None:
+        index = self.get(user)
+        if index is None:
+            return
+        path = self.path(user)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(index.to_bytes())
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[select_index] could not write {path}: {e}")
+
+    def add(self, user: str, rid: str, prepped: str, text: str) -> None:
+        """Upload: only touches users that already have an index (the rest build on demand)."""
+        index = self.get(user)
+        if index is not None:
+            index.add(rid, prepped, text)
+            self.save(user)
+
+    def remove(self, user: str, rid: str) -> None:
+        index = self.get(user)
+        if index is not None and index.remove(rid):
+            self.save(user)
+
+    def sync(
+        self,
+        user: str,
+        rows: Sequence[Tuple[str, Any]],
+        load: Callable[[Any], Tuple[str, str]],
+    ) -> UserTfidfIndex:
+        """
+        Make the user's index hold exactly `rows` ((rid, db row) pairs): rows it
+        doesn't have yet go through load(row) -> (prepped, text), rows that are
+        gone from the DB are dropped. Saved when anything changed.
+        """
+        index = self.get_or_create(user)
+        wanted = {str(rid) for rid, _ in rows}
+        changed = False
+        for rid in [rid for rid in index.ids if rid not in wanted]:
+            changed |= index.remove(rid)
+        for rid, row in rows:
+            if str(rid) in index:
+                continue
+            try:
+                prepped, text = load(row)
+            except Exception as e:
+                print(f"[select_index] skipping resume {rid}: {e}")
+                continue
+            index.add(str(rid), prepped, text)
+            changed = True
+        if changed:
+            self.save(user)
+        return index
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "resumes": sum(len(i) for i in self._users.values()),
+            }
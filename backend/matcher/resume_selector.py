@@ -1,6 +1,7 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
@@ -16,16 +17,25 @@ BUMP_TERMS = {
 }
 
 
-def _prep(text: str) -> str:
+def prep_text(text: str) -> str:
+    """Lowercase, keep a-z 0-9 and - + . # (c++, c#, node.js); the select index uses it too."""
     text = text.lower()
     text = re.sub(r"[^a-z0-9\s\-\+\.#]", " ", text)
     return re.sub(r"\s+", " ", text).strip()
 
 
-def select_best_resume(jd_text: str, resumes: List[Dict]) -> Tuple[Dict, List[Tuple[str, float]]]:
-    if not resumes:
-        return None, []
-    docs = [_prep(jd_text)] + [_prep(r.get("text", "")) for r in resumes]
+SELECT_METHODS = ("tfidf", "embedding", "hybrid")
+# the per-call refit; resume_index.py analyzes with the same settings
+TFIDF_PARAMS = dict(ngram_range=(1, 2), min_df=1, stop_words="english")
+
+
+def _tfidf_scores(
+    jd_text: str, resumes: List[Dict], prepped: Optional[List[Optional[str]]] = None
+) -> np.ndarray:
+    prepped = prepped or [None] * len(resumes)
+    docs = [prep_text(jd_text)] + [
+        p if p is not None else prep_text(r.get("text", "")) for r, p in zip(resumes, prepped)
+    ]
     # filter out truly empty strings to avoid "empty vocabulary" error
     if not any(d for d in docs):
         raise ValueError("JD and resumes are empty after preprocessing.")
@@ -33,18 +43,87 @@ def select_best_resume(jd_text: str, resumes: List[Dict]) -> Tuple[Dict, List[Tu
     if not any(d for d in docs[1:]):
         raise ValueError("All resume texts are empty after preprocessing.")
 
-    vec = TfidfVectorizer(ngram_range=(1, 2), min_df=1, stop_words="english")
+    vec = TfidfVectorizer(**TFIDF_PARAMS)
     X = vec.fit_transform(docs)  # this is where empty vocab would throw
-    sims = cosine_similarity(X[0], X[1:]).flatten()
+    return cosine_similarity(X[0], X[1:]).flatten()
+
+
+def _embedding_scores(
+    jd_text: str,
+    resumes: List[Dict],
+    embed_many: Callable[[List[str]], Sequence],
+    vectors: Optional[List[Optional[np.ndarray]]] = None,
+) -> np.ndarray:
+    """
+    Cosine(JD, resume) for every resume: one embed_many call for the JD plus
+    every resume without a stored vector, then one matrix product.
+    """
+    vectors = list(vectors) if vectors else [None] * len(resumes)
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    encoded = embed_many([jd_text] + [resumes[i].get("text", "") for i in missing])
+    for i, vec in zip(missing, encoded[1:]):
+        vectors[i] = vec
+
+    M = np.vstack([np.asarray(v, dtype=np.float32) for v in vectors])
+    jd_vec = np.asarray(encoded[0], dtype=np.float32)
+    M /= np.maximum(np.linalg.norm(M, axis=1, keepdims=True), 1e-12)
+    jd_vec /= max(float(np.linalg.norm(jd_vec)), 1e-12)
+    return M @ jd_vec
+
+
+def _has_bump_term(resume: Dict, term: str) -> bool:
+    if "bump_terms" in resume:
+        return term in resume["bump_terms"]
+    return term in resume.get("text", "").lower()
+
+
+def select_best_resume(
+    jd_text: str,
+    resumes: List[Dict],
+    prepped: Optional[List[Optional[str]]] = None,
+    method: str = "tfidf",
+    embed_many: Optional[Callable[[List[str]], Sequence]] = None,
+    vectors: Optional[List[Optional[np.ndarray]]] = None,
+    alpha: float = 0.5,
+    tfidf_sims: Optional[np.ndarray] = None,
+) -> Tuple[Dict, List[Tuple[str, float]]]:
+    """
+    Rank resumes against a JD; returns (best resume dict, [(id, score), ...]).
+
+    method: "tfidf" (default), "embedding", or "hybrid" = alpha * tfidf + (1 - alpha) * embedding.
+    prepped: prep_text(text) per resume when the caller already has it (resume feature store).
+    embed_many / vectors: texts -> vectors (batched, e.g. MatcherEmbeddings.embed_many) and
+    already-known resume vectors; needed for the embedding modes.
+    tfidf_sims: TF-IDF scores per resume from a UserTfidfIndex (same numbers as the refit);
+    resumes can then carry "bump_terms" (resume_index.bump_terms_in) instead of "text".
+    """
+    if method not in SELECT_METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {', '.join(SELECT_METHODS)}")
+    if method != "tfidf" and embed_many is None:
+        raise ValueError(f"method {method!r} needs an embedding model")
+    if not resumes:
+        return None, []
+
+    def tfidf():
+        return tfidf_sims if tfidf_sims is not None else _tfidf_scores(jd_text, resumes, prepped)
+
+    if method == "tfidf":
+        sims = tfidf()
+    elif method == "embedding":
+        sims = _embedding_scores(jd_text, resumes, embed_many, vectors)
+    else:
+        sims = alpha * tfidf() + (1.0 - alpha) * (
+            _embedding_scores(jd_text, resumes, embed_many, vectors)
+        )
 
-    jd_tokens = set(_prep(jd_text).split())
+    jd_tokens = set(prep_text(jd_text).split())
     bumped = []
     for i, score in enumerate(sims):
         bonus = 0.0
         for term, w in BUMP_TERMS.items():
-            if term in jd_tokens and term in resumes[i].get("text", "").lower():
+            if term in jd_tokens and _has_bump_term(resumes[i], term):
                 bonus += 0.02 * (w - 1.0)
-        bumped.append(score + bonus)
+        bumped.append(float(score) + bonus)
 
     ranked = sorted(zip(resumes, bumped), key=lambda x: x[1], reverse=True)
     best = ranked[0][0]
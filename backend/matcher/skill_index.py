@@ -0,0 +1,161 @@
+"""
+Per-user skill bitset index
+---------------------------
+
+"Which of my resumes covers this JD's skills" used to mean re-extracting
+skills from every resume text. Here each resume's skills are one row of bits
+over the skill vocabulary (SKILL_TERMS order), packed with np.packbits, so for
+~500 terms a resume is 64 bytes and a user's resumes are one uint8 matrix.
+
+A JD is encoded the same way and one gap query is
+    covered = resumes & jd
+    missing = jd & ~resumes
+over the whole matrix at once; counts come from a byte popcount table.
+
+Every gunicorn worker has its own index, and add() / remove() only run in the
+worker that handled the upload / delete, so each query first sync()s the
+user's rows against the resume ids in the DB: rows that are gone are dropped
+and the missing ones are read through the caller's loader (a user's first
+query reads everything).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int32)
+
+
+class _UserBits:
+    __slots__ = ("ids", "bits")
+
+    def __init__(self, ids: List[str], bits: np.ndarray):
+        self.ids = ids
+        self.bits = bits
+
+
+class SkillBitsetIndex:
+    def __init__(self, vocabulary: Sequence[str]):
+        self.vocabulary = tuple(vocabulary)
+        self.column = {term: i for i, term in enumerate(self.vocabulary)}
+        self.width = (len(self.vocabulary) + 7) // 8  # bytes per row
+        self._users: Dict[str, _UserBits] = {}
+        self._lock = threading.Lock()
+
+    # --- encoding ---
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Packed row for a skill list; terms outside the vocabulary are ignored."""
+        dense = np.zeros(self.width * 8, dtype=np.uint8)
+        cols = [self.column[s] for s in skills if s in self.column]
+        dense[cols] = 1
+        return np.packbits(dense)
+
+    def decode(self, row: np.ndarray) -> List[str]:
+        """Skills in a packed row, in vocabulary order."""
+        cols = np.flatnonzero(np.unpackbits(row)[:len(self.vocabulary)])
+        return [self.vocabulary[i] for i in cols]
+
+    # --- per-user rows ---
+
+    def sync(
+        self,
+        user: str,
+        rids: Iterable[str],
+        load: Callable[[List[str]], Iterable[Tuple[str, Sequence[str]]]],
+    ) -> None:
+        """
+        Make the user's rows match `rids` (the DB's view): rows not in it are
+        dropped, and load(missing_rids) -> [(rid, skills)] fills in the rest.
+        Rows add()-ed while load() was running are kept.
+        """
+        wanted = [str(rid) for rid in rids]
+        with self._lock:
+            current = self._users.get(user)
+            had = set(current.ids) if current is not None else set()
+        missing = [rid for rid in wanted if rid not in had]
+        if current is not None and not missing and len(had) == len(wanted):
+            return  # same ids, nothing to do (the common case)
+        loaded = {str(rid): self.encode(skills) for rid, skills in load(missing)} if missing else {}
+        gone = had - set(wanted)
+        with self._lock:
+            current = self._users.get(user)
+            rows = dict(zip(current.ids, current.bits)) if current is not None else {}
+            for rid, row in loaded.items():
+                rows.setdefault(rid, row)
+            ids = [rid for rid in rows if rid not in gone]
+            bits = np.vstack([rows[rid] for rid in ids]) if ids else self._empty()
+            self._users[user] = _UserBits(ids, bits)
+
+    def add(self, user: str, rid: str, skills: Sequence[str]) -> None:
+        """Insert / replace one resume's row (only for users that are loaded)."""
+        rid, row = str(rid), self.encode(skills)
+        with self._lock:
+            current = self._users.get(user)
+            if current is None:
+                return  # their first sync() reads it from the DB with everything else
+            ids, bits = list(current.ids), current.bits.copy()
+            if rid in ids:
+                bits[ids.index(rid)] = row
+            else:
+                ids.append(rid)
+                bits = np.vstack([bits, row[None, :]])
+            self._users[user] = _UserBits(ids, bits)
+
+    def remove(self, user: str, rid: str) -> None:
+        """Drop one resume's row (no-op if the user isn't loaded or doesn't have it)."""
+        rid = str(rid)
+        with self._lock:
+            current = self._users.get(user)
+            if current is None or rid not in current.ids:
+                return
+            i = current.ids.index(rid)
+            ids = current.ids[:i] + current.ids[i + 1:]
+            self._users[user] = _UserBits(ids, np.delete(current.bits, i, axis=0))
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros((0, self.width), dtype=np.uint8)
+
+    # --- queries ---
+
+    def gap(self, user: str, jd_skills: Iterable[str]) -> Dict[str, object]:
+        """
+        Every resume of `user` against one JD skill list:
+        {"jd_skills", "ids", "covered_count", "coverage", "covered", "missing"},
+        the last four aligned with ids (covered / missing as skill lists).
+        """
+        with self._lock:
+            current = self._users.get(user)
+            ids, bits = (current.ids, current.bits) if current else ([], self._empty())
+
+        jd = self.encode(jd_skills)
+        jd_count = int(POPCOUNT[jd].sum())
+        covered = bits & jd
+        missing = ~bits & jd
+        covered_count = POPCOUNT[covered].sum(axis=1)
+        coverage = covered_count / jd_count if jd_count else np.zeros(len(ids))
+
+        n = len(self.vocabulary)
+        covered_dense = np.unpackbits(covered, axis=1)[:, :n].astype(bool)
+        missing_dense = np.unpackbits(missing, axis=1)[:, :n].astype(bool)
+        vocab = np.asarray(self.vocabulary, dtype=object)
+        return {
+            "jd_skills": self.decode(jd),
+            "ids": list(ids),
+            "covered_count": covered_count.tolist(),
+            "coverage": np.round(coverage, 4).tolist(),
+            "covered": [vocab[row].tolist() for row in covered_dense],
+            "missing": [vocab[row].tolist() for row in missing_dense],
+        }
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "terms": len(self.vocabulary),
+                "bytes_per_resume": self.width,
+                "users": len(self._users),
+                "resumes": sum(len(u.ids) for u in self._users.values()),
+            }
@@ -0,0 +1,134 @@
+"""
+Compiled skill matcher
+----------------------
+
+extract_skills_from_text used to rebuild its multi-word / single-word term lists
+from SKILL_TERMS on every call, then run one `term in text` scan per multi-word
+term plus a Python-level lookup per single-word term.
+
+SkillMatcher is built once from the vocabulary and splits the work in two:
+
+- single-word terms: a frozenset intersected with the text's token set
+  (same re.split tokenization as before), so the lookup is hashed and runs in C
+- multi-word terms (phrases): one pass over the text with an Aho-Corasick
+  automaton (pyahocorasick) when it's installed; otherwise one compiled regex
+  shaped like the phrase trie, searched from every match start + 1 so
+  overlapping phrases still count
+
+Phrases count anywhere they occur (plain substring, like before), single-word
+terms only as whole tokens. Output is identical to the old function: the
+sorted list of hits. Single-word terms that can never be a token under that
+split (ones with "-" or "/", e.g. "ci/cd") still never match.
+
+I tried a pure-Python Aho-Corasick too; a per-character dict walk is slower
+than the C substring scans it replaces, which is why the fallback is a regex.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:  # optional, the regex engine does the same job
+    ahocorasick = None
+
+TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9\+#\.]+")
+
+
+def normalize_skill_text(text: str) -> str:
+    """Lowercase + collapse whitespace (what the old _normalize did)."""
+    return " ".join((text or "").lower().split())
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    One regex for a set of literals, nested like their prefix trie
+    (e.g. "spring (?:boot|mvc)"), so the engine branches per character instead
+    of trying every alternative at every position. Optional groups are greedy,
+    so a match is always the longest phrase starting there.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    def __init__(self, terms: Iterable[str], engine: str = "auto"):
+        self.terms = tuple(dict.fromkeys(t.strip().lower() for t in terms if t and t.strip()))
+        self.single: FrozenSet[str] = frozenset(t for t in self.terms if " " not in t)
+        self.phrases = tuple(t for t in self.terms if " " in t)
+
+        if engine == "auto":
+            engine = "aho-corasick" if ahocorasick is not None else "regex"
+        if engine not in ("aho-corasick", "regex"):
+            raise ValueError(f"unknown skill matcher engine {engine!r}")
+        self.engine = engine
+
+        if engine == "aho-corasick":
+            self._automaton = ahocorasick.Automaton()
+            for phrase in self.phrases:
+                self._automaton.add_word(phrase, phrase)
+            if self.phrases:
+                self._automaton.make_automaton()
+        else:
+            self._regex = re.compile(trie_pattern(self.phrases)) if self.phrases else None
+            # phrases that are prefixes of a longer one: a match of the longer one
+            # at some position means they matched there too
+            self._prefixes = {
+                p: tuple(q for q in self.phrases if q != p and p.startswith(q))
+                for p in self.phrases
+            }
+
+    # --- matching ---
+
+    def _phrase_hits(self, t: str) -> Set[str]:
+        if not self.phrases:
+            return set()
+        if self.engine == "aho-corasick":
+            return {phrase for _, phrase in self._automaton.iter(t)}
+        hits: Set[str] = set()
+        search, prefixes = self._regex.search, self._prefixes
+        pos = 0
+        while True:
+            mo = search(t, pos)
+            if mo is None:
+                return hits
+            phrase = mo.group(0)
+            hits.add(phrase)
+            hits.update(prefixes[phrase])
+            pos = mo.start() + 1
+
+    def extract_normalized(self, t: str) -> List[str]:
+        """Sorted skills in already-normalized text (normalize_skill_text)."""
+        hits = self._phrase_hits(t)
+        hits.update(self.single.intersection(TOKEN_SPLIT_RE.split(t)))
+        return sorted(hits)
+
+    def extract(self, text: str) -> List[str]:
+        return self.extract_normalized(normalize_skill_text(text))
+
+    @property
+    def vocabulary(self) -> FrozenSet[str]:
+        return frozenset(self.terms)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "terms": len(self.terms),
+            "single_word": len(self.single),
+            "phrases": len(self.phrases),
+            "engine": self.engine,
+        }
@@ -0,0 +1,126 @@
+"""
+Hot-reloadable skill vocabulary
+-------------------------------
+
+SKILL_TERMS used to be read once at import, so editing skill_terms.txt meant a
+restart, and skills cached per resume quietly kept the old vocabulary.
+
+SkillVocabulary owns the compiled form of the file, one immutable snapshot:
+
+- terms:   the parsed term list
+- version: short hash of the terms, stamped on every cached skill result
+- matcher: SkillMatcher compiled from the terms
+- index:   empty SkillBitsetIndex over the same columns (users reload lazily)
+
+watch() polls the file's mtime/size on a daemon thread; a change recompiles
+on that thread and swaps `current` in one assignment, so a request sees either
+the old snapshot or the new one, never a mix. Readers grab `current` once per
+request and use its matcher/index/version together.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .skill_index import SkillBitsetIndex
+from .skill_matcher import SkillMatcher
+
+
+def vocabulary_version(terms: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(terms).encode("utf-8")).hexdigest()[:12]
+
+
+class CompiledSkills:
+    __slots__ = ("terms", "version", "matcher", "index", "loaded_at")
+
+    def __init__(self, terms: Sequence[str]):
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self.version = vocabulary_version(self.terms)
+        self.matcher = SkillMatcher(self.terms)
+        self.index = SkillBitsetIndex(self.terms)
+        self.loaded_at = time.time()
+
+
+class SkillVocabulary:
+    def __init__(self, path: os.PathLike, load: Callable[[Path], List[str]]):
+        self.path = Path(path)
+        self.load = load
+        self.current = CompiledSkills(load(self.path))
+        self.reloads = 0
+        self.error: Optional[str] = None
+        self._stamp = self._file_stamp()
+        self._lock = threading.Lock()  # one reload at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> str:
+        return self.current.version
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # --- reloading ---
+
+    def reload(self) -> bool:
+        """Re-read the file; True if the vocabulary changed and was swapped in."""
+        with self._lock:
+            if not self.path.exists():
+                return False  # mid-save or moved away: keep what we have
+            self._stamp = self._file_stamp()
+            try:
+                terms = self.load(self.path)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"[skills] could not reload {self.path}: {e}")
+                return False
+            self.error = None
+            if vocabulary_version(terms) == self.current.version:
+                return False  # touched, not changed
+            compiled = CompiledSkills(terms)  # compile before the swap
+            old, self.current = self.current, compiled
+            self.reloads += 1
+        print(f"[skills] vocabulary {old.version} -> {compiled.version} ({len(terms)} terms)")
+        return True
+
+    def check(self) -> bool:
+        """reload() if the file's mtime/size moved since the last read."""
+        if self._file_stamp() == self._stamp:
+            return False
+        return self.reload()
+
+    def watch(self, interval: float) -> None:
+        """Poll the file every `interval` seconds on a daemon thread (<= 0: don't)."""
+        if interval <= 0 or self._thread is not None:
+            return
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                self.check()
+
+        self._thread = threading.Thread(target=loop, name="skill-vocab-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, object]:
+        current = self.current
+        return {
+            "version": current.version,
+            "terms": len(current.terms),
+            "path": str(self.path),
+            "loaded_at": current.loaded_at,
+            "reloads": self.reloads,
+            "watching": self._thread is not None and not self._stop.is_set(),
+            "error": self.error,
+        }
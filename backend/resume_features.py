@@ -0,0 +1,331 @@
+"""
+Per-resume feature store
+------------------------
+
+/match, /select_resume and /skills/by_resume all used to re-derive the same
+things from the raw resume text on every call. Now upload kicks off one
+feature computation per resume and everything after that just loads it:
+
+- normalized:    normalize_text() output (TF-IDF matcher input)
+- terms/counts:  term frequencies of the normalized text (the TF half of the
+                 TF-IDF vector; IDF depends on the JD / corpus, so it's applied
+                 at request time)
+- selector_text: resume_selector's prep_text() output
+- skills:        extract_skills_from_text() hits, stamped with the skill
+                 vocabulary version they came from (skills_version)
+- embedding:     MiniLM vector + spaCy noun keywords (only when the embedding
+                 matcher is loaded)
+
+Each resume gets one .npz per feature version (a hash of everything that
+changes the output: normalizer mode, embedding model), so a config change just
+makes old files stale instead of wrong. The skill vocabulary is hot-reloaded,
+so it isn't part of that hash: readers compare skills_version with the current
+vocabulary and re-extract (and re-save) only the skills when it moved. Files live in
+STORAGE_DIR/features and are mirrored to S3 under users/<id>/features/ when
+USE_S3 is on.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+FEATURES_SCHEMA = 1
+
+
+def feature_version(**parts: Any) -> str:
+    """Short stable hash of whatever the features depend on."""
+    blob = json.dumps({"schema": FEATURES_SCHEMA, **parts}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:12]
+
+
+class ResumeFeatures:
+    __slots__ = (
+        "normalized",
+        "selector_text",
+        "skills",
+        "terms",
+        "counts",
+        "embedding",
+        "keywords",
+        "skills_version",
+    )
+
+    def __init__(
+        self,
+        normalized: str,
+        selector_text: str,
+        skills: List[str],
+        terms: List[str],
+        counts,
+        embedding: Optional[np.ndarray] = None,
+        keywords: Optional[List[str]] = None,
+        skills_version: str = "",
+    ):
+        self.normalized = normalized
+        self.selector_text = selector_text
+        self.skills = list(skills)
+        self.terms = list(terms)
+        self.counts = np.asarray(counts, dtype=np.int32)
+        self.embedding = None if embedding is None else np.asarray(embedding, dtype=np.float32)
+        self.keywords = list(keywords or [])
+        self.skills_version = skills_version
+
+    def term_counts(self) -> Dict[str, int]:
+        return dict(zip(self.terms, self.counts.tolist()))
+
+    def replace(self, **changes) -> "ResumeFeatures":
+        """Copy with some fields swapped; the object the store's LRU hands out is never mutated."""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return ResumeFeatures(**fields)
+
+    # --- .npz (no pickle) ---
+
+    def to_bytes(self) -> bytes:
+        arrays = {
+            "normalized": np.array(self.normalized),
+            "selector_text": np.array(self.selector_text),
+            "skills": np.array(self.skills, dtype=str),
+            "terms": np.array(self.terms, dtype=str),
+            "counts": self.counts,
+            "keywords": np.array(self.keywords, dtype=str),
+            "skills_version": np.array(self.skills_version),
+        }
+        if self.embedding is not None:
+            arrays["embedding"] = self.embedding
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **arrays)
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ResumeFeatures":
+        with np.load(io.BytesIO(data), allow_pickle=False) as z:
+            return cls(
+                normalized=str(z["normalized"]),
+                selector_text=str(z["selector_text"]),
+                skills=z["skills"].tolist(),
+                terms=z["terms"].tolist(),
+                counts=z["counts"],
+                embedding=z["embedding"] if "embedding" in z.files else None,
+                keywords=z["keywords"].tolist(),
+                skills_version=str(z["skills_version"]) if "skills_version" in z.files else "",
+            )
+
+
+class ResumeFeatureStore:
+    """
+    memory LRU -> local .npz -> S3 .npz, computed with `compute(text)` on a miss.
+
+    submit() runs the computation on a background thread (upload returns
+    right away); a read that races it waits for that job instead of doing the
+    work twice.
+    """
+
+    def __init__(
+        self,
+        root: os.PathLike,
+        version: str,
+        compute: Callable[[str], ResumeFeatures],
+        remote_get: Optional[Callable[[str], bytes]] = None,
+        remote_put: Optional[Callable[..., Any]] = None,
+        remote_delete: Optional[Callable[[str], Any]] = None,
+        cache_size: int = 128,
+        workers: int = 1,
+    ):
+        self.root = Path(root)
+        self.version = version
+        self.compute = compute
+        self.remote_get = remote_get
+        self.remote_put = remote_put
+        self.remote_delete = remote_delete
+        self.cache_size = max(0, int(cache_size))
+
+        self._mem: "OrderedDict[str, ResumeFeatures]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-features")
+        self.counts = {"memory": 0, "disk": 0, "remote": 0, "computed": 0, "failed": 0}
+
+    # --- keys ---
+
+    def path(self, rid: str) -> Path:
+        return self.root / f"{rid}.{self.version}.npz"
+
+    def remote_key(self, user_id: str, rid: str) -> str:
+        return f"users/{user_id}/features/{rid}.{self.version}.npz"
+
+    def _count(self, what: str) -> None:
+        with self._lock:
+            self.counts[what] += 1
+
+    def _remember(self, rid: str, feats: ResumeFeatures) -> None:
+        if self.cache_size == 0:
+            return
+        with self._lock:
+            self._mem[rid] = feats
+            self._mem.move_to_end(rid)
+            while len(self._mem) > self.cache_size:
+                self._mem.popitem(last=False)
+
+    # --- read ---
+
+    def load(self, rid: str, user_id: Optional[str] = None) -> Optional[ResumeFeatures]:
+        """Stored features for rid at the current version, or None (never computes)."""
+        rid = str(rid)
+        with self._lock:
+            feats = self._mem.get(rid)
+            if feats is not None:
+                self._mem.move_to_end(rid)
+        if feats is not None:
+            self._count("memory")
+            return feats
+
+        path = self.path(rid)
+        if path.exists():
+            try:
+                feats = ResumeFeatures.from_bytes(path.read_bytes())
+            except Exception as e:
+                print(f"[features] unreadable {path.name}, ignoring: {e}")
+            if feats is not None:
+                self._count("disk")
+                self._remember(rid, feats)
+                return feats
+
+        if user_id and self.remote_get is not None:
+            try:
+                data = self.remote_get(self.remote_key(user_id, rid))
+                feats = ResumeFeatures.from_bytes(data)
+            except Exception:
+                feats = None  # not mirrored (yet)
+            if feats is not None:
+                self._count("remote")
+                self._remember(rid, feats)
+                self._write_local(path, data)
+                return feats
+        return None
+
+    def get(
+        self, rid: str, text: Callable[[], str], user_id: Optional[str] = None
+    ) -> ResumeFeatures:
+        """load(), else wait for a pending upload job, else compute + save now."""
+        rid = str(rid)
+        feats = self.load(rid, user_id)
+        if feats is not None:
+            return feats
+        with self._lock:
+            pending = self._pending.get(rid)
+        if pending is not None:
+            try:
+                return pending.result()
+            except Exception:
+                pass  # the background job failed; try once more inline
+        else:
+            # a job that finished between load() and here has already saved its file
+            feats = self.load(rid, user_id)
+            if feats is not None:
+                return feats
+        return self.compute_and_save(rid, text(), user_id)
+
+    def pending(self, rid: str) -> bool:
+        """True while an upload job for rid is still running."""
+        with self._lock:
+            return str(rid) in self._pending
+
+    # --- write ---
+
+    def compute_and_save(
+        self, rid: str, text: str, user_id: Optional[str] = None
+    ) -> ResumeFeatures:
+        try:
+            feats = self.compute(text or "")
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("computed")
+        self.save(str(rid), feats, user_id)
+        return feats
+
+    def submit(self, rid: str, text: str, user_id: Optional[str] = None) -> Future:
+        rid = str(rid)
+
+        def job() -> ResumeFeatures:
+            try:
+                return self.compute_and_save(rid, text, user_id)
+            except Exception as e:
+                print(f"[features] could not compute features for {rid}: {e}")
+                raise
+            finally:
+                with self._lock:
+                    self._pending.pop(rid, None)
+
+        with self._lock:
+            future = self._pool.submit(job)
+            self._pending[rid] = future
+        return future
+
+    def save(self, rid: str, feats: ResumeFeatures, user_id: Optional[str] = None) -> None:
+        data = feats.to_bytes()
+        self._write_local(self.path(rid), data)
+        self._remember(rid, feats)
+        if user_id and self.remote_put is not None:
+            try:
+                self.remote_put(
+                    self.remote_key(user_id, rid), data, content_type="application/octet-stream"
+                )
+            except Exception as e:
+                print(f"[features] could not mirror {rid} to S3: {e}")
+
+    def _write_local(self, path: Path, data: bytes) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[features] could not write {path}: {e}")
+
+    def delete(self, rid: str, user_id: Optional[str] = None) -> None:
+        """Drop every local version of rid's features and the current S3 copy."""
+        rid = str(rid)
+        with self._lock:
+            self._mem.pop(rid, None)
+            pending = self._pending.get(rid)
+        if pending is not None:
+            try:
+                pending.result()  # don't let a late upload job re-create the files
+            except Exception:
+                pass
+        for path in self.root.glob(f"{rid}.*.npz"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        if user_id and self.remote_delete is not None:
+            try:
+                self.remote_delete(self.remote_key(user_id, rid))
+            except Exception as e:
+                print(f"[features] could not delete {rid} from S3: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "cached": len(self._mem),
+                "pending": len(self._pending),
+                "memory_hits": self.counts["memory"],
+                "disk_hits": self.counts["disk"],
+                "remote_hits": self.counts["remote"],
+                "computed": self.counts["computed"],
+                "failed": self.counts["failed"],
+                "remote": self.remote_get is not None,
+            }
@@ -0,0 +1,168 @@
+"""
+Benchmark: embedding backends (sentence-transformers/torch vs ONNX fp32 vs ONNX int8).
+
+Run from repo root (after python scripts/export_onnx_embeddings.py):
+    python benchmarks/bench_embeddings.py [--repeat 3] [--threads 1]
+
+Each backend runs in its own subprocess so load time and peak RSS are per
+backend. Texts are the dataset resumes + JDs (long) and form labels (short).
+For each backend it reports texts/s one text at a time (the /match path) and
+in batches of 32 (select_resume / feature precompute), plus cosine agreement
+of every vector with the torch one.
+
+Results go to benchmarks/results/embeddings.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+RESULTS_PATH = REPO / "benchmarks" / "results" / "embeddings.json"
+LABELS_CSV = REPO / "dataset" / "form_labels.csv"
+VARIANTS = ("torch", "onnx-fp32", "onnx-int8")
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def load_texts() -> Dict[str, List[str]]:
+    docs = []
+    for folder in ("resumes", "jobs"):
+        for path in sorted((REPO / "dataset" / folder).glob("*.txt")):
+            docs.append(path.read_text(encoding="utf-8", errors="ignore"))
+    labels = []
+    if LABELS_CSV.exists():
+        with open(LABELS_CSV, encoding="utf-8", newline="") as fh:
+            labels = sorted({(row.get("label_text") or "").strip() for row in csv.DictReader(fh)})
+        labels = [label for label in labels if label][:500]
+    return {"documents": docs, "labels": labels}
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def build(variant: str, threads: int):
+    if variant == "torch":
+        import torch
+
+        from ml.embedding_backends import SentenceTransformerBackend
+
+        if threads:
+            torch.set_num_threads(threads)
+        return SentenceTransformerBackend(MODEL_NAME)
+    from ml.embedding_backends import OnnxEmbeddingBackend
+
+    return OnnxEmbeddingBackend(
+        quantized=variant == "onnx-int8", threads=threads or None, model_name=MODEL_NAME
+    )
+
+
+def run_variant(variant: str, repeat: int, threads: int, vectors_out: Path) -> Dict[str, object]:
+    sets = load_texts()
+    t0 = time.perf_counter()
+    backend = build(variant, threads)
+    load_s = time.perf_counter() - t0
+    rss_loaded = peak_rss_mb()
+    backend.encode(["warm up"])
+
+    result: Dict[str, object] = {"variant": variant, "load_s": round(load_s, 3)}
+    vectors = []
+    for name, texts in sets.items():
+        if not texts:
+            continue
+        single = min(_timed(lambda: [backend.encode([t]) for t in texts]) for _ in range(repeat))
+        batched = min(_timed(lambda: backend.encode(texts, batch_size=32)) for _ in range(repeat))
+        result[name] = {
+            "texts": len(texts),
+            "single_per_s": round(len(texts) / single, 1),
+            "batch32_per_s": round(len(texts) / batched, 1),
+        }
+        vectors.append(np.asarray(backend.encode(texts, batch_size=32), dtype=np.float32))
+
+    np.save(vectors_out, np.concatenate(vectors))
+    result["rss_after_load_mb"] = round(rss_loaded, 1)
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return result
+
+
+def _timed(fn) -> float:
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+def cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--threads", type=int, default=0, help="intra-op threads (0 = library default)")
+    ap.add_argument("--out", type=Path, default=RESULTS_PATH)
+    ap.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)  # child process
+    ap.add_argument("--vectors", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.repeat, args.threads, args.vectors)))
+        return 0
+
+    tmp = Path(tempfile.mkdtemp(prefix="sff-emb-"))
+    results, vectors = {}, {}
+    for variant in VARIANTS:
+        vec_path = tmp / f"{variant}.npy"
+        cmd = [sys.executable, __file__, "--variant", variant, "--vectors", str(vec_path)]
+        cmd += ["--repeat", str(args.repeat), "--threads", str(args.threads)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"[{variant}] failed:\n{proc.stderr[-2000:]}")
+            continue
+        results[variant] = json.loads(proc.stdout.strip().splitlines()[-1])
+        vectors[variant] = np.load(vec_path)
+
+    if "torch" in vectors:
+        for variant, vecs in vectors.items():
+            cos = cosine_rows(vectors["torch"], vecs)
+            results[variant]["cosine_vs_torch"] = {
+                "mean": round(float(cos.mean()), 5),
+                "min": round(float(cos.min()), 5),
+            }
+
+    header = f"{'backend':<11}{'load s':>8}{'peak MB':>9}"
+    header += f"{'doc 1/s':>9}{'doc 32/s':>10}{'label 1/s':>11}{'label 32/s':>12}{'min cos':>9}"
+    print(header)
+    for name, r in results.items():
+        docs, labels = r.get("documents", {}), r.get("labels", {})
+        cos = r.get("cosine_vs_torch", {}).get("min", float("nan"))
+        print(
+            f"{name:<11}{r['load_s']:>8.2f}{r['peak_rss_mb']:>9.0f}"
+            f"{docs.get('single_per_s', 0):>9.1f}{docs.get('batch32_per_s', 0):>10.1f}"
+            f"{labels.get('single_per_s', 0):>11.1f}{labels.get('batch32_per_s', 0):>12.1f}"
+            f"{cos:>9.4f}"
+        )
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\n=== wrote {args.out} ===")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
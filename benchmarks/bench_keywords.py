@@ -0,0 +1,161 @@
+"""
+Benchmark: MatcherEmbeddings.match_resume_job latency + memory, before/after the
+trimmed spaCy keyword extractor.
+
+Run from repo root:
+    python benchmarks/bench_keywords.py [--repeat 3]
+
+Each variant runs in its own subprocess so peak RSS is per variant:
+- before: full en_core_web_sm (parser, NER, lemmatizer loaded), one nlp() call
+          per text, nothing cached (how compare_keywords used to work)
+- after:  SpacyKeywordExtractor (parser/NER/lemmatizer excluded), resume + JD
+          through one nlp.pipe call, keyword sets cached; resumes are
+          pre-warmed with persist=True the way upload does it
+
+Every resume is matched against every JD. The embedding cache is off in both
+variants so only the keyword side differs. Reports model load time, cold and
+warm per-match latency (mean / p95) and peak RSS.
+
+Results go to benchmarks/results/keywords.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+RESULTS_PATH = REPO / "benchmarks" / "results" / "keywords.json"
+VARIANTS = ("before", "after")
+
+
+def load_texts(folder: str) -> List[str]:
+    paths = sorted((REPO / "dataset" / folder).glob("*.txt"))
+    return [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+
+
+class UntrimmedKeywords:
+    """The old compare_keywords path: full pipeline, one nlp() per text, no cache."""
+
+    def __init__(self, model: str = "en_core_web_sm"):
+        import spacy
+
+        from ml.keyword_extractor import keywords_from_doc
+
+        self.nlp = spacy.load(model)
+        self._kw = keywords_from_doc
+
+    def extract_many(self, texts, persist=False):
+        return [self._kw(self.nlp(t.lower())) for t in texts]
+
+    def extract(self, text, persist=False):
+        return self.extract_many([text])[0]
+
+    def forget(self, texts):
+        pass
+
+    def stats(self):
+        return {"pipeline": list(self.nlp.pipe_names)}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return {"mean_ms": round(statistics.mean(ordered) * 1e3, 3), "p95_ms": round(p95 * 1e3, 3)}
+
+
+def run_variant(variant: str, repeat: int) -> Dict[str, object]:
+    from ml.embedding_cache import EmbeddingCache
+    from ml.keyword_extractor import SpacyKeywordExtractor
+    from ml.matcher_embeddings import MatcherEmbeddings
+
+    resumes, jobs = load_texts("resumes"), load_texts("jobs")
+
+    t0 = time.perf_counter()
+    if variant == "before":
+        keywords = UntrimmedKeywords()
+    else:
+        keywords = SpacyKeywordExtractor(doc_cache_dir=tempfile.mkdtemp(prefix="sff-docs-"))
+    matcher = MatcherEmbeddings(keywords=keywords, cache=EmbeddingCache("bench", maxsize=0))
+    load_s = time.perf_counter() - t0
+    rss_loaded = peak_rss_mb()
+
+    if variant == "after":
+        keywords.extract_many(resumes, persist=True)  # what upload does via the feature store
+
+    cold, warm = [], []
+    for i in range(repeat):
+        for jd in jobs:
+            for resume in resumes:
+                t = time.perf_counter()
+                matcher.match_resume_job(resume, jd)
+                (cold if i == 0 else warm).append(time.perf_counter() - t)
+
+    return {
+        "variant": variant,
+        "pipeline": keywords.stats()["pipeline"],
+        "pairs": len(resumes) * len(jobs),
+        "load_s": round(load_s, 3),
+        "cold": summarize(cold),
+        "warm": summarize(warm) if warm else None,
+        "rss_after_load_mb": round(rss_loaded, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=3, help="passes over every resume x JD pair")
+    ap.add_argument("--out", type=Path, default=RESULTS_PATH)
+    ap.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)  # child process
+    args = ap.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.repeat)))
+        return 0
+
+    results = {}
+    for variant in VARIANTS:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--variant", variant, "--repeat", str(args.repeat)],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr)
+            return proc.returncode
+        results[variant] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print(f"{'variant':<8}{'load s':>8}{'cold ms':>10}{'warm ms':>10}{'p95 ms':>9}{'peak MB':>10}")
+    for name, r in results.items():
+        warm = r["warm"] or r["cold"]
+        print(
+            f"{name:<8}{r['load_s']:>8.2f}{r['cold']['mean_ms']:>10.1f}"
+            f"{warm['mean_ms']:>10.1f}{warm['p95_ms']:>9.1f}{r['peak_rss_mb']:>10.1f}"
+        )
+        print(f"         pipeline: {', '.join(r['pipeline'])}")
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\n=== wrote {args.out} ===")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
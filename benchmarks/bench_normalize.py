@@ -0,0 +1,171 @@
+"""
+Benchmark + parity report: normalize_text modes on dataset/jobs and dataset/resumes.
+
+Run from repo root:
+    python benchmarks/bench_normalize.py [--repeat 5] [--show 20]
+
+Times three ways of normalizing every document:
+- original: word_tokenize + pos_tag + lemmatizer.lemmatize per token (no memo),
+            i.e. normalize_text before the lemma memo table
+- full:     the same pipeline with the (word, pos) -> lemma memo (cold, then warm)
+- fast:     regex tokenizer + tagless lemma lookup (SFF_NORMALIZE_MODE=fast)
+
+and reports how close "fast" gets to the original output per document:
+exact match, token-multiset agreement and set Jaccard, plus the most common
+tokens that come out differently. "full" must match the original exactly.
+
+Results go to benchmarks/results/normalize.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+import nltk  # noqa: E402
+
+from matcher import baseline_matcher as bm  # noqa: E402
+
+FOLDERS = [REPO / "dataset" / "jobs", REPO / "dataset" / "resumes"]
+RESULTS_PATH = REPO / "benchmarks" / "results" / "normalize.json"
+
+
+def load_docs() -> Dict[str, str]:
+    docs = {}
+    for folder in FOLDERS:
+        for path in sorted(folder.glob("*.txt")):
+            docs[f"{folder.name}/{path.name}"] = path.read_text(encoding="utf-8", errors="ignore")
+    return docs
+
+
+def original_normalize(text: str) -> str:
+    """normalize_text as it was before the memo table (kept here as the reference)."""
+    tokens = nltk.word_tokenize(text.lower())
+    tagged = nltk.pos_tag(tokens)
+    return " ".join(
+        bm.lemmatizer.lemmatize(word, bm.get_wordnet_pos(tag))
+        for word, tag in tagged
+        if word.isalpha() and word not in bm.stop_words
+    )
+
+
+def time_pass(fn: Callable[[str], str], docs: List[str]) -> float:
+    t0 = time.perf_counter()
+    for text in docs:
+        fn(text)
+    return time.perf_counter() - t0
+
+
+def clear_memos() -> None:
+    bm.lemmatize_cached.cache_clear()
+    bm.fast_lemma.cache_clear()
+
+
+# === Parity ===
+
+
+def compare_doc(ref: str, got: str) -> Dict[str, float]:
+    a, b = Counter(ref.split()), Counter(got.split())
+    overlap = sum((a & b).values())
+    total = max(sum(a.values()), sum(b.values())) or 1
+    sa, sb = set(a), set(b)
+    return {
+        "exact": ref == got,
+        "token_agreement": round(overlap / total, 4),
+        "jaccard": round(len(sa & sb) / (len(sa | sb) or 1), 4),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=5, help="passes over the corpus per mode")
+    ap.add_argument("--show", type=int, default=20, help="differing tokens to print")
+    ap.add_argument("--out", type=Path, default=RESULTS_PATH)
+    args = ap.parse_args()
+
+    docs = load_docs()
+    texts = list(docs.values())
+    n_tokens = sum(len(t.split()) for t in texts)
+    print(f"{len(texts)} documents, ~{n_tokens} whitespace tokens\n")
+
+    # warm up NLTK's lazy loaders so the first mode doesn't pay for them
+    original_normalize(texts[0])
+    bm.normalize_text_fast(texts[0])
+
+    timings: Dict[str, float] = {}
+    timings["original"] = min(time_pass(original_normalize, texts) for _ in range(args.repeat))
+    clear_memos()
+    timings["full_cold"] = time_pass(bm.normalize_text_full, texts)
+    timings["full_warm"] = min(time_pass(bm.normalize_text_full, texts) for _ in range(args.repeat))
+    clear_memos()
+    timings["fast_cold"] = time_pass(bm.normalize_text_fast, texts)
+    timings["fast_warm"] = min(time_pass(bm.normalize_text_fast, texts) for _ in range(args.repeat))
+
+    print(f"{'mode':<12}{'corpus ms':>12}{'docs/s':>10}{'speedup':>10}")
+    for mode, secs in timings.items():
+        print(
+            f"{mode:<12}{secs * 1e3:>12.1f}{len(texts) / secs:>10.1f}"
+            f"{timings['original'] / secs:>9.2f}x"
+        )
+
+    # --- parity ---
+    per_doc = {}
+    full_mismatch = []
+    diff_tokens: Counter = Counter()
+    for name, text in docs.items():
+        ref = original_normalize(text)
+        if bm.normalize_text_full(text) != ref:
+            full_mismatch.append(name)
+        fast = bm.normalize_text_fast(text)
+        per_doc[name] = compare_doc(ref, fast)
+        a, b = Counter(ref.split()), Counter(fast.split())
+        diff_tokens.update({f"-{t}": n for t, n in (a - b).items()})
+        diff_tokens.update({f"+{t}": n for t, n in (b - a).items()})
+
+    n = len(per_doc)
+    summary = {
+        "full_identical": not full_mismatch,
+        "fast_exact_docs": sum(d["exact"] for d in per_doc.values()),
+        "fast_mean_token_agreement": round(
+            sum(d["token_agreement"] for d in per_doc.values()) / n, 4
+        ),
+        "fast_min_token_agreement": min(d["token_agreement"] for d in per_doc.values()),
+        "fast_mean_jaccard": round(sum(d["jaccard"] for d in per_doc.values()) / n, 4),
+    }
+    print(f"\nfull == original on every document: {summary['full_identical']}")
+    if full_mismatch:
+        print(f"  !!! differs on: {', '.join(full_mismatch)}")
+    print(
+        f"fast vs original: {summary['fast_exact_docs']}/{n} identical, "
+        f"token agreement mean {summary['fast_mean_token_agreement']:.2%} "
+        f"(min {summary['fast_min_token_agreement']:.2%}), "
+        f"Jaccard mean {summary['fast_mean_jaccard']:.2%}"
+    )
+    print("\nmost common differences (- only in original, + only in fast):")
+    for token, count in diff_tokens.most_common(args.show):
+        print(f"  {token:<30}{count:>5}")
+
+    report = {
+        "documents": n,
+        "timings_ms": {k: round(v * 1e3, 3) for k, v in timings.items()},
+        "parity": summary,
+        "per_document": per_doc,
+        "top_differences": diff_tokens.most_common(args.show),
+        "lemma_cache": bm.lemma_cache_info(),
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n=== wrote {args.out} ===")
+    return 0 if not full_mismatch else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
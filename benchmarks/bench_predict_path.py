@@ -0,0 +1,333 @@
+"""
+Benchmark: /predict and /predict_batch through both backends, with scaling curves.
+
+Run from repo root:
+    python benchmarks/bench_predict_path.py                     # run + compare to baseline
+    python benchmarks/bench_predict_path.py --update-baseline   # record a new baseline
+    python benchmarks/bench_predict_path.py --backends flask --sizes 1,10 --repeat 20
+
+Everything runs in-process (Flask test client / FastAPI TestClient), so the
+numbers are the app's own cost: routing, JSON, cascade, model. For every
+backend x endpoint x batch size (1, 10, 100, 1000 labels) it records p50/p95/p99
+latency per "form" (one /predict_batch call, or N sequential /predict calls),
+labels/sec and the process's peak RSS so far, in two cache modes:
+
+- warm: the prediction cache and the exact-match tier are left alone (what a
+        busy server looks like; most CSV labels are answered by the exact tier)
+- cold: the prediction cache is cleared before every call and the exact tier
+        is switched off for the scenario, so every label reaches the model
+        (pure model cost)
+
+Each scenario also reports the cascade's own per-tier time (exact / model,
+mean ms and labels per form, from form_cascade.stats), so exact-tier lookups
+and model scoring can be told apart from routing + JSON.
+
+FastAPI's sequential /predict calls each sit out the micro-batch window
+(SFF_BATCH_WINDOW_MS), so set it to 0 to compare raw per-call cost.
+
+Labels come from dataset/form_labels_balanced.csv plus the golden demo-form
+labels. Results go to benchmarks/results/predict_path.json.
+
+Regression check: once a baseline has been recorded on the reference machine
+(--update-baseline, committed as benchmarks/baselines/predict_path.json),
+anything more than --tolerance worse than it gets flagged, and exits 1 with
+--fail-on-regression. No baseline is checked in yet; until there is one the
+check is reported as not run (exit 0) and the script only records results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as dt
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+# No model watcher thread while measuring.
+os.environ.setdefault("SFF_MODEL_POLL_SECONDS", "0")
+
+from tests.golden_form_mapping import GOLDEN_LABELS  # noqa: E402
+
+CSV_PATH = REPO / "dataset" / "form_labels_balanced.csv"
+RESULTS_PATH = REPO / "benchmarks" / "results" / "predict_path.json"
+BASELINE_PATH = REPO / "benchmarks" / "baselines" / "predict_path.json"
+
+DEFAULT_SIZES = (1, 10, 100, 1000)
+
+
+# === Inputs ===
+
+
+def label_pool(seed: int = 0) -> List[str]:
+    labels = list(GOLDEN_LABELS)
+    with open(CSV_PATH, "r", encoding="utf-8", newline="") as fh:
+        labels += [row["label_text"] for row in csv.DictReader(fh) if row.get("label_text")]
+    random.Random(seed).shuffle(labels)
+    return labels
+
+
+def draw(pool: List[str], size: int, i: int) -> List[str]:
+    """Batch #i of `size` labels, walking the shuffled pool so batches differ."""
+    start = (i * size) % len(pool)
+    out = pool[start:start + size]
+    while len(out) < size:
+        out += pool[: size - len(out)]
+    return out
+
+
+# === Clients ===
+
+
+def flask_caller(endpoint: str) -> Callable[[List[str]], None]:
+    from backend.api import app
+
+    client = app.test_client()
+    return _caller(lambda path, body: client.post(path, json=body).status_code, endpoint)
+
+
+def fastapi_caller(endpoint: str) -> Callable[[List[str]], None]:
+    from fastapi.testclient import TestClient
+
+    from backend.fastapi_app import app
+
+    client = TestClient(app)
+    return _caller(lambda path, body: client.post(path, json=body).status_code, endpoint)
+
+
+def _caller(post: Callable[[str, Dict[str, Any]], int], endpoint: str):
+    if endpoint == "predict_batch":
+
+        def call(labels: List[str]) -> None:
+            status = post("/predict_batch", {"labels": labels})
+            assert status == 200, status
+
+    else:
+        # one round trip per field, like the extension's per-field path
+
+        def call(labels: List[str]) -> None:
+            for label in labels:
+                status = post("/predict", {"label": label})
+                assert status == 200, status
+
+    return call
+
+
+CALLERS = {"flask": flask_caller, "fastapi": fastapi_caller}
+
+
+# === Measuring ===
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def repeats_for(size: int, requested: int) -> int:
+    # keep big batches from taking forever while small ones still get enough samples
+    if requested:
+        return requested
+    return max(5, min(200, 2000 // size))
+
+
+def tier_totals(cascade) -> Dict[str, tuple]:
+    """tier -> (labels, total ms) so far, from the cascade's own counters."""
+    tiers = cascade.stats.snapshot()["tiers"]
+    return {tier: (v["labels"], v["total_ms"]) for tier, v in tiers.items()}
+
+
+@contextmanager
+def exact_tier_off(cascade) -> Iterator[None]:
+    exact, cascade.exact = cascade.exact, None
+    try:
+        yield
+    finally:
+        cascade.exact = exact
+
+
+def run_scenario(
+    call, clear_cache, cascade, pool, size: int, repeat: int, cold: bool
+) -> Dict[str, Any]:
+    call(draw(pool, size, 0))  # warm-up (imports, first-call allocations)
+    before = tier_totals(cascade)
+    times: List[float] = []
+    for i in range(repeat):
+        batch = draw(pool, size, i + 1)
+        if cold:
+            clear_cache()
+        t0 = time.perf_counter()
+        call(batch)
+        times.append(time.perf_counter() - t0)
+
+    after = tier_totals(cascade)
+    tiers = {
+        tier: {
+            "labels_per_form": round((after[tier][0] - before[tier][0]) / repeat, 2),
+            "ms_per_form": round((after[tier][1] - before[tier][1]) / repeat, 3),
+        }
+        for tier in ("exact", "model")
+    }
+
+    times.sort()
+    total = sum(times)
+    return {
+        "size": size,
+        "repeat": repeat,
+        "p50_ms": round(percentile(times, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(times, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(times, 0.99) * 1e3, 3),
+        "labels_per_sec": round(size * repeat / total, 1) if total else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "tiers": tiers,
+    }
+
+
+# === Baseline comparison ===
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable list of scenarios that got worse than the baseline by > tolerance."""
+    flagged = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            flagged.append(f"{key}: p95 {base['p95_ms']} -> {cur['p95_ms']} ms")
+        if base["labels_per_sec"] and cur["labels_per_sec"] < base["labels_per_sec"] * (
+            1 - tolerance
+        ):
+            flagged.append(
+                f"{key}: throughput {base['labels_per_sec']} -> {cur['labels_per_sec']} labels/s"
+            )
+        if base["peak_rss_mb"] and cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            flagged.append(f"{key}: peak RSS {base['peak_rss_mb']} -> {cur['peak_rss_mb']} MB")
+    return flagged
+
+
+def git_sha() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True
+        )
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--backends", default="flask,fastapi")
+    ap.add_argument("--endpoints", default="predict,predict_batch")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    ap.add_argument("--modes", default="warm,cold")
+    ap.add_argument("--repeat", type=int, default=0, help="calls per scenario (0 = by size)")
+    ap.add_argument("--out", type=Path, default=RESULTS_PATH)
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--fail-on-regression", action="store_true")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    pool = label_pool()
+    results: Dict[str, Any] = {}
+
+    import backend.api as api
+
+    def clear_cache() -> None:
+        api.prediction_cache.clear()
+
+    header = ("scenario", "p50 ms", "p95 ms", "p99 ms", "labels/s", "RSS MB", "exact", "model")
+    print("{:<40}{:>10}{:>10}{:>10}{:>12}{:>9}{:>16}{:>16}".format(*header))
+    for backend in args.backends.split(","):
+        for endpoint in args.endpoints.split(","):
+            call = CALLERS[backend](endpoint)
+            for size in sizes:
+                for mode in args.modes.split(","):
+                    key = f"{backend}/{endpoint}/{size}/{mode}"
+                    repeat = repeats_for(size, args.repeat)
+                    cold = mode == "cold"
+                    with exact_tier_off(api.form_cascade) if cold else nullcontext():
+                        r = run_scenario(
+                            call, clear_cache, api.form_cascade, pool, size, repeat, cold
+                        )
+                    results[key] = r
+                    # per tier: "<labels per form> / <ms per form>"
+                    ex, mo = r["tiers"]["exact"], r["tiers"]["model"]
+                    print(
+                        f"{key:<40}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+                        f"{r['labels_per_sec']:>12.1f}{r['peak_rss_mb']:>9.1f}"
+                        f"{ex['labels_per_form']:>8g} /{ex['ms_per_form']:>6.2f}"
+                        f"{mo['labels_per_form']:>8g} /{mo['ms_per_form']:>6.2f}"
+                    )
+
+    report = {
+        "meta": {
+            "recorded_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "git_sha": git_sha(),
+            "model_version": api.model_manager.version,
+            "model_type": type(api.model_manager.model).__name__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n=== wrote {args.out} ===")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"=== baseline updated: {args.baseline} ===")
+        return 0
+
+    if not args.baseline.exists():
+        print(
+            f"regression check NOT run: no baseline at {args.baseline}; record one on the "
+            "reference machine with --update-baseline and commit it"
+        )
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    unchecked = [key for key in results if key not in baseline.get("results", {})]
+    if unchecked:
+        print(f"!!! {len(unchecked)} scenario(s) not in the baseline: {', '.join(unchecked)}")
+        if len(unchecked) == len(results):
+            return 1 if args.fail_on_regression else 0
+    flagged = compare(results, baseline.get("results", {}), args.tolerance)
+    if not flagged:
+        print(f"no regressions vs baseline ({baseline['meta'].get('git_sha', '?')})")
+        return 0
+    print(f"\n!!! {len(flagged)} regression(s) over {args.tolerance:.0%} vs baseline:")
+    for line in flagged:
+        print(f"  - {line}")
+    return 1 if args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark: /select_resume TF-IDF, per-call refit vs the per-user select index.
+
+Run from repo root:
+    python benchmarks/bench_select.py [--repeat 20]
+
+A user with N resumes (the dataset resumes, cycled, each copy with a few
+extra tokens so they aren't identical) is stored as .txt files in a temp dir.
+Per JD (dataset/jobs):
+- refit: read every resume file + select_best_resume (TfidfVectorizer fit on
+         JD + all resumes), what /select_resume did before
+- index: UserTfidfIndex.scores (JD analysis + sparse mat-vecs) + ranking;
+         one file read for the best resume's text
+Also reports the index's incremental cost of one upload. Scores are checked
+against the refit before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from backend.matcher.resume_index import UserTfidfIndex, bump_terms_in  # noqa: E402
+from backend.matcher.resume_selector import prep_text, select_best_resume  # noqa: E402
+
+SIZES = (5, 20, 50, 200)
+
+
+def load(folder: str) -> List[str]:
+    paths = sorted((REPO / "dataset" / folder).glob("*.txt"))
+    return [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-N ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    base, jds = load("resumes"), load("jobs")
+    print(f"{'resumes':>8}{'refit ms':>11}{'index ms':>11}{'upload ms':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            paths = []
+            for i in range(n):
+                path = Path(tmp) / f"n{n}_{i}.txt"
+                path.write_text(f"{base[i % len(base)]}\nproject{i} team{i % 7}", encoding="utf-8")
+                paths.append(path)
+
+            index = UserTfidfIndex()
+            for i, path in enumerate(paths):
+                text = path.read_text(encoding="utf-8")
+                index.add(str(i), prep_text(text), text)
+
+            def refit(jd):
+                items = [
+                    {"id": str(i), "text": p.read_text(encoding="utf-8")}
+                    for i, p in enumerate(paths)
+                ]
+                return select_best_resume(jd, items)[1]
+
+            def indexed(jd):
+                ids, sims = index.scores(prep_text(jd))
+                items = [{"id": rid, "bump_terms": index.bumps[rid]} for rid in ids]
+                best, ranking = select_best_resume(jd, items, tfidf_sims=sims)
+                paths[int(best["id"])].read_text(encoding="utf-8")
+                return ranking
+
+            for jd in jds:
+                # same score per resume; copies of one resume tie exactly, and the
+                # refit orders those by float noise, so compare scores, not order
+                expected, got = dict(refit(jd)), dict(indexed(jd))
+                assert all(abs(expected[rid] - got[rid]) < 1e-12 for rid in expected)
+
+            repeat = max(1, args.repeat // max(1, n // 20))
+            t_refit = timed(lambda: [refit(jd) for jd in jds], repeat) / len(jds)
+            t_index = timed(lambda: [indexed(jd) for jd in jds], repeat) / len(jds)
+
+            extra = base[0] + " brand new upload"
+
+            def upload():
+                index.add("new", prep_text(extra), extra)
+                index.scores(prep_text(jds[0]))  # first query after it rebuilds the matrix
+                bump_terms_in(extra)
+
+            t_upload = timed(upload, repeat)
+            print(f"{n:>8}{t_refit:>11.2f}{t_index:>11.2f}{t_upload:>11.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark: per-document skill extraction, old extract_skills_from_text vs SkillMatcher.
+
+Run from repo root:
+    python benchmarks/bench_skills.py [--repeat 50]
+
+Documents are the dataset resumes + JDs as they are ("1x") and each one repeated
+10x / 100x to stand in for long multi-page resumes and scraped JD pages.
+Variants:
+- old:          the previous function (term lists rebuilt per call, one
+                substring scan per phrase, Python loop over single-word terms)
+- regex:        SkillMatcher with the compiled trie-regex phrase engine
+- aho-corasick: SkillMatcher with pyahocorasick (skipped if not installed)
+
+Every variant's output is checked against the old one before timing.
+Results go to benchmarks/results/skills.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from backend.matcher import skill_matcher  # noqa: E402
+from backend.matcher.skill_matcher import SkillMatcher  # noqa: E402
+
+RESULTS_PATH = REPO / "benchmarks" / "results" / "skills.json"
+TERMS_PATH = REPO / "backend" / "skill_terms.txt"
+SIZES = (1, 10, 100)
+
+
+def load_terms() -> List[str]:
+    """Same rules as api.load_skill_terms (comments/blank lines skipped, lowercased, deduped)."""
+    terms: List[str] = []
+    for raw in TERMS_PATH.read_text(encoding="utf-8").splitlines():
+        line = raw.strip()
+        if line and not line.startswith("#") and line.lower() not in terms:
+            terms.append(line.lower())
+    return terms
+
+
+def old_extract(terms: List[str]) -> Callable[[str], List[str]]:
+    def extract(text: str) -> List[str]:
+        t = " ".join(text.lower().split())
+        hits = set()
+        multi = [s for s in terms if " " in s]
+        single = [s for s in terms if " " not in s]
+        for m in multi:
+            if m in t:
+                hits.add(m)
+        tokens = set(re.split(r"[^a-z0-9\+#\.]+", t))
+        for s in single:
+            if s in tokens:
+                hits.add(s)
+        return sorted(hits)
+
+    return extract
+
+
+def load_docs() -> List[str]:
+    paths = sorted((REPO / "dataset" / "resumes").glob("*.txt"))
+    paths += sorted((REPO / "dataset" / "jobs").glob("*.txt"))
+    return [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+
+
+def timed(fn, docs: List[str], repeat: int) -> float:
+    """Best-of-N mean ms per document."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for doc in docs:
+            fn(doc)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(docs) * 1e3
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--out", type=Path, default=RESULTS_PATH)
+    args = ap.parse_args()
+
+    terms = load_terms()
+    variants: Dict[str, Callable[[str], List[str]]] = {"old": old_extract(terms)}
+    variants["regex"] = SkillMatcher(terms, engine="regex").extract
+    if skill_matcher.ahocorasick is not None:
+        variants["aho-corasick"] = SkillMatcher(terms, engine="aho-corasick").extract
+    else:
+        print("(pyahocorasick not installed, skipping that engine)")
+
+    base = load_docs()
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{len(terms)} terms, {len(base)} documents")
+    print(f"{'size':<6}{'chars':>9}" + "".join(f"{name:>14}" for name in variants))
+    for size in SIZES:
+        docs = [" ".join([doc] * size) for doc in base]
+        for name, fn in variants.items():
+            for doc in docs:
+                assert fn(doc) == variants["old"](doc), f"{name} differs from old"
+        repeat = max(1, args.repeat // size)
+        row = {name: round(timed(fn, docs, repeat), 4) for name, fn in variants.items()}
+        chars = sum(len(d) for d in docs) // len(docs)
+        results[f"{size}x"] = {"avg_chars": chars, **row}
+        print(f"{size}x".ljust(6) + f"{chars:>9}" + "".join(f"{v:>11.3f} ms" for v in row.values()))
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\n=== wrote {args.out} ===")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 import os
+import re
+from functools import lru_cache
 
 import nltk
 from nltk.corpus import stopwords
+from nltk.corpus.reader.wordnet import ADJ, ADV, NOUN, VERB
 from nltk.stem import WordNetLemmatizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -18,11 +21,16 @@ nltk.download("stopwords", quiet=True)
 lemmatizer = WordNetLemmatizer()
 stop_words = set(stopwords.words("english"))
 
+# "full" = word_tokenize + perceptron POS tagger + WordNet (the original pipeline)
+# "fast" = regex tokenizer + lemma lookup without the tagger (see normalize_text_fast)
+# "fast" stays opt-in until its parity with "full" is measured: run
+# benchmarks/bench_normalize.py (report in benchmarks/results/normalize.json) first
+NORMALIZE_MODE = os.getenv("SFF_NORMALIZE_MODE", "full").lower()
+LEMMA_CACHE_SIZE = int(os.getenv("SFF_LEMMA_CACHE_SIZE", "50000"))
+
 
 def get_wordnet_pos(tag):
     """Map POS tag to first character lemmatize() accepts."""
-    from nltk.corpus.reader.wordnet import ADJ, ADV, NOUN, VERB
-
     if tag.startswith("J"):
         return ADJ
     elif tag.startswith("V"):
@@ -35,18 +43,71 @@ def get_wordnet_pos(tag):
         return NOUN
 
 
-def normalize_text(text: str) -> str:
+# Resume/JD vocabulary is small and repetitive, so I memo (word, pos) -> lemma
+# for the whole process instead of walking WordNet for every token.
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize_cached(word: str, pos: str) -> str:
+    return lemmatizer.lemmatize(word, pos)
+
+
+def normalize_text_full(text: str) -> str:
     """Lowercase, tokenize, remove stopwords, and lemmatize with POS."""
     tokens = nltk.word_tokenize(text.lower())
     tagged = nltk.pos_tag(tokens)  # get part of speech
     lemmatized = [
-        lemmatizer.lemmatize(word, get_wordnet_pos(tag))
+        lemmatize_cached(word, get_wordnet_pos(tag))
         for word, tag in tagged
         if word.isalpha() and word not in stop_words
     ]
     return " ".join(lemmatized)
 
 
+# --- Fast mode ---
+# Tokens keep inner - . ' like word_tokenize does ("full-stack", "node.js"), so
+# they get dropped by the isalpha() filter the same way; possessive 's is split
+# off first ("python's" -> "python").
+FAST_TOKEN_RE = re.compile(r"[^\W_]+(?:[-.'][^\W_]+)*")
+POSSESSIVE_RE = re.compile(r"'s\b")
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def fast_lemma(word: str) -> str:
+    """
+    Lemma without a POS tag: WordNet's noun form first, and the verb form
+    for -ing/-ed words that aren't nouns ("developing", "managed").
+    """
+    lemma = lemmatize_cached(word, NOUN)
+    if lemma == word and word.endswith(("ing", "ed")):
+        lemma = lemmatize_cached(word, VERB)
+    return lemma
+
+
+def normalize_text_fast(text: str) -> str:
+    """Same shape of output as normalize_text_full, without the perceptron tagger."""
+    tokens = FAST_TOKEN_RE.findall(POSSESSIVE_RE.sub(" ", text.lower()))
+    return " ".join(
+        fast_lemma(word) for word in tokens if word.isalpha() and word not in stop_words
+    )
+
+
+def normalize_text(text: str, mode: str | None = None) -> str:
+    """normalize_text_full (default) or normalize_text_fast, per SFF_NORMALIZE_MODE."""
+    if (mode or NORMALIZE_MODE) == "fast":
+        return normalize_text_fast(text)
+    return normalize_text_full(text)
+
+
+def lemma_cache_info() -> dict:
+    info = lemmatize_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "mode": NORMALIZE_MODE,
+    }
+
+
 # --- Function to load all .txt files from a folder ---
 def load_texts_from_folder(folder_path: str):
     """Load all .txt files from a folder into a dict."""
@@ -0,0 +1,185 @@
+"""
+Cache of normalize_text() output
+--------------------------------
+
+normalize_text() runs word_tokenize + pos_tag + WordNet lemmatization over the
+whole text, which is by far the slowest part of /match for a stored resume,
+and the resume hasn't changed since it was uploaded.
+
+NormalizedTextCache keys the normalized text by a sha256 of the raw text:
+1. in-memory LRU (per process)
+2. a .txt file per hash on local disk (next to the extracted resume text)
+3. optionally S3 under the user's prefix (users/<id>/normalized/<hash>.txt)
+and only calls normalize_text on a miss everywhere.
+
+The normalizer version is part of the hash, so changing normalize_text (bump
+NORMALIZER_VERSION) can never serve stale output.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+NORMALIZER_VERSION = "1"
+
+
+class NormalizedTextCache:
+    def __init__(
+        self,
+        normalize_fn: Callable[[str], str],
+        maxsize: int = 256,
+        disk_dir: Optional[os.PathLike] = None,
+        remote_get: Optional[Callable[[str], bytes]] = None,
+        remote_put: Optional[Callable[[str, bytes], Any]] = None,
+        remote_delete: Optional[Callable[[str], Any]] = None,
+        version: str = NORMALIZER_VERSION,
+    ):
+        self.normalize_fn = normalize_fn
+        self.maxsize = max(0, int(maxsize))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.remote_get = remote_get
+        self.remote_put = remote_put
+        self.remote_delete = remote_delete
+        self.version = version
+
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counts = {"memory": 0, "disk": 0, "remote": 0, "computed": 0}
+
+    # --- keys ---
+
+    def digest(self, text: str) -> str:
+        h = hashlib.sha256(f"normalize-v{self.version}\0".encode("utf-8"))
+        h.update(text.encode("utf-8", errors="surrogatepass"))
+        return h.hexdigest()
+
+    def _disk_path(self, digest: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / digest[:2] / f"{digest}.txt"
+
+    @staticmethod
+    def remote_key(user_id: str, digest: str) -> str:
+        return f"users/{user_id}/normalized/{digest}.txt"
+
+    # --- memory tier ---
+
+    def _mem_get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            value = self._mem.get(digest)
+            if value is not None:
+                self._mem.move_to_end(digest)
+            return value
+
+    def _mem_put(self, digest: str, value: str) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._mem[digest] = value
+            self._mem.move_to_end(digest)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    def _count(self, tier: str) -> None:
+        with self._lock:
+            self.counts[tier] += 1
+
+    # --- public API ---
+
+    def normalize(self, text: str, user_id: Optional[str] = None, persist: bool = True) -> str:
+        """
+        normalize_fn(text), served from the cheapest tier that has it.
+
+        persist=False keeps the result in memory only (ad-hoc text like a pasted
+        JD doesn't need to live on disk); user_id enables the S3 tier.
+        """
+        text = text or ""
+        digest = self.digest(text)
+
+        value = self._mem_get(digest)
+        if value is not None:
+            self._count("memory")
+            return value
+
+        path = self._disk_path(digest) if persist else None
+        if path is not None and path.exists():
+            try:
+                value = path.read_text(encoding="utf-8")
+            except OSError:
+                value = None
+            if value is not None:
+                self._count("disk")
+                self._mem_put(digest, value)
+                return value
+
+        use_remote = persist and user_id and self.remote_get is not None
+        if use_remote:
+            try:
+                value = self.remote_get(self.remote_key(user_id, digest)).decode("utf-8")
+            except Exception:
+                value = None  # not there yet (or S3 hiccup): compute it
+            if value is not None:
+                self._count("remote")
+                self._mem_put(digest, value)
+                self._write_disk(path, value)
+                return value
+
+        value = self.normalize_fn(text)
+        self._count("computed")
+        self._mem_put(digest, value)
+        if persist:
+            self._write_disk(path, value)
+            if use_remote and self.remote_put is not None:
+                try:
+                    self.remote_put(self.remote_key(user_id, digest), value.encode("utf-8"))
+                except Exception as e:
+                    print(f"[text_cache] could not write normalized text to S3: {e}")
+        return value
+
+    def _write_disk(self, path: Optional[Path], value: str) -> None:
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(value, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[text_cache] could not write {path}: {e}")
+
+    def forget(self, text: str, user_id: Optional[str] = None) -> None:
+        """Drop every cached copy of text's normalized form (resume deleted)."""
+        digest = self.digest(text or "")
+        with self._lock:
+            self._mem.pop(digest, None)
+        path = self._disk_path(digest)
+        if path is not None:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        if user_id and self.remote_delete is not None:
+            try:
+                self.remote_delete(self.remote_key(user_id, digest))
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = sum(self.counts.values())
+            return {
+                "size": len(self._mem),
+                "maxsize": self.maxsize,
+                "memory_hits": self.counts["memory"],
+                "disk_hits": self.counts["disk"],
+                "remote_hits": self.counts["remote"],
+                "computed": self.counts["computed"],
+                "hit_rate": round(1 - self.counts["computed"] / lookups, 4) if lookups else 0.0,
+                "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+                "remote": self.remote_get is not None,
+            }
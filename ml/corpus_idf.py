@@ -0,0 +1,256 @@
+"""
+Corpus IDF for the baseline matcher
+-----------------------------------
+
+BaselineMatcher used to call fit_transform([resume, jd]) on every /match:
+the vocabulary + IDF came from just those two documents, and the fit mutated a
+vectorizer shared by all of gunicorn's threads.
+
+Here the IDF is fitted once over a reference corpus (dataset/jobs_clean,
+dataset/resumes_clean) plus every uploaded resume, and requests only pay for
+the transform:
+
+- IdfSnapshot is immutable: a request grabs the current snapshot and scores
+  against it without any locking
+- CorpusIdfStore keeps document frequencies; adding/removing an uploaded resume
+  builds a new snapshot and swaps it in (one attribute assignment)
+- terms the corpus has never seen still get a weight (IDF as if df=0), so a
+  brand-new skill in a JD still counts toward similarity and "missing" keywords
+
+Tokenization matches TfidfVectorizer(stop_words="english") so corpus mode and
+the old pair mode split text the same way.
+
+Every gunicorn worker has its own CorpusIdfStore on the same JSON file, so an
+upload/delete re-reads the file under an exclusive flock (corpus_idf.lock)
+before changing it; otherwise two workers would each write back their own view
+and drop the other's documents.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+try:
+    import fcntl
+except ImportError:  # Windows dev box: one process, the thread lock is enough
+    fcntl = None
+
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")  # TfidfVectorizer's default token_pattern
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOP_WORDS]
+
+
+class IdfSnapshot:
+    """Frozen IDF table: smooth_idf + l2-normalized tf-idf, like TfidfVectorizer's defaults."""
+
+    __slots__ = ("n_docs", "_idf", "_oov_idf", "version")
+
+    def __init__(self, doc_freq: Dict[str, int], n_docs: int, version: int = 0):
+        self.n_docs = n_docs
+        self.version = version
+        # idf = ln((1 + n) / (1 + df)) + 1
+        self._idf = {t: math.log((1 + n_docs) / (1 + df)) + 1.0 for t, df in doc_freq.items()}
+        self._oov_idf = math.log(1 + n_docs) + 1.0
+
+    def idf(self, term: str) -> float:
+        return self._idf.get(term, self._oov_idf)
+
+    def weights(self, text: str) -> Dict[str, float]:
+        """term -> l2-normalized tf-idf weight for one (already preprocessed) text."""
+        return self.weights_from_counts(Counter(tokenize(text)))
+
+    def weights_from_counts(self, counts: Dict[str, int]) -> Dict[str, float]:
+        """Same as weights(), from precomputed term counts (resume feature store)."""
+        vec = {term: tf * self.idf(term) for term, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        if norm > 0:
+            vec = {term: w / norm for term, w in vec.items()}
+        return vec
+
+    @staticmethod
+    def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return float(sum(w * b[t] for t, w in a.items() if t in b))
+
+    def __len__(self) -> int:
+        return len(self._idf)
+
+
+class CorpusIdfStore:
+    """
+    Document frequencies over the reference corpus + uploaded documents.
+
+    Uploaded documents are tracked by id (resume id) so re-uploads and deletes
+    keep the counts right, and persisted as JSON (doc id -> unique terms) so a
+    restart, or another gunicorn worker, sees the same corpus.
+    """
+
+    def __init__(self, store_path: Optional[os.PathLike] = None):
+        self._lock = threading.Lock()
+        self._base_df: Counter = Counter()
+        self._base_docs = 0
+        self._docs: Dict[str, List[str]] = {}
+        self.store_path = Path(store_path) if store_path else None
+        self._store_mtime: Optional[int] = None
+        self._snapshot = IdfSnapshot({}, 0)
+        self._version = 0
+        if self.store_path is not None:
+            self._load_store()
+        self._rebuild()
+
+    # --- building ---
+
+    @classmethod
+    def from_folders(
+        cls,
+        folders: Iterable[os.PathLike],
+        preprocess: Callable[[str], str] = lambda s: s,
+        store_path: Optional[os.PathLike] = None,
+    ) -> "CorpusIdfStore":
+        store = cls(store_path=store_path)
+        texts = []
+        for folder in folders:
+            folder = Path(folder)
+            if not folder.is_dir():
+                print(f"[corpus_idf] heads up: {folder} not found, skipping")
+                continue
+            for path in sorted(folder.glob("*.txt")):
+                texts.append(preprocess(path.read_text(encoding="utf-8", errors="ignore")))
+        store.add_base(texts)
+        print(f"[corpus_idf] fitted IDF on {store.snapshot().n_docs} documents")
+        return store
+
+    def add_base(self, texts: Iterable[str]) -> None:
+        """Reference documents (fixed for the process lifetime, not persisted)."""
+        with self._lock:
+            for text in texts:
+                self._base_df.update(set(tokenize(text)))
+                self._base_docs += 1
+            self._rebuild()
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        """Add or replace an uploaded document, then swap in a new snapshot."""
+        terms = sorted(set(tokenize(text)))
+        with self._lock, self._store_lock():
+            self._load_store()  # other workers' uploads/deletes since we last looked
+            self._docs[str(doc_id)] = terms
+            self._rebuild()
+            self._save_store()
+
+    def remove_document(self, doc_id: str) -> bool:
+        with self._lock, self._store_lock():
+            reloaded = self._load_store()
+            removed = self._docs.pop(str(doc_id), None) is not None
+            if removed or reloaded:
+                self._rebuild()
+            if removed:
+                self._save_store()
+            return removed
+
+    def _rebuild(self) -> None:
+        df = Counter(self._base_df)
+        for terms in self._docs.values():
+            df.update(terms)
+        self._version += 1
+        self._snapshot = IdfSnapshot(
+            dict(df), self._base_docs + len(self._docs), version=self._version
+        )
+
+    # --- persistence of uploaded documents ---
+
+    def _load_store(self) -> bool:
+        """Read the uploaded docs from the store file; True if they differ from ours."""
+        if self.store_path is None:
+            return False
+        try:
+            st = self.store_path.stat()
+            data = json.loads(self.store_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        docs = {str(k): list(v) for k, v in (data.get("docs") or {}).items()}
+        self._store_mtime = st.st_mtime_ns
+        if docs == self._docs:
+            return False
+        self._docs = docs
+        return True
+
+    @contextmanager
+    def _store_lock(self) -> Iterator[None]:
+        """Exclusive inter-process lock around read-modify-write of the store file."""
+        if self.store_path is None or fcntl is None:
+            yield
+            return
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.store_path.with_suffix(".lock"), "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _save_store(self) -> None:
+        if self.store_path is None:
+            return
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.store_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"docs": self._docs}), encoding="utf-8")
+        os.replace(tmp, self.store_path)
+        self._store_mtime = self.store_path.stat().st_mtime_ns
+
+    def _refresh_if_changed(self) -> None:
+        # another worker uploaded/deleted a resume: pick up its store file
+        if self.store_path is None:
+            return
+        try:
+            mtime = self.store_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._store_mtime:
+            return
+        with self._lock:
+            if mtime != self._store_mtime and self._load_store():
+                self._rebuild()
+
+    # --- request time ---
+
+    def snapshot(self) -> IdfSnapshot:
+        self._refresh_if_changed()
+        return self._snapshot
+
+    def stats(self) -> Dict[str, int]:
+        snap = self._snapshot
+        return {
+            "documents": snap.n_docs,
+            "reference_documents": self._base_docs,
+            "uploaded_documents": len(self._docs),
+            "terms": len(snap),
+            "version": snap.version,
+        }
+
+
+def score_pair(
+    snapshot: IdfSnapshot,
+    resume_clean: str,
+    jd_clean: str,
+    resume_counts: Optional[Dict[str, int]] = None,
+) -> Tuple[float, Dict[str, float], Dict[str, float]]:
+    """(cosine similarity, resume weights, jd weights) against one snapshot."""
+    if resume_counts is not None:
+        resume_vec = snapshot.weights_from_counts(resume_counts)
+    else:
+        resume_vec = snapshot.weights(resume_clean)
+    jd_vec = snapshot.weights(jd_clean)
+    return snapshot.cosine(resume_vec, jd_vec), resume_vec, jd_vec
@@ -0,0 +1,249 @@
+"""
+Embedding backends for MatcherEmbeddings
+----------------------------------------
+
+MatcherEmbeddings only needs "texts in, one vector per text out", so the model
+that does the encoding is pluggable:
+
+- "torch": sentence-transformers + PyTorch (the original path)
+- "onnx":  an ONNX export of the same model, int8 dynamically quantized,
+           run through onnxruntime on CPU. No torch import at serve time,
+           which is most of the worker RSS.
+
+Both expose SentenceTransformer's encode(texts, convert_to_numpy=..,
+normalize_embeddings=..) so anything that took `embedding_matcher.model`
+before (the form-label cascade's EmbeddingLabelTier) keeps working.
+
+The ONNX model directory is produced once with
+    python scripts/export_onnx_embeddings.py [--out models/minilm_onnx_int8]
+and holds model.onnx (fp32), model_int8.onnx, tokenizer.json and meta.json.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx")
+DEFAULT_ONNX_DIR = Path(__file__).resolve().parents[1] / "models" / "minilm_onnx_int8"
+
+
+def mean_pool(hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """sentence-transformers' mean pooling: average of the non-padding token vectors."""
+    mask = mask.astype(np.float32)[..., None]
+    summed = (hidden * mask).sum(axis=1)
+    return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def l2_normalize(vecs: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs / np.where(norms > 0, norms, 1.0)
+
+
+class SentenceTransformerBackend:
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        batch_size: int = 32,
+        **kwargs,
+    ) -> np.ndarray:
+        return self.model.encode(
+            list(texts),
+            convert_to_numpy=True,
+            normalize_embeddings=normalize_embeddings,
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+
+def read_export_meta(model_dir: os.PathLike, model_name: Optional[str] = None) -> dict:
+    """
+    meta.json of an ONNX export, with "model_name" always filled in.
+
+    The tag built from model_name has to match expected_tag("onnx", <configured
+    model>) or every cache / feature version keyed on it silently misses, so an
+    export of some other model is an error, and without meta.json the configured
+    name is all we have (no name at all is an error too).
+    """
+    meta_path = Path(model_dir) / "meta.json"
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+    exported = meta.get("model_name")
+    if exported and model_name and exported != model_name:
+        raise ValueError(
+            f"ONNX export in {model_dir} is of {exported!r}, but {model_name!r} is configured"
+        )
+    meta["model_name"] = exported or model_name
+    if not meta["model_name"]:
+        raise ValueError(f"no meta.json in {model_dir} and no model_name given")
+    return meta
+
+
+class OnnxEmbeddingBackend:
+    """
+    all-MiniLM-L6-v2 (or any BERT-style sentence-transformer) exported to ONNX.
+
+    Tokenization uses the exported tokenizer.json through `tokenizers` (the Rust
+    tokenizer sentence-transformers itself uses), then
+    last_hidden_state -> mean pool -> L2 normalize, same as the model's
+    Pooling + Normalize modules.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_dir: os.PathLike = DEFAULT_ONNX_DIR,
+        quantized: bool = True,
+        threads: Optional[int] = None,
+        model_name: Optional[str] = None,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        self.meta = read_export_meta(self.model_dir, model_name)
+        self.model_name = self.meta["model_name"]
+        self.max_length = int(self.meta.get("max_seq_length", 256))
+        self.normalize = bool(self.meta.get("normalize", True))
+        self.quantized = quantized
+
+        onnx_file = self.model_dir / ("model_int8.onnx" if quantized else "model.onnx")
+        opts = ort.SessionOptions()
+        if threads:
+            opts.intra_op_num_threads = int(threads)
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(onnx_file), sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        self.tokenizer.enable_padding(pad_id=int(self.meta.get("pad_token_id", 0)))
+
+    @property
+    def tag(self) -> str:
+        """Goes into cache keys / feature versions: int8 vectors aren't the torch ones."""
+        return expected_tag("onnx", self.model_name, quantized=self.quantized)
+
+    def _run(self, texts: List[str]) -> np.ndarray:
+        enc = self.tokenizer.encode_batch(texts)
+        ids = np.asarray([e.ids for e in enc], dtype=np.int64)
+        mask = np.asarray([e.attention_mask for e in enc], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]
+        return mean_pool(hidden, mask)
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        batch_size: int = 32,
+        **kwargs,
+    ) -> np.ndarray:
+        texts = [t or "" for t in texts]
+        if not texts:
+            return np.zeros((0, int(self.meta.get("dim", 384))), dtype=np.float32)
+        # sort by length so each batch pads to roughly its own longest text
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        chunks = []
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            chunks.append((idx, self._run([texts[i] for i in idx])))
+        out = np.empty((len(texts), chunks[0][1].shape[1]), dtype=np.float32)
+        for idx, vecs in chunks:
+            out[idx] = vecs
+        if self.normalize or normalize_embeddings:
+            out = l2_normalize(out)
+        return out
+
+
+def make_backend(kind: str, model_name: str, onnx_dir: Optional[os.PathLike] = None):
+    """Backend by config name (SFF_EMBED_BACKEND)."""
+    kind = (kind or "torch").lower()
+    if kind == "torch":
+        return SentenceTransformerBackend(model_name)
+    if kind == "onnx":
+        return OnnxEmbeddingBackend(onnx_dir or DEFAULT_ONNX_DIR, model_name=model_name)
+    raise ValueError(f"unknown embedding backend {kind!r}, expected one of {BACKENDS}")
+
+
+def backend_tag(backend) -> str:
+    return getattr(backend, "tag", None) or backend.model_name
+
+
+def expected_tag(kind: str, model_name: str, quantized: bool = True) -> str:
+    """backend_tag() of what make_backend(kind, model_name) will load, without loading it."""
+    if (kind or "torch").lower() == "onnx":
+        return f"{model_name}+onnx-{'int8' if quantized else 'fp32'}"
+    return model_name
+
+
+# === Export (offline, needs torch + transformers + onnxruntime) ===
+
+
+def export_onnx(model_name: str, out_dir: os.PathLike, opset: int = 14) -> Path:
+    """
+    Export `model_name`'s transformer to out_dir/model.onnx and write an int8
+    dynamically quantized copy (weights only, MatMul/Gemm) to model_int8.onnx.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    inputs = tuple(sample[k] for k in ("input_ids", "attention_mask", "token_type_ids"))
+    axes = {0: "batch", 1: "seq"}
+    dynamic = {
+        name: axes
+        for name in ("input_ids", "attention_mask", "token_type_ids", "last_hidden_state")
+    }
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            inputs,
+            str(out / "model.onnx"),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic,
+            opset_version=opset,
+        )
+    quantize_dynamic(
+        str(out / "model.onnx"), str(out / "model_int8.onnx"), weight_type=QuantType.QInt8
+    )
+
+    tokenizer.backend_tokenizer.save(str(out / "tokenizer.json"))
+    normalize = any(type(m).__name__ == "Normalize" for m in st)
+    meta = {
+        "model_name": model_name,
+        "max_seq_length": int(st.max_seq_length),
+        "dim": int(st.get_sentence_embedding_dimension()),
+        "normalize": normalize,
+        "pad_token_id": int(tokenizer.pad_token_id or 0),
+        "opset": opset,
+    }
+    (out / "meta.json").write_text(json.dumps(meta, indent=2))
+    return out
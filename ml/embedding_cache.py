@@ -0,0 +1,220 @@
+"""
+Content-addressed embedding cache
+---------------------------------
+
+MatcherEmbeddings used to encode both texts from scratch on every call, and
+the extension sends the same JD several times in a row (select_resume, then
+/match for each resume).
+
+EmbeddingCache keys vectors by sha256(model_name + text):
+1. in-memory LRU of float32 vectors (per process)
+2. optional sqlite file with float16 blobs (shared by workers, survives restarts)
+
+float16 on disk halves the file size for about 1e-4 of cosine precision,
+roughly the last digit of the 2-decimal percentage /match reports.
+encode_many() looks up a whole batch and sends only the misses to the model in
+one encode() call.
+
+The sqlite file is capped at disk_maxrows (oldest writes go first, by rowid),
+and forget() drops texts from both tiers when a resume is deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        model_name: str,
+        maxsize: int = 1024,
+        db_path: Optional[os.PathLike] = None,
+        disk_maxrows: int = 50000,
+    ):
+        self.model_name = model_name
+        self.maxsize = max(0, int(maxsize))
+        self.disk_maxrows = max(0, int(disk_maxrows))  # 0 = unbounded
+        self.db_path = Path(db_path) if db_path else None
+
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.counts = {"memory": 0, "disk": 0, "misses": 0}
+        if self.db_path is not None:
+            self._open_db()
+
+    # --- sqlite tier ---
+
+    def _open_db(self) -> None:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")  # several gunicorn workers share the file
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vec BLOB NOT NULL)"
+            )
+            db.commit()
+            self._db = db
+        except sqlite3.Error as e:
+            print(f"[embedding_cache] disk tier disabled ({self.db_path}): {e}")
+            self._db = None
+
+    def _db_get(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        if self._db is None or not keys:
+            return {}
+        found = {}
+        with self._lock:
+            try:
+                for i in range(0, len(keys), 500):  # stay under sqlite's variable limit
+                    chunk = keys[i:i + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+            except sqlite3.Error as e:
+                print(f"[embedding_cache] read failed: {e}")
+        return found
+
+    def _db_put(self, items: Dict[str, np.ndarray]) -> None:
+        if self._db is None or not items:
+            return
+        rows = [(k, int(v.shape[0]), v.astype(np.float16).tobytes()) for k, v in items.items()]
+        with self._lock:
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+                self._db_trim()
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"[embedding_cache] write failed: {e}")
+
+    def _db_trim(self) -> None:
+        # INSERT OR REPLACE gives a rewritten row a new rowid, so lowest rowid = oldest write
+        if not self.disk_maxrows:
+            return
+        extra = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        extra -= self.disk_maxrows
+        if extra > 0:
+            self._db.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                (extra,),
+            )
+
+    def _db_delete(self, keys: Sequence[str]) -> None:
+        if self._db is None or not keys:
+            return
+        with self._lock:
+            try:
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    marks = ",".join("?" * len(chunk))
+                    self._db.execute(f"DELETE FROM embeddings WHERE key IN ({marks})", chunk)
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"[embedding_cache] delete failed: {e}")
+
+    # --- memory tier ---
+
+    def key(self, text: str) -> str:
+        h = hashlib.sha256(self.model_name.encode("utf-8") + b"\0")
+        h.update((text or "").encode("utf-8", errors="surrogatepass"))
+        return h.hexdigest()
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._mem[key] = vec
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    # --- public API ---
+
+    def encode_many(
+        self, texts: Sequence[str], encode: Callable[[List[str]], Any]
+    ) -> List[np.ndarray]:
+        """
+        One float32 vector per text. `encode(list_of_texts)` is only called once,
+        with the distinct texts that aren't cached anywhere.
+        """
+        keys = [self.key(t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for k in keys:
+                vec = self._mem.get(k)
+                if vec is not None:
+                    self._mem.move_to_end(k)
+                    found[k] = vec
+        mem_hits = sum(1 for k in keys if k in found)
+
+        disk = self._db_get([k for k in dict.fromkeys(keys) if k not in found])
+        for k, vec in disk.items():
+            self._remember(k, vec)
+        found.update(disk)
+        disk_hits = sum(1 for k in keys if k in disk)
+
+        todo = {k: t for k, t in zip(keys, texts) if k not in found}
+        if todo:
+            vecs = np.asarray(encode(list(todo.values())), dtype=np.float32)
+            fresh = {k: vecs[i] for i, k in enumerate(todo)}
+            for k, vec in fresh.items():
+                self._remember(k, vec)
+            self._db_put(fresh)
+            found.update(fresh)
+
+        with self._lock:
+            self.counts["memory"] += mem_hits
+            self.counts["disk"] += disk_hits
+            self.counts["misses"] += len(keys) - mem_hits - disk_hits
+        return [found[k] for k in keys]
+
+    def encode_one(self, text: str, encode: Callable[[List[str]], Any]) -> np.ndarray:
+        return self.encode_many([text], encode)[0]
+
+    def forget(self, texts: Iterable[str]) -> None:
+        """Drop these texts from memory and disk (e.g. a deleted resume)."""
+        keys = [self.key(t) for t in texts]
+        with self._lock:
+            for k in keys:
+                self._mem.pop(k, None)
+        self._db_delete(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        rows = None
+        if self._db is not None:
+            with self._lock:
+                try:
+                    rows = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                except sqlite3.Error:
+                    rows = None
+        with self._lock:
+            lookups = sum(self.counts.values())
+            return {
+                "model": self.model_name,
+                "size": len(self._mem),
+                "maxsize": self.maxsize,
+                "memory_hits": self.counts["memory"],
+                "disk_hits": self.counts["disk"],
+                "misses": self.counts["misses"],
+                "hit_rate": round(1 - self.counts["misses"] / lookups, 4) if lookups else 0.0,
+                "disk_path": str(self.db_path) if self._db is not None else None,
+                "disk_rows": rows,
+                "disk_maxrows": self.disk_maxrows,
+            }
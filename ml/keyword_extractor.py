@@ -0,0 +1,167 @@
+"""
+spaCy keyword extraction for MatcherEmbeddings
+----------------------------------------------
+
+Keywords are just the nouns / proper nouns that aren't stopwords, so the only
+things needed from spaCy are POS tags and stop flags. Loading en_core_web_sm
+without the parser, NER and lemmatizer (excluded, not just disabled, so they
+aren't even in memory) leaves tok2vec + tagger + attribute_ruler.
+
+Texts go through nlp.pipe in batches (resume + JD in one call), and results
+are cached:
+1. in-memory LRU of keyword sets, keyed by sha256 of the lowercased text
+2. optional DocBin (.spacy) files for texts passed with persist=True (stored
+   resumes), so a restart or another worker doesn't re-run the tagger
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import spacy
+from spacy.tokens import DocBin
+
+TRIMMED_EXCLUDE = ("parser", "ner", "lemmatizer")
+KEYWORD_POS = ("NOUN", "PROPN")
+
+
+def keywords_from_doc(doc) -> FrozenSet[str]:
+    return frozenset(
+        token.text.strip().lower()
+        for token in doc
+        if token.pos_ in KEYWORD_POS and not token.is_stop
+    )
+
+
+class SpacyKeywordExtractor:
+    def __init__(
+        self,
+        model: str = "en_core_web_sm",
+        cache_size: int = 512,
+        doc_cache_dir: Optional[os.PathLike] = None,
+        batch_size: int = 32,
+        nlp=None,
+    ):
+        self.model = model
+        self.nlp = nlp if nlp is not None else spacy.load(model, exclude=list(TRIMMED_EXCLUDE))
+        self.cache_size = max(0, int(cache_size))
+        self.doc_cache_dir = Path(doc_cache_dir) if doc_cache_dir else None
+        self.batch_size = batch_size
+
+        self._mem: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counts = {"memory": 0, "disk": 0, "parsed": 0}
+
+    # --- keys / tiers ---
+
+    def key(self, text_lower: str) -> str:
+        h = hashlib.sha256(f"{self.model}\0".encode("utf-8"))
+        h.update(text_lower.encode("utf-8", errors="surrogatepass"))
+        return h.hexdigest()
+
+    def _remember(self, key: str, kws: FrozenSet[str]) -> None:
+        if self.cache_size == 0:
+            return
+        with self._lock:
+            self._mem[key] = kws
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.cache_size:
+                self._mem.popitem(last=False)
+
+    def _doc_path(self, key: str) -> Optional[Path]:
+        if self.doc_cache_dir is None:
+            return None
+        return self.doc_cache_dir / f"{key}.spacy"
+
+    def _load_doc(self, key: str):
+        path = self._doc_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            return next(iter(DocBin().from_bytes(path.read_bytes()).get_docs(self.nlp.vocab)))
+        except Exception as e:
+            print(f"[keywords] unreadable {path.name}, re-parsing: {e}")
+            return None
+
+    def _save_doc(self, key: str, doc) -> None:
+        path = self._doc_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(DocBin(attrs=["ORTH", "POS"], docs=[doc]).to_bytes())
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[keywords] could not write {path}: {e}")
+
+    # --- public API ---
+
+    def extract_many(self, texts: Sequence[str], persist: bool = False) -> List[FrozenSet[str]]:
+        """Keyword set per text; every uncached text goes through one nlp.pipe run."""
+        lowered = [(t or "").lower() for t in texts]
+        keys = [self.key(t) for t in lowered]
+        out: Dict[str, FrozenSet[str]] = {}
+
+        with self._lock:
+            for k in keys:
+                hit = self._mem.get(k)
+                if hit is not None:
+                    self._mem.move_to_end(k)
+                    out[k] = hit
+        mem_hits = sum(1 for k in keys if k in out)
+
+        todo: Dict[str, str] = {}
+        disk_hits = 0
+        for k, text in zip(keys, lowered):
+            if k in out or k in todo:
+                continue
+            doc = self._load_doc(k) if persist else None
+            if doc is not None:
+                out[k] = keywords_from_doc(doc)
+                self._remember(k, out[k])
+                disk_hits += 1
+            else:
+                todo[k] = text
+
+        if todo:
+            for k, doc in zip(todo, self.nlp.pipe(todo.values(), batch_size=self.batch_size)):
+                out[k] = keywords_from_doc(doc)
+                self._remember(k, out[k])
+                if persist:
+                    self._save_doc(k, doc)
+
+        with self._lock:
+            self.counts["memory"] += mem_hits
+            self.counts["disk"] += disk_hits
+            self.counts["parsed"] += len(todo)
+        return [out[k] for k in keys]
+
+    def extract(self, text: str, persist: bool = False) -> FrozenSet[str]:
+        return self.extract_many([text], persist=persist)[0]
+
+    def forget(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            key = self.key((text or "").lower())
+            with self._lock:
+                self._mem.pop(key, None)
+            path = self._doc_path(key)
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "pipeline": list(self.nlp.pipe_names),
+                "size": len(self._mem),
+                "maxsize": self.cache_size,
+                "memory_hits": self.counts["memory"],
+                "disk_hits": self.counts["disk"],
+                "parsed": self.counts["parsed"],
+                "doc_cache_dir": str(self.doc_cache_dir) if self.doc_cache_dir else None,
+            }
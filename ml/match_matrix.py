@@ -0,0 +1,174 @@
+"""
+Resume x JD similarity matrix
+-----------------------------
+
+/match scores one resume against one JD. For M resumes x N postings the
+extension used to make M*N calls, each one re-normalizing both texts.
+Here every document is tokenized once and the whole matrix comes out of a
+handful of sparse products.
+
+TF-IDF, same numbers as BaselineMatcher for every pair:
+
+- corpus mode: the IDF doesn't depend on the pair, so it's just
+  l2-normalized tf-idf rows and one R @ J.T
+- pair mode: BaselineMatcher refits TfidfVectorizer on [resume, jd], so a term's
+  IDF is 1 if it's in both documents and a = ln(3/2) + 1 if it's in only one.
+  That still factors into matrix products (R, J = term counts, B = binary):
+      dot[r, j]    = (R @ J.T)[r, j]                  (shared terms, idf 1)
+      |r|^2[r, j]  = a^2 * sum(R^2)[r] - (a^2 - 1) * (R^2 @ Bj.T)[r, j]
+      |j|^2[r, j]  = a^2 * sum(J^2)[j] - (a^2 - 1) * (Br @ (J^2).T)[r, j]
+      sim          = dot / (|r| * |j|)
+
+Missing keywords per pair are JD terms the resume doesn't have, ranked the way
+/match ranks them (weight desc, then alphabetically). In pair mode every
+missing term of a pair has IDF a, so the order is the JD's term-count order and
+only the normalizer changes per pair.
+
+Embeddings: one encode for everything not already stored, one dense R @ J.T.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ml.corpus_idf import IdfSnapshot, tokenize
+
+PAIR_IDF = math.log(3 / 2) + 1.0  # smooth idf of a term in 1 of 2 documents
+
+
+def count_matrix(
+    counts: Sequence[Dict[str, int]], vocab: Dict[str, int]
+) -> sparse.csr_matrix:
+    rows, cols, vals = [], [], []
+    for i, doc in enumerate(counts):
+        for term, tf in doc.items():
+            rows.append(i)
+            cols.append(vocab[term])
+            vals.append(tf)
+    return sparse.csr_matrix(
+        (np.asarray(vals, dtype=np.float64), (rows, cols)), shape=(len(counts), len(vocab))
+    )
+
+
+def _ranked_terms(counts: Dict[str, int], weight) -> List[Tuple[str, float]]:
+    return sorted(((t, weight(t, tf)) for t, tf in counts.items()), key=lambda x: (-x[1], x[0]))
+
+
+def _top_missing(
+    ranked: List[Tuple[str, float]], resume_terms: Set[str], stop: Set[str], k: int, scale=1.0
+) -> List[Tuple[str, float]]:
+    out = []
+    for term, weight in ranked:
+        if term in resume_terms or term in stop:
+            continue
+        out.append((term, round(weight * scale, 3)))
+        if len(out) >= k:
+            break
+    return out
+
+
+def tfidf_matrix(
+    resumes_clean: Sequence[str],
+    jds_clean: Sequence[str],
+    snapshot: Optional[IdfSnapshot] = None,
+    resume_counts: Optional[Sequence[Optional[Dict[str, int]]]] = None,
+    top_k: int = 10,
+    stopwords: Optional[Set[str]] = None,
+) -> Tuple[np.ndarray, List[List[List[Tuple[str, float]]]]]:
+    """
+    (scores M x N, missing[M][N] = top_k (term, weight)) for already-normalized texts.
+    snapshot=None is pair mode, an IdfSnapshot is corpus mode. resume_counts can
+    carry precomputed term counts (resume feature store) instead of re-tokenizing.
+    """
+    stop = set(stopwords or ())
+    r_counts = [
+        dict(c) if c is not None else dict(Counter(tokenize(text)))
+        for text, c in zip(resumes_clean, resume_counts or [None] * len(resumes_clean))
+    ]
+    j_counts = [dict(Counter(tokenize(text))) for text in jds_clean]
+    r_terms = [set(c) for c in r_counts]
+    m, n = len(r_counts), len(j_counts)
+    if m == 0 or n == 0:
+        return np.zeros((m, n)), [[[] for _ in range(n)] for _ in range(m)]
+
+    vocab: Dict[str, int] = {}
+    for doc in (*r_counts, *j_counts):
+        for term in doc:
+            vocab.setdefault(term, len(vocab))
+    R, J = count_matrix(r_counts, vocab), count_matrix(j_counts, vocab)
+
+    if snapshot is not None:
+        idf = np.empty(len(vocab))
+        for term, col in vocab.items():
+            idf[col] = snapshot.idf(term)
+        Rw = _l2_rows(R.multiply(idf).tocsr())
+        Jw = _l2_rows(J.multiply(idf).tocsr())
+        scores = np.asarray((Rw @ Jw.T).todense())
+        ranked = []
+        for c in j_counts:
+            weights = snapshot.weights_from_counts(c)  # what /match ranks by
+            ranked.append(_ranked_terms(c, lambda t, tf, w=weights: w[t]))
+        missing = [
+            [_top_missing(ranked[j], r_terms[r], stop, top_k) for j in range(n)]
+            for r in range(m)
+        ]
+        return scores, missing
+
+    # pair mode
+    a2 = PAIR_IDF * PAIR_IDF
+    R2, J2 = R.multiply(R).tocsr(), J.multiply(J).tocsr()
+    Br, Bj = (R > 0).astype(np.float64), (J > 0).astype(np.float64)
+    dot = np.asarray((R @ J.T).todense())
+    r_sq = a2 * np.asarray(R2.sum(axis=1)) - (a2 - 1) * np.asarray((R2 @ Bj.T).todense())
+    j_sq = a2 * np.asarray(J2.sum(axis=1)).T - (a2 - 1) * np.asarray((Br @ J2.T).todense())
+    r_norm, j_norm = np.sqrt(np.maximum(r_sq, 0)), np.sqrt(np.maximum(j_sq, 0))
+    denom = r_norm * j_norm
+    scores = np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+
+    ranked = [_ranked_terms(c, lambda t, tf: float(tf)) for c in j_counts]
+    missing = []
+    for r in range(m):
+        row = []
+        for j in range(n):
+            scale = PAIR_IDF / j_norm[r, j] if j_norm[r, j] > 0 else 0.0
+            row.append(_top_missing(ranked[j], r_terms[r], stop, top_k, scale))
+        missing.append(row)
+    return scores, missing
+
+
+def _l2_rows(M: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(M.multiply(M).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ M
+
+
+def embedding_matrix(
+    resume_vecs: Sequence[np.ndarray],
+    jd_vecs: Sequence[np.ndarray],
+    resume_keywords: Sequence[Set[str]],
+    jd_keywords: Sequence[Set[str]],
+    top_k: int = 10,
+) -> Tuple[np.ndarray, List[List[List[str]]]]:
+    """(cosine M x N as a 0-100 percentage like /match, missing[M][N] = top_k keywords)."""
+    m, n = len(resume_vecs), len(jd_vecs)
+    if m == 0 or n == 0:
+        return np.zeros((m, n)), [[[] for _ in range(n)] for _ in range(m)]
+    Rm = _l2_dense(np.vstack([np.asarray(v, dtype=np.float32) for v in resume_vecs]))
+    Jm = _l2_dense(np.vstack([np.asarray(v, dtype=np.float32) for v in jd_vecs]))
+    scores = (Rm @ Jm.T) * 100.0
+    jd_sorted = [sorted(kw) for kw in jd_keywords]
+    missing = [
+        [[w for w in jd_sorted[j] if w not in resume_keywords[r]][:top_k] for j in range(n)]
+        for r in range(m)
+    ]
+    return scores, missing
+
+
+def _l2_dense(M: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(M, axis=1, keepdims=True)
+    return M / np.where(norms > 0, norms, 1.0)
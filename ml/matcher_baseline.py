@@ -8,12 +8,19 @@ using TF-IDF vectors and cosine similarity.
 It returns:
 - similarity score (float between 0–1)
 - missing keywords (list of (word, weight) tuples, sorted by importance)
+
+Two IDF modes:
+- "pair" (default): IDF from just the resume + JD, refit per call (original behaviour)
+- "corpus": IDF fitted once over a reference corpus (see ml/corpus_idf.py);
+  requests only transform against an immutable snapshot
 """
 
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from matcher.baseline_matcher import normalize_text as preprocess_text
+from ml.corpus_idf import score_pair
 
 # === Custom stopwords ===
 # These are common words in job postings that aren’t useful
@@ -34,14 +41,23 @@ CUSTOM_STOPWORDS = {
 
 
 class BaselineMatcher:
-    def __init__(self):
+    def __init__(self, corpus_idf=None):
         """
         Initialize a TF-IDF vectorizer.
         By default, removes English stopwords (like "the", "and").
+
+        Pass a CorpusIdfStore (ml/corpus_idf.py) to switch to corpus mode.
         """
         self.vectorizer = TfidfVectorizer(stop_words="english")
+        self.corpus_idf = corpus_idf
 
-    def get_similarity_and_missing(self, resume_text: str, job_desc: str):
+    @property
+    def mode(self) -> str:
+        return "corpus" if self.corpus_idf is not None else "pair"
+
+    def get_similarity_and_missing(
+        self, resume_text: str, job_desc: str, resume_clean=None, jd_clean=None, resume_counts=None
+    ):
         """
         Compute similarity + missing keywords between resume and job description.
 
@@ -55,20 +71,32 @@ class BaselineMatcher:
         Returns:
             similarity (float) - cosine similarity between 0 and 1
             missing_keywords (list) - e.g. [("django", 0.48), ("docker", 0.37)]
+
+        resume_clean / jd_clean: already-preprocessed text (e.g. from the normalized
+        text cache, matcher/text_cache.py) so step 1 can be skipped.
+        resume_counts: precomputed term counts of resume_clean (resume feature store);
+        only corpus mode can use them, pair mode refits on the text anyway.
         """
 
         # Step 1: Clean text (normalize and tokenize)
-        resume_clean = preprocess_text(resume_text)
-        jd_clean = preprocess_text(job_desc)
+        if resume_clean is None:
+            resume_clean = preprocess_text(resume_text)
+        if jd_clean is None:
+            jd_clean = preprocess_text(job_desc)
 
-        # Step 2: TF-IDF vectorization of both texts
-        tfidf_matrix = self.vectorizer.fit_transform([resume_clean, jd_clean])
+        if self.corpus_idf is not None:
+            return self._corpus_similarity_and_missing(resume_clean, jd_clean, resume_counts)
+
+        # Step 2: TF-IDF vectorization of both texts.
+        # A fresh clone per call: fitting self.vectorizer in place raced between threads.
+        vectorizer = clone(self.vectorizer)
+        tfidf_matrix = vectorizer.fit_transform([resume_clean, jd_clean])
 
         # Step 3: Cosine similarity between resume (index 0) and JD (index 1)
         similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
 
         # Step 4: Extract feature names and JD weights
-        feature_names = self.vectorizer.get_feature_names_out()
+        feature_names = vectorizer.get_feature_names_out()
         jd_vector = tfidf_matrix[1].toarray()[0]  # vector representation of JD
         resume_words = set(resume_clean.split())  # words present in resume
 
@@ -87,6 +115,21 @@ class BaselineMatcher:
 
         return similarity, missing_keywords
 
+    def _corpus_similarity_and_missing(self, resume_clean: str, jd_clean: str, resume_counts=None):
+        """Same outputs as pair mode, scored against the corpus IDF snapshot."""
+        snapshot = self.corpus_idf.snapshot()  # immutable; safe to use without a lock
+        similarity, _, jd_vec = score_pair(snapshot, resume_clean, jd_clean, resume_counts)
+
+        resume_words = set(resume_clean.split())
+        missing_keywords = [
+            (token, round(weight, 3))
+            for token, weight in jd_vec.items()
+            if token not in resume_words and token not in CUSTOM_STOPWORDS and weight > 0
+        ]
+        # ties broken alphabetically, like pair mode's vocabulary order
+        missing_keywords.sort(key=lambda x: (-x[1], x[0]))
+        return similarity, missing_keywords
+
 
 # === Example usage ===
 if __name__ == "__main__":
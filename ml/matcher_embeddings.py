@@ -10,28 +10,59 @@ It returns:
 - missing skills (keywords in the job description not found in the resume)
 """
 
-import spacy
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+
+from ml.embedding_backends import backend_tag, make_backend
+from ml.embedding_cache import EmbeddingCache
+from ml.keyword_extractor import SpacyKeywordExtractor
 
 
 class MatcherEmbeddings:
 
-    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        cache=None,
+        keywords=None,
+        backend=None,
+    ):
         """
         Initialize the embedding matcher.
-        - Loads a Sentence-BERT model (default: MiniLM-L6-v2).
-        - Loads spaCy small English model for keyword extraction.
+        - Loads a Sentence-BERT model (default: MiniLM-L6-v2) through an embedding
+          backend (ml/embedding_backends.py): "torch" (sentence-transformers, default)
+          or "onnx" (int8 quantized onnxruntime export), or a backend object.
+        - Loads spaCy small English model for keyword extraction, trimmed to
+          what POS tags need (ml/keyword_extractor.py).
+        - cache: an EmbeddingCache (ml/embedding_cache.py); defaults to an
+          in-memory one so repeat texts (the same JD over and over) skip the model.
+        - keywords: a SpacyKeywordExtractor; defaults to an in-memory cached one.
         """
-        print(f"=== Loading embedding model: {model_name} ===")
-        self.model = SentenceTransformer(model_name)  # Embedding model
-        self.nlp = spacy.load("en_core_web_sm")  # spaCy pipeline for text processing
+        if backend is None or isinstance(backend, str):
+            print(f"=== Loading embedding model: {model_name} ({backend or 'torch'}) ===")
+            backend = make_backend(backend or "torch", model_name)
+        self.model_name = model_name
+        self.backend = backend
+        self.model = backend  # anything with SentenceTransformer-style encode()
+        # what the vectors actually come from (model + backend); cache keys use this
+        self.embedding_id = backend_tag(backend)
+        self.keywords = keywords if keywords is not None else SpacyKeywordExtractor()
+        self.nlp = self.keywords.nlp  # spaCy pipeline for text processing
+        self.cache = cache if cache is not None else EmbeddingCache(self.embedding_id)
+
+    def _encode_batch(self, texts):
+        return self.backend.encode(texts, convert_to_numpy=True)
 
     def embed(self, text: str):
         """
-        Convert input text into an embedding (dense vector).
+        Convert input text into an embedding (dense vector, float32 numpy).
         Embeddings capture semantic meaning of the text.
+        Repeat texts come from the embedding cache instead of the model.
         """
-        return self.model.encode(text, convert_to_tensor=True)
+        return self.cache.encode_one(text, self._encode_batch)
+
+    def embed_many(self, texts):
+        """embed() for a list; every uncached text goes through one batched encode call."""
+        return self.cache.encode_many(list(texts), self._encode_batch)
 
     def similarity(self, text1: str, text2: str) -> float:
         """
@@ -39,31 +70,28 @@ class MatcherEmbeddings:
         Returns a percentage (0–100).
         """
         emb1, emb2 = self.embed(text1), self.embed(text2)
-        score = util.cos_sim(emb1, emb2).item()  # Cosine similarity between vectors
+        denom = float(np.linalg.norm(emb1) * np.linalg.norm(emb2))
+        score = float(emb1 @ emb2) / denom if denom else 0.0  # Cosine similarity
         return round(score * 100, 2)  # Convert to percentage for readability
 
-    def extract_keywords(self, text: str):
+    def extract_keywords(self, text: str, persist: bool = False):
         """
         Extract candidate keywords from text.
         - Lowercases everything
         - Keeps only nouns & proper nouns
         - Removes stopwords (like 'and', 'the')
         Returns a set of unique keywords.
+        persist=True also keeps the tagged doc on disk (stored resumes).
         """
-        doc = self.nlp(text.lower())
-        return set(
-            token.text.strip().lower()
-            for token in doc
-            if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop
-        )
+        return set(self.keywords.extract(text, persist=persist))
 
     def compare_keywords(self, resume_text: str, jd_text: str):
         """
         Compare resume vs job description keywords.
         Returns skills in the job description that are NOT in the resume.
+        Both texts go through spaCy in one nlp.pipe batch (cached ones skip it).
         """
-        resume_kw = self.extract_keywords(resume_text)
-        jd_kw = self.extract_keywords(jd_text)
+        resume_kw, jd_kw = self.keywords.extract_many([resume_text, jd_text])
         missing = jd_kw - resume_kw
         return list(missing)
 
@@ -78,6 +106,22 @@ class MatcherEmbeddings:
         missing = self.compare_keywords(resume_text, jd_text)
         return {"match_score": score, "missing_skills": missing}
 
+    def embed_vector(self, text: str) -> np.ndarray:
+        """Same embedding as embed(), as a float32 numpy vector (for storing)."""
+        return np.asarray(self.embed(text), dtype=np.float32)
+
+    def match_precomputed(self, resume_vec, resume_keywords, jd_text: str):
+        """
+        match_resume_job() when the resume side is already known
+        (vector + keywords from the resume feature store): only the JD gets encoded.
+        """
+        jd_vec = self.embed_vector(jd_text)
+        resume_vec = np.asarray(resume_vec, dtype=np.float32)
+        denom = float(np.linalg.norm(resume_vec) * np.linalg.norm(jd_vec))
+        score = float(resume_vec @ jd_vec) / denom if denom else 0.0
+        missing = self.extract_keywords(jd_text) - set(resume_keywords)
+        return {"match_score": round(score * 100, 2), "missing_skills": list(missing)}
+
 
 # === Example usage ===
 if __name__ == "__main__":
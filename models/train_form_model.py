@@ -1,4 +1,5 @@
 # train_form_model.py
+import sys
 from pathlib import Path
 
 import joblib
@@ -11,6 +12,11 @@ from sklearn.pipeline import Pipeline
 
 # Point to the repo root (one level up from /models)
 REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))  # so backend.inference is importable when run as a script
+
+from backend.inference.loader import file_sha256  # noqa: E402
+from backend.inference.numpy_scorer import export_numpy_artifact  # noqa: E402
+
 csv_path = REPO / "dataset" / "form_labels_balanced.csv"
 data = pd.read_csv(csv_path)
 # Expect columns: label_text, field_type
@@ -58,3 +64,10 @@ print(classification_report(y_test, y_pred, zero_division=0))
 out_path = REPO / "models" / "form_model.pkl"
 joblib.dump(model, out_path)
 print(f"=== Model saved to {out_path} ===")
+
+# Lean serving artifact: vocab + IDF + coefficients as .npy files.
+# The API loads this instead of the pickle when it was exported from this exact .pkl
+# (see backend/inference/loader.py).
+artifact_dir = REPO / "models" / "form_model_np"
+export_numpy_artifact(model, artifact_dir, source_sha256=file_sha256(out_path))
+print(f"=== Numpy scoring artifact saved to {artifact_dir} ===")
@@ -0,0 +1,36 @@
+"""
+Export the sentence embedding model to ONNX + an int8 dynamically quantized copy
+for SFF_EMBED_BACKEND=onnx.
+Run from repo root:  python scripts/export_onnx_embeddings.py [--model ...] [--out ...]
+
+Needs torch, sentence-transformers and onnxruntime (only here, not at serve time).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from ml.embedding_backends import DEFAULT_ONNX_DIR, export_onnx  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    ap.add_argument("--out", type=Path, default=DEFAULT_ONNX_DIR)
+    ap.add_argument("--opset", type=int, default=14)
+    args = ap.parse_args()
+
+    out = export_onnx(args.model, args.out, opset=args.opset)
+    for path in sorted(out.iterdir()):
+        print(f"  {path.name:<20}{path.stat().st_size / 1e6:>8.1f} MB")
+    print(f"=== exported {args.model} to {out} ===")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+BackgroundLoader (backend/inference/background.py): heavy models load off the
+request path and get() never blocks.
+"""
+
+import threading
+
+import pytest
+
+from backend.inference.background import BackgroundLoader
+
+
+def gated_factory():
+    gate = threading.Event()
+
+    def factory():
+        gate.wait(5)
+        return "model"
+
+    return gate, factory
+
+
+def test_background_get_is_none_until_loaded():
+    gate, factory = gated_factory()
+    loader = BackgroundLoader("m", factory, mode="background")
+    loader.start()
+    assert loader.get() is None
+    assert loader.state == "loading" and not loader.settled
+
+    gate.set()
+    assert loader.wait(5) == "model"
+    assert loader.ready and loader.settled
+    assert loader.status()["load_ms"] is not None
+
+
+def test_lazy_starts_on_first_get():
+    calls = []
+    loader = BackgroundLoader("m", lambda: calls.append(1) or "model", mode="lazy")
+    loader.start()
+    assert calls == [] and loader.state == "pending"
+    loader.get()
+    assert loader.wait(5) == "model"
+    assert calls == [1]
+
+
+def test_failed_load_reports_error_and_stays_none():
+    def boom():
+        raise RuntimeError("no torch")
+
+    loader = BackgroundLoader("m", boom, mode="eager")
+    loader.start()
+    assert loader.get() is None
+    assert loader.state == "failed" and loader.settled
+    assert "no torch" in loader.status()["error"]
+
+
+def test_on_ready_runs_after_load_and_immediately_once_ready():
+    seen = []
+    loader = BackgroundLoader("m", lambda: "model", mode="eager")
+    loader.on_ready(seen.append)
+    loader.start()
+    loader.on_ready(seen.append)
+    assert seen == ["model", "model"]
+
+
+def test_off_never_loads():
+    loader = BackgroundLoader("m", lambda: pytest.fail("loaded"), mode="off")
+    loader.start()
+    assert loader.get() is None and loader.state == "off" and loader.settled
@@ -75,3 +75,27 @@ def test_similarity_matrix_runs():
     # Sanity checks
     assert sim_matrix.shape == (1, 1)  # one resume × one job
     assert 0.0 <= sim_matrix[0][0] <= 1.0  # score shou_
+
+
+def test_lemma_memo_reused_across_calls():
+    """Second pass over the same text should be all memo hits."""
+    bm.lemmatize_cached.cache_clear()
+    bm.normalize_text_full("Managed teams and managed budgets")
+    misses = bm.lemmatize_cached.cache_info().misses
+    bm.normalize_text_full("Managed teams and managed budgets")
+    assert bm.lemmatize_cached.cache_info().misses == misses
+
+
+def test_fast_mode_lemmatizes_without_tagger():
+    """
+    Fast mode (regex tokenizer, no POS tagger) should still reduce
+    -ing/-ed verbs and plurals, and drop stopwords.
+    """
+    clean = bm.normalize_text("Developing developers developed the tools", mode="fast")
+    assert clean.split() == ["develop", "developer", "develop", "tool"]
+
+
+def test_fast_mode_tokenizes_like_word_tokenize():
+    """Possessives split off; hyphen/dot words dropped by isalpha() like the full pipeline."""
+    clean = bm.normalize_text("Python's full-stack node.js work", mode="fast")
+    assert clean.split() == ["python", "work"]
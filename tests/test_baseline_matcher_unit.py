@@ -42,3 +42,21 @@ def test_missing_keywords_not_flagged_if_present(matcher):
     _, missing = matcher.get_similarity_and_missing(resume, jd)
     tokens = [kw[0] for kw in missing]
     assert "django" not in tokens
+
+
+def test_corpus_mode_scores_without_refitting():
+    """Corpus mode: IDF comes from the store, and the shared vectorizer is never fitted."""
+    from ml.corpus_idf import CorpusIdfStore
+
+    store = CorpusIdfStore()
+    store.add_base(["python developer flask sql", "java developer spring sql"])
+    matcher = BaselineMatcher(corpus_idf=store)
+
+    resume = "Python developer with Flask and SQL"
+    jd = "Looking for Python developer with Django and SQL"
+    similarity, missing = matcher.get_similarity_and_missing(resume, jd)
+
+    assert matcher.mode == "corpus"
+    assert 0.0 < similarity < 1.0
+    assert "django" in [kw[0] for kw in missing]
+    assert not hasattr(matcher.vectorizer, "vocabulary_")
@@ -0,0 +1,100 @@
+"""
+Tests for the form label cascade (backend/inference/cascade.py).
+
+The embedding tier gets a tiny bag-of-words encoder instead of the real
+SentenceTransformer; it has the same encode() shape, which is all the tier uses.
+"""
+
+import pathlib
+
+import joblib
+import numpy as np
+import pytest
+
+from backend.inference.cascade import EmbeddingLabelTier, FormLabelCascade
+from backend.inference.exact_match import ExactLabelIndex
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+CSV_PATH = ROOT / "dataset" / "form_labels_balanced.csv"
+
+
+class WordEncoder:
+    """Bag-of-words vectors over a fixed vocabulary."""
+
+    def __init__(self, vocab):
+        self.vocab = {w: i for i, w in enumerate(vocab)}
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        out = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                if word in self.vocab:
+                    out[row, self.vocab[word]] += 1.0
+        return out
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(ROOT / "models" / "form_model.pkl")
+
+
+@pytest.fixture(scope="module")
+def exact(model):
+    return ExactLabelIndex.from_csv(CSV_PATH, classes=model.classes_)
+
+
+def test_exact_then_model_tiers(model, exact):
+    cascade = FormLabelCascade(exact=exact)
+    out = cascade.predict_labels(model, ["Email Address", "qq zz first nme", "  "], version="v")
+
+    assert out[0]["tier"] == "exact" and out[0]["confidence"] == 1.0
+    assert out[1]["tier"] == "model"
+    assert out[2]["prediction"] is None and "tier" not in out[2]
+    assert all(item["model_version"] == "v" for item in out)
+
+    stats = cascade.describe()
+    assert stats["tiers"]["exact"]["labels"] == 1
+    assert stats["tiers"]["model"]["labels"] == 1
+    assert stats["tiers"]["embedding"]["labels"] == 0
+
+
+def test_embedding_tier_only_runs_below_threshold(model):
+    encoder = WordEncoder(["mobile", "cell", "surname", "dob"])
+    heavy = EmbeddingLabelTier(encoder, ["mobile", "surname"], ["phone", "name"])
+
+    # threshold above 1.0: every model answer is "unsure" and gets escalated
+    cascade = FormLabelCascade(heavy=heavy, threshold=1.01, min_similarity=0.5)
+    out = cascade.predict_labels(model, ["your mobile", "favourite colour"])
+    assert out[0] == {
+        "label": "your mobile",
+        "prediction": "phone",
+        "confidence": 1.0,
+        "tier": "embedding",
+    }
+    assert out[1]["tier"] == "model"  # no neighbour close enough, LR answer stays
+    assert cascade.describe()["escalated"] == 2
+    assert cascade.describe()["overridden"] == 1
+
+    # threshold 0: nothing escalates, so the encoder is never called again
+    calls = encoder.calls
+    FormLabelCascade(heavy=heavy, threshold=0.0).predict_labels(model, ["your mobile"])
+    assert encoder.calls == calls
+
+
+def test_embedding_answers_are_cached(model):
+    encoder = WordEncoder(["mobile"])
+    heavy = EmbeddingLabelTier(encoder, ["mobile"], ["phone"])
+    cascade = FormLabelCascade(heavy=heavy, threshold=1.01)
+
+    cascade.predict_labels(model, ["Mobile"])
+    calls = encoder.calls
+    cascade.predict_labels(model, ["  mobile "])
+    assert encoder.calls == calls
+
+
+def test_embedding_tier_from_csv_keeps_known_classes(model):
+    tier = EmbeddingLabelTier.from_csv(CSV_PATH, WordEncoder(["x"]), classes=model.classes_)
+    assert len(tier) > 100
+    assert set(tier.field_types) <= {str(c) for c in model.classes_}
@@ -0,0 +1,122 @@
+"""
+Unit tests for the corpus IDF used by BaselineMatcher's corpus mode
+(ml/corpus_idf.py). Plain strings in, so no NLTK needed.
+"""
+
+import threading
+from collections import Counter
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ml.corpus_idf import CorpusIdfStore, IdfSnapshot, score_pair, tokenize
+
+DOCS = [
+    "python developer flask sql rest api",
+    "java developer spring microservices sql",
+    "data scientist python pandas machine learning",
+    "frontend engineer react javascript css",
+]
+
+
+def _store(docs=DOCS, **kwargs):
+    store = CorpusIdfStore(**kwargs)
+    store.add_base(docs)
+    return store
+
+
+def test_weights_match_tfidf_vectorizer_on_same_corpus():
+    vec = TfidfVectorizer(stop_words="english").fit(DOCS)
+    snap = _store().snapshot()
+
+    for doc in DOCS:
+        expected = vec.transform([doc]).toarray()[0]
+        got = snap.weights(doc)
+        names = vec.get_feature_names_out()
+        assert {names[i]: pytest.approx(w) for i, w in enumerate(expected) if w > 0} == got
+
+
+def test_unseen_terms_still_get_weight():
+    snap = _store().snapshot()
+    weights = snap.weights("python kubernetes")
+    assert weights["kubernetes"] > weights["python"]  # rarer than anything in the corpus
+    sim, _, jd_vec = score_pair(snap, "python flask", "python kubernetes")
+    assert 0.0 < sim < 1.0
+    assert "kubernetes" in jd_vec
+
+
+def test_snapshots_are_immutable_across_updates():
+    store = _store()
+    before = store.snapshot()
+    idf_before = before.idf("react")
+
+    store.add_document("r1", "react react native mobile")
+    after = store.snapshot()
+
+    assert after is not before
+    assert after.n_docs == before.n_docs + 1
+    assert before.idf("react") == idf_before
+    assert after.idf("react") < idf_before
+
+    assert store.remove_document("r1")
+    assert not store.remove_document("r1")
+    assert store.snapshot().idf("react") == pytest.approx(idf_before)
+
+
+def test_uploaded_documents_persist(tmp_path):
+    path = tmp_path / "corpus_idf.json"
+    store = _store(store_path=path)
+    store.add_document("r1", "golang kubernetes")
+
+    other = _store(store_path=path)  # e.g. another gunicorn worker / a restart
+    assert other.stats()["uploaded_documents"] == 1
+    assert other.snapshot().idf("golang") == pytest.approx(store.snapshot().idf("golang"))
+
+    other.remove_document("r1")
+    assert store.stats()["uploaded_documents"] == 1
+    store.snapshot()  # picks up the other worker's write
+    assert store.stats()["uploaded_documents"] == 0
+
+
+def test_workers_dont_overwrite_each_others_uploads(tmp_path):
+    path = tmp_path / "corpus_idf.json"
+    w1, w2 = _store(store_path=path), _store(store_path=path)  # two gunicorn workers
+
+    w1.add_document("r1", "golang kubernetes")
+    w2.add_document("r2", "rust wasm")  # w2 never read r1 before writing
+    w1.remove_document("r9")  # a no-op delete still picks up r2
+
+    assert w1.stats()["uploaded_documents"] == 2
+    assert _store(store_path=path).stats()["uploaded_documents"] == 2
+
+    w2.remove_document("r1")
+    assert w1.snapshot().n_docs == w2.snapshot().n_docs == len(DOCS) + 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_concurrent_reads_during_updates():
+    store = _store()
+    errors = []
+
+    def reader():
+        for _ in range(200):
+            snap = store.snapshot()
+            sim = IdfSnapshot.cosine(snap.weights(DOCS[0]), snap.weights(DOCS[2]))
+            if not 0.0 <= sim <= 1.0 + 1e-9 or np.isnan(sim):
+                errors.append(sim)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(50):
+        store.add_document(f"r{i}", f"python skill{i}")
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_weights_from_counts_matches_text_weights():
+    snap = _store().snapshot()
+    text = "python developer python sql docker"
+    assert snap.weights_from_counts(Counter(tokenize(text))) == snap.weights(text)
@@ -0,0 +1,82 @@
+"""
+Embedding backends (ml/embedding_backends.py).
+
+The pooling math runs everywhere. The ONNX int8 vs sentence-transformers
+parity check needs onnxruntime, sentence-transformers and an exported model
+(python scripts/export_onnx_embeddings.py) and skips otherwise.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from ml.embedding_backends import (
+    DEFAULT_ONNX_DIR,
+    expected_tag,
+    l2_normalize,
+    make_backend,
+    mean_pool,
+    read_export_meta,
+)
+
+PARITY_TEXTS = [
+    "First Name",
+    "Email address",
+    "Experienced Python developer with Flask, REST APIs, and SQL.",
+    "Looking for a backend engineer with Python, Django, and SQL experience.",
+    "Senior frontend engineer: React, TypeScript, Next.js, AWS, Docker, CI/CD pipelines.",
+    "Data scientist with pandas, scikit-learn, PyTorch and experience deploying models.",
+]
+
+
+def test_mean_pool_ignores_padding():
+    hidden = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+    assert mean_pool(hidden, mask).tolist() == [[2.0, 2.0]]
+
+
+def test_l2_normalize_leaves_zero_rows_alone():
+    out = l2_normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+    assert out.tolist() == [[0.6, 0.8], [0.0, 0.0]]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        make_backend("tensorrt", "m")
+
+
+def test_export_meta_falls_back_to_the_configured_model_name(tmp_path):
+    # no meta.json: the tag has to be the one api.EMBED_ID expects, not the dir path
+    meta = read_export_meta(tmp_path, "sentence-transformers/all-MiniLM-L6-v2")
+    assert meta["model_name"] == "sentence-transformers/all-MiniLM-L6-v2"
+    assert expected_tag("onnx", meta["model_name"]) == expected_tag(
+        "onnx", "sentence-transformers/all-MiniLM-L6-v2"
+    )
+    with pytest.raises(ValueError):
+        read_export_meta(tmp_path)
+
+
+def test_export_of_another_model_is_rejected(tmp_path):
+    (tmp_path / "meta.json").write_text(json.dumps({"model_name": "other/model", "dim": 8}))
+    assert read_export_meta(tmp_path, "other/model")["dim"] == 8
+    assert read_export_meta(tmp_path)["model_name"] == "other/model"
+    with pytest.raises(ValueError):
+        read_export_meta(tmp_path, "sentence-transformers/all-MiniLM-L6-v2")
+
+
+def test_onnx_int8_matches_sentence_transformers():
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("sentence_transformers")
+    if not (DEFAULT_ONNX_DIR / "model_int8.onnx").exists():
+        pytest.skip("no ONNX export (python scripts/export_onnx_embeddings.py)")
+
+    onnx = make_backend("onnx", "sentence-transformers/all-MiniLM-L6-v2")
+    torch = make_backend("torch", onnx.model_name)
+    a = l2_normalize(np.asarray(torch.encode(PARITY_TEXTS), dtype=np.float32))
+    b = l2_normalize(onnx.encode(PARITY_TEXTS, batch_size=4))
+    cosines = (a * b).sum(axis=1)
+    assert cosines.min() > 0.98, cosines
+
+    # what /match reports: pairwise similarities should barely move
+    assert np.abs(a @ a.T - b @ b.T).max() < 0.05
@@ -0,0 +1,90 @@
+"""
+Unit tests for the content-addressed embedding cache (ml/embedding_cache.py).
+A tiny fake encoder stands in for SentenceTransformer.
+"""
+
+import numpy as np
+import pytest
+
+from ml.embedding_cache import EmbeddingCache
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_repeat_text_is_a_memory_hit():
+    enc = FakeEncoder()
+    cache = EmbeddingCache("m")
+    first = cache.encode_one("java developer", enc)
+    again = cache.encode_one("java developer", enc)
+    assert np.array_equal(first, again)
+    assert len(enc.calls) == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_batch_encodes_only_distinct_misses_in_one_call():
+    enc = FakeEncoder()
+    cache = EmbeddingCache("m")
+    cache.encode_one("jd", enc)
+    vecs = cache.encode_many(["jd", "resume a", "resume b", "resume a"], enc)
+    assert enc.calls == [["jd"], ["resume a", "resume b"]]
+    assert np.array_equal(vecs[1], vecs[3])
+
+
+def test_key_includes_model_name():
+    assert EmbeddingCache("m1").key("x") != EmbeddingCache("m2").key("x")
+
+
+def test_sqlite_tier_survives_restart_as_float16(tmp_path):
+    enc = FakeEncoder()
+    db = tmp_path / "emb.sqlite3"
+    vec = EmbeddingCache("m", db_path=db).encode_one("python and aws", enc)
+
+    restarted = EmbeddingCache("m", db_path=db)
+    back = restarted.encode_one("python and aws", enc)
+    assert len(enc.calls) == 1
+    assert back.dtype == np.float32
+    assert back == pytest.approx(vec, rel=1e-3)
+    stats = restarted.stats()
+    assert stats["disk_hits"] == 1 and stats["disk_rows"] == 1
+
+
+def test_lru_bound():
+    enc = FakeEncoder()
+    cache = EmbeddingCache("m", maxsize=2)
+    cache.encode_many(["a", "b", "c"], enc)
+    assert cache.stats()["size"] == 2
+    cache.encode_one("a", enc)
+    assert len(enc.calls) == 2
+
+
+def test_forget_drops_text_from_memory_and_disk(tmp_path):
+    enc = FakeEncoder()
+    db = tmp_path / "emb.sqlite3"
+    cache = EmbeddingCache("m", db_path=db)
+    cache.encode_many(["deleted resume", "kept jd"], enc)
+    cache.forget(["deleted resume"])
+    assert cache.stats()["size"] == 1 and cache.stats()["disk_rows"] == 1
+
+    restarted = EmbeddingCache("m", db_path=db)
+    restarted.encode_many(["deleted resume", "kept jd"], enc)
+    assert enc.calls[-1] == ["deleted resume"]  # re-encoded, the jd came from disk
+
+
+def test_disk_tier_drops_oldest_rows_past_the_cap(tmp_path):
+    enc = FakeEncoder()
+    db = tmp_path / "emb.sqlite3"
+    cache = EmbeddingCache("m", maxsize=0, db_path=db, disk_maxrows=2)
+    for text in ("a", "b", "c"):
+        cache.encode_one(text, enc)
+    assert cache.stats()["disk_rows"] == 2
+    cache.encode_many(["b", "c"], enc)
+    assert cache.stats()["disk_hits"] == 2
+    cache.encode_one("a", enc)
+    assert enc.calls[-1] == ["a"]
@@ -0,0 +1,64 @@
+"""
+Unit tests for the exact-match label tier (backend/inference/exact_match.py).
+"""
+
+import pathlib
+
+import joblib
+import pytest
+
+from backend.inference.engine import predict_labels
+from backend.inference.exact_match import ExactLabelIndex
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+MODEL_PKL = ROOT / "models" / "form_model.pkl"
+CSV_PATH = ROOT / "dataset" / "form_labels_balanced.csv"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(MODEL_PKL)
+
+
+def test_from_csv_skips_ambiguous_labels(tmp_path):
+    csv_file = tmp_path / "labels.csv"
+    csv_file.write_text(
+        "label_text,field_type\n"
+        "Email Address,email\n"
+        "  email   address ,email\n"
+        "GitHub,social\n"
+        "github,key_skill\n",
+        encoding="utf-8",
+    )
+    index = ExactLabelIndex.from_csv(csv_file)
+
+    assert index.lookup("EMAIL ADDRESS") == "email"
+    assert index.lookup("GitHub") is None  # two field types -> let the model decide
+    assert len(index) == 1
+
+
+def test_from_csv_respects_model_classes(tmp_path):
+    csv_file = tmp_path / "labels.csv"
+    csv_file.write_text("label_text,field_type\nCity,address\nFoo,unknown\n", encoding="utf-8")
+    index = ExactLabelIndex.from_csv(csv_file, classes=["address"])
+    assert "City" in index
+    assert "Foo" not in index
+
+
+def test_missing_csv_gives_empty_index(tmp_path):
+    assert len(ExactLabelIndex.from_csv(tmp_path / "nope.csv")) == 0
+
+
+def test_engine_uses_exact_tier_first(model):
+    index = ExactLabelIndex({"email address": "email"})
+    out = predict_labels(model, ["Email Address", "Some Never Seen Label"], exact=index)
+
+    assert out[0] == {"label": "Email Address", "prediction": "email", "confidence": 1.0}
+    assert out[1]["prediction"] is not None
+    assert out[1]["confidence"] <= 1.0
+
+
+@pytest.mark.skipif(not CSV_PATH.exists(), reason="training CSV not available")
+def test_real_csv_builds(model):
+    index = ExactLabelIndex.from_csv(CSV_PATH, classes=model.classes_)
+    assert len(index) > 100
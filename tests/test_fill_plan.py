@@ -0,0 +1,128 @@
+"""
+Tests for the whole-form fill plan (backend/fill_plan.py).
+
+These run the real form model through build_fill_plan without importing
+backend.api, so the profile flattening / value resolution can be checked alone.
+"""
+
+import json
+import pathlib
+
+import joblib
+import pytest
+
+from backend.fill_plan import (
+    FlatProfileCache,
+    build_fill_plan,
+    field_text,
+    flatten_profile,
+    match_option,
+    resolve_profile_key,
+)
+from backend.inference.cache import PredictionCache
+from tests.value_resolver import flatten_profile as reference_flatten
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+PROFILE = json.loads((ROOT / "backend" / "data" / "profile.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(ROOT / "models" / "form_model.pkl")
+
+
+def test_flatten_matches_reference_resolver():
+    # the reference upper-cases country for its own tests; select matching here
+    # is case-insensitive so I keep the profile's casing
+    flat = flatten_profile(PROFILE)
+    for key, val in reference_flatten(PROFILE).items():
+        if val:
+            assert flat[key].lower() == val.lower(), key
+
+
+def test_field_text_fallbacks():
+    assert field_text({"label": " Email ", "name": "x"}) == "Email"
+    assert field_text({"placeholder": "Your city"}) == "Your city"
+    assert field_text({"name": "firstName"}) == "first name"
+    assert field_text({"id": "postal_code"}) == "postal code"
+    assert field_text({}) == ""
+
+
+@pytest.mark.parametrize(
+    "pred,text,key",
+    [
+        ("name", "First Name", "firstName"),
+        ("name", "Surname", "lastName"),
+        ("name", "Full name", "fullName"),
+        ("address", "Zip / Postal Code", "zip"),
+        ("address", "City", "city"),
+        ("social", "GitHub profile", "github"),
+        ("work_auth", "Will you require sponsorship?", "requiresSponsorship"),
+        ("skills", "Skills", None),
+    ],
+)
+def test_resolve_profile_key(pred, text, key):
+    assert resolve_profile_key(pred, text) == key
+
+
+def test_match_option_exact_then_contains():
+    opts = [{"text": "Select…", "value": ""}, {"text": "United States of America", "value": "US"}]
+    assert match_option("US", opts) == "US"
+    assert match_option("united states", opts) == "US"
+    assert match_option("Canada", opts) is None
+    assert match_option("Female", ["Male", "Female"]) == "Female"
+
+
+def test_build_fill_plan_one_batched_call(model):
+    flat = flatten_profile(PROFILE)
+    cache = PredictionCache(maxsize=64)
+    fields = [
+        {"label": "First Name", "id": "fn"},
+        {"label": "Last Name", "id": "ln"},
+        {"label": "Email Address", "name": "email"},
+        {"label": "City", "id": "city"},
+        {"label": "  ", "placeholder": ""},
+    ]
+    plan = build_fill_plan(fields, model, flat, cache=cache)
+
+    by_key = {entry["key"]: entry for entry in plan}
+    assert by_key["fn"]["value"] == flat["firstName"]
+    assert by_key["ln"]["value"] == flat["lastName"]
+    assert by_key["email"]["value"] == flat["email"]
+    assert by_key["city"]["value"] == flat["city"]
+    assert plan[-1]["status"] == "skipped"
+    # every label went through the engine once (all misses, nothing scored twice)
+    assert cache.stats()["misses"] == 4
+
+
+def test_low_confidence_is_skipped(model):
+    plan = build_fill_plan([{"label": "Email"}], model, {"email": "a@b.c"}, min_confidence=1.1)
+    assert plan[0]["status"] == "skipped"
+    assert plan[0]["reason"] == "low confidence"
+
+
+def test_profile_cache_ttl_and_invalidate():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"personal": {"firstName": "Ada"}}
+
+    cache = FlatProfileCache(ttl_seconds=60)
+    assert cache.get("u1", loader)["firstName"] == "Ada"
+    cache.get("u1", loader)
+    assert len(loads) == 1
+    cache.invalidate("u1")
+    cache.get("u1", loader)
+    assert len(loads) == 2
+
+
+def test_profile_cache_drops_a_load_that_raced_an_invalidate():
+    cache = FlatProfileCache(ttl_seconds=60)
+
+    def stale_loader():
+        cache.invalidate("u1")  # the profile write lands while we're reading
+        return {"personal": {"firstName": "Old"}}
+
+    assert cache.get("u1", stale_loader)["firstName"] == "Old"
+    assert cache.get("u1", lambda: {"personal": {"firstName": "New"}})["firstName"] == "New"
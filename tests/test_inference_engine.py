@@ -0,0 +1,59 @@
+"""
+Unit tests for the batched inference engine
+-------------------------------------------
+
+These hit backend/inference/engine.py directly with the real form_model.pkl
+(no Flask/FastAPI), and check the single-pass batch path gives the same
+answers as the old one-label-at-a-time loop.
+"""
+
+import pathlib
+
+import joblib
+import pytest
+
+from backend.inference.engine import predict_label, predict_labels
+
+MODEL_PKL = pathlib.Path(__file__).resolve().parents[1] / "models" / "form_model.pkl"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(MODEL_PKL)
+
+
+def test_batch_matches_per_label_loop(model):
+    labels = ["First Name", "Email Address", "Zip / Postal Code", "Phone Number", "City"]
+    results = predict_labels(model, labels)
+
+    assert len(results) == len(labels)
+    for text, item in zip(labels, results):
+        # Old path: predict + predict_proba per label
+        expected_pred = str(model.predict([text])[0])
+        expected_conf = round(float(max(model.predict_proba([text])[0])), 3)
+        assert item["label"] == text
+        assert item["prediction"] == expected_pred
+        assert item["confidence"] == pytest.approx(expected_conf)
+
+
+def test_blank_labels_keep_their_slot(model):
+    labels = ["First Name", "", "   ", None, "Email Address"]
+    results = predict_labels(model, labels)
+
+    assert [r["label"] for r in results] == labels
+    for i in (1, 2, 3):
+        assert results[i]["prediction"] is None
+        assert results[i]["confidence"] == 0
+    assert results[0]["prediction"] is not None
+    assert results[4]["prediction"] is not None
+
+
+def test_single_label_shape(model):
+    item = predict_label(model, "Email Address")
+    assert set(item) == {"label", "prediction", "confidence"}
+    assert isinstance(item["prediction"], str)
+    assert isinstance(item["confidence"], float)
+
+
+def test_empty_list(model):
+    assert predict_labels(model, []) == []
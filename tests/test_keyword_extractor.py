@@ -0,0 +1,60 @@
+"""
+Unit tests for the cached spaCy keyword extractor (ml/keyword_extractor.py).
+Needs spaCy itself, but not en_core_web_sm: a blank pipeline with a tiny tagger
+stand-in is passed in as nlp.
+"""
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from ml.keyword_extractor import SpacyKeywordExtractor  # noqa: E402
+
+NOUNS = {"python", "aws", "docker", "java", "engineer"}
+
+
+class CountingNLP:
+    """Blank English pipeline that tags NOUNS as NOUN and counts pipe() batches."""
+
+    def __init__(self):
+        self.inner = spacy.blank("en")
+        self.vocab = self.inner.vocab
+        self.pipe_names = ["fake_tagger"]
+        self.batches = []
+
+    def _tag(self, doc):
+        for token in doc:
+            token.pos_ = "NOUN" if token.lower_ in NOUNS else "VERB"
+        return doc
+
+    def pipe(self, texts, batch_size=32):
+        texts = list(texts)
+        self.batches.append(texts)
+        return [self._tag(doc) for doc in self.inner.pipe(texts)]
+
+
+def test_pair_goes_through_one_pipe_call_and_repeats_are_cached():
+    nlp = CountingNLP()
+    kx = SpacyKeywordExtractor(nlp=nlp)
+    resume_kw, jd_kw = kx.extract_many(["Python and AWS", "Java engineer with Docker"])
+    assert resume_kw == {"python", "aws"}
+    assert jd_kw == {"java", "engineer", "docker"}
+    assert len(nlp.batches) == 1
+
+    kx.extract("Java engineer with Docker")
+    assert len(nlp.batches) == 1
+    assert kx.stats()["memory_hits"] == 1
+
+
+def test_persisted_docs_survive_restart(tmp_path):
+    nlp = CountingNLP()
+    SpacyKeywordExtractor(nlp=nlp, doc_cache_dir=tmp_path).extract("Python on AWS", persist=True)
+    assert len(list(tmp_path.glob("*.spacy"))) == 1
+
+    restarted = SpacyKeywordExtractor(nlp=CountingNLP(), doc_cache_dir=tmp_path)
+    assert restarted.extract("Python on AWS", persist=True) == {"python", "aws"}
+    assert restarted.nlp.batches == []
+    assert restarted.stats()["disk_hits"] == 1
+
+    restarted.forget(["Python on AWS"])
+    assert list(tmp_path.glob("*.spacy")) == []
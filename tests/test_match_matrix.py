@@ -0,0 +1,83 @@
+"""
+/match_matrix math (ml/match_matrix.py): every cell must equal what
+BaselineMatcher returns for that one pair, in both IDF modes.
+
+The per-pair reference below is BaselineMatcher's scoring inlined
+(ml.matcher_baseline itself pulls in NLTK data at import).
+"""
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ml.corpus_idf import CorpusIdfStore, score_pair
+from ml.match_matrix import embedding_matrix, tfidf_matrix
+
+STOP = {"look", "experience", "skills"}
+
+# already normalized (what normalize_text / the feature store hand over)
+RESUMES = [
+    "python developer flask sql rest api python",
+    "java spring boot sql microservice kafka",
+    "react typescript aws docker docker",
+    "",
+]
+JDS = [
+    "look python developer django sql experience",
+    "senior java engineer spring kafka kubernetes aws",
+    "frontend react next aws docker ci cd pipeline",
+]
+
+
+def pairwise(resume, jd, snapshot):
+    """BaselineMatcher.get_similarity_and_missing for already-normalized texts."""
+    if snapshot is not None:
+        sim, _, jd_vec = score_pair(snapshot, resume, jd)
+        weights = jd_vec.items()
+    else:
+        vectorizer = TfidfVectorizer(stop_words="english")
+        m = vectorizer.fit_transform([resume, jd])
+        sim = cosine_similarity(m[0:1], m[1:2])[0][0]
+        weights = zip(vectorizer.get_feature_names_out(), m[1].toarray()[0])
+    have = set(resume.split())
+    miss = [(t, round(w, 3)) for t, w in weights if t not in have and t not in STOP and w > 0]
+    miss.sort(key=lambda x: (-x[1], x[0]))
+    return sim, miss
+
+
+def check_against_pairwise(snapshot, top_k=50):
+    scores, missing = tfidf_matrix(RESUMES, JDS, snapshot=snapshot, top_k=top_k, stopwords=STOP)
+    assert scores.shape == (len(RESUMES), len(JDS))
+    for r, resume in enumerate(RESUMES):
+        for j, jd in enumerate(JDS):
+            sim, miss = pairwise(resume, jd, snapshot)
+            assert scores[r, j] == pytest.approx(sim, abs=1e-9), (r, j)
+            assert missing[r][j] == [(t, float(w)) for t, w in miss[:top_k]], (r, j)
+
+
+def test_pair_mode_matches_match_endpoint():
+    check_against_pairwise(None)
+
+
+def test_corpus_mode_matches_match_endpoint():
+    store = CorpusIdfStore()
+    store.add_base(["python sql developer", "java spring", "aws docker kubernetes", "sql"])
+    check_against_pairwise(store.snapshot())
+
+
+def test_top_k_and_precomputed_counts():
+    counts = [{"python": 2, "flask": 1}, None]
+    scores, missing = tfidf_matrix(
+        ["ignored", "java sql"], ["python django sql"], resume_counts=counts, top_k=1
+    )
+    assert scores[0, 0] > 0
+    assert [len(cell) for row in missing for cell in row] == [1, 1]
+
+
+def test_embedding_matrix_is_cosine_percent():
+    R = [np.array([1.0, 0.0]), np.array([1.0, 1.0])]
+    J = [np.array([2.0, 0.0])]
+    scores, missing = embedding_matrix(R, J, [{"a"}, set()], [{"a", "b", "c"}], top_k=1)
+    assert scores[:, 0] == pytest.approx([100.0, 100.0 / np.sqrt(2)], rel=1e-6)
+    assert missing == [[["b"]], [["a"]]]
@@ -0,0 +1,125 @@
+"""
+Tests for hot model reload (backend/inference/manager.py).
+
+I train two tiny pipelines and copy them over the same path, the same way a
+retrained form_model.pkl gets deployed.
+"""
+
+import os
+import time
+
+import joblib
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from backend.inference.cache import PredictionCache
+from backend.inference.engine import predict_labels
+from backend.inference.loader import file_sha256
+from backend.inference.manager import ModelManager
+from backend.inference.numpy_scorer import export_numpy_artifact
+
+
+def _pipeline(labels, targets):
+    return Pipeline(
+        [
+            ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4))),
+            ("clf", LogisticRegression(max_iter=200)),
+        ]
+    ).fit(labels, targets)
+
+
+@pytest.fixture()
+def models():
+    v1 = _pipeline(["first name", "email", "phone"], ["name", "email", "phone"])
+    v2 = _pipeline(["first name", "email", "phone", "city"], ["name", "email", "phone", "address"])
+    return v1, v2
+
+
+def _deploy(model, path):
+    # write next to it, then rename (atomic), bumping mtime so the stat changes
+    tmp = path.with_suffix(".tmp")
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_reload_swaps_version_and_keeps_old_snapshot(tmp_path, models):
+    pkl = tmp_path / "form_model.pkl"
+    _deploy(models[0], pkl)
+    mgr = ModelManager(pkl, tmp_path / "np", backend="sklearn")
+
+    old_model, old_version = mgr.current()
+    assert mgr.reload() is False  # nothing changed on disk
+
+    _deploy(models[1], pkl)
+    assert mgr.changed()
+    assert mgr.reload() is True
+
+    new_model, new_version = mgr.current()
+    assert new_version != old_version
+    assert "address" in new_model.classes_
+    # a request that grabbed the old snapshot keeps a working model
+    assert old_model.predict(["email"])[0] == "email"
+    assert mgr.stats()["reloads"] == 1
+
+
+def test_failed_reload_keeps_serving(tmp_path, models):
+    pkl = tmp_path / "form_model.pkl"
+    _deploy(models[0], pkl)
+    mgr = ModelManager(pkl, tmp_path / "np", backend="sklearn")
+    version = mgr.version
+
+    pkl.write_bytes(b"half a pickle")
+    assert mgr.reload() is False
+    assert mgr.version == version
+    assert mgr.stats()["failed_reloads"] == 1
+    assert mgr.stats()["last_error"]
+
+
+def test_watcher_picks_up_new_model(tmp_path, models):
+    pkl = tmp_path / "form_model.pkl"
+    _deploy(models[0], pkl)
+    mgr = ModelManager(pkl, tmp_path / "np", backend="sklearn", poll_seconds=0.05)
+    mgr.start()
+    try:
+        first = mgr.version
+        _deploy(models[1], pkl)
+        deadline = time.time() + 5
+        while mgr.version == first and time.time() < deadline:
+            time.sleep(0.05)
+        assert mgr.version != first
+    finally:
+        mgr.stop()
+
+
+def test_reexported_artifact_is_a_new_version_and_runs_swap_hooks(tmp_path, models):
+    pkl, art = tmp_path / "form_model.pkl", tmp_path / "np"
+    _deploy(models[0], pkl)
+    export_numpy_artifact(models[0], art, source_sha256=file_sha256(pkl))
+    mgr = ModelManager(pkl, art, backend="numpy")
+    swaps = []
+    mgr.on_swap(lambda model, version: swaps.append((list(model.classes_), version)))
+    first = mgr.version
+
+    # same pickle, new weights next to it
+    export_numpy_artifact(models[1], art, source_sha256=file_sha256(pkl))
+    st = (art / "meta.json").stat()
+    os.utime(art / "meta.json", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert mgr.reload() is True
+    assert mgr.version != first
+    assert swaps == [(list(mgr.model.classes_), mgr.version)] and "address" in swaps[0][0]
+
+
+def test_results_carry_version_and_stale_writes_are_dropped(models):
+    cache = PredictionCache(maxsize=16)
+    cache.bind("new")
+
+    out = predict_labels(models[0], ["email", "  "], cache=cache, version="old")
+    assert all(item["model_version"] == "old" for item in out)
+    assert len(cache) == 0  # the old model's answer never lands in the new cache
+
+    predict_labels(models[1], ["email"], cache=cache, version="new")
+    assert len(cache) == 1
@@ -0,0 +1,90 @@
+"""
+Parity tests: numpy scoring artifact vs. the form_model.pkl Pipeline
+--------------------------------------------------------------------
+
+The numpy scorer has to give the same answers as the pickle it was exported
+from, otherwise switching the serving backend would silently change predictions.
+"""
+
+import csv
+import pathlib
+
+import joblib
+import numpy as np
+import pytest
+
+from backend.inference.loader import file_sha256, load_form_model
+from backend.inference.numpy_scorer import NumpyFormScorer, export_numpy_artifact
+from tests.golden_form_mapping import GOLDEN_LABELS
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+MODEL_PKL = ROOT / "models" / "form_model.pkl"
+CSV_PATH = ROOT / "dataset" / "form_labels_balanced.csv"
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return joblib.load(MODEL_PKL)
+
+
+@pytest.fixture(scope="module")
+def artifact(pipeline, tmp_path_factory):
+    out = tmp_path_factory.mktemp("form_model_np")
+    try:
+        export_numpy_artifact(pipeline, out, source_sha256=file_sha256(MODEL_PKL))
+    except ValueError as e:
+        pytest.skip(f"model can't be exported to numpy: {e}")
+    return out
+
+
+def _labels():
+    labels = list(GOLDEN_LABELS)
+    with open(CSV_PATH, "r", encoding="utf-8") as fh:
+        labels += [row["label_text"] for row in csv.DictReader(fh)]
+    # odd inputs: accents, extra whitespace, unknown n-grams, empty
+    labels += ["Código  Postal", "  ", "qqqq", "ß straße", "x"]
+    return labels
+
+
+def test_predict_proba_parity(pipeline, artifact):
+    scorer = NumpyFormScorer(artifact)
+    labels = _labels()
+
+    expected = pipeline.predict_proba(labels)
+    got = scorer.predict_proba(labels)
+
+    assert got.shape == expected.shape
+    np.testing.assert_allclose(got, expected, atol=1e-5)
+    assert list(scorer.classes_) == [str(c) for c in pipeline.classes_]
+    assert (scorer.predict(labels) == pipeline.predict(labels)).all()
+
+
+def test_export_rejects_unsupported_vectorizer(tmp_path):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    pipe = Pipeline(
+        [("tfidf", TfidfVectorizer(analyzer="word")), ("clf", LogisticRegression())]
+    ).fit(["first name", "email address", "phone"], ["name", "email", "phone"])
+    with pytest.raises(ValueError):
+        export_numpy_artifact(pipe, tmp_path)
+
+
+def test_loader_auto_prefers_fresh_artifact(artifact):
+    model = load_form_model(MODEL_PKL, artifact, backend="auto")
+    assert isinstance(model, NumpyFormScorer)
+
+
+def test_loader_auto_ignores_stale_artifact(pipeline, tmp_path):
+    try:
+        export_numpy_artifact(pipeline, tmp_path, source_sha256="not-this-pickle")
+    except ValueError as e:
+        pytest.skip(f"model can't be exported to numpy: {e}")
+    model = load_form_model(MODEL_PKL, tmp_path, backend="auto")
+    assert not isinstance(model, NumpyFormScorer)
+
+
+def test_loader_numpy_backend_requires_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_form_model(MODEL_PKL, tmp_path / "missing", backend="numpy")
@@ -0,0 +1,93 @@
+"""
+Unit tests for the /predict micro-batcher (backend/inference/batcher.py).
+
+I drive it with asyncio.run directly so these don't need the FastAPI app.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.inference.batcher import MicroBatcher
+
+
+def _fake_score(calls):
+    def score(labels):
+        calls.append(list(labels))
+        return [{"label": lab, "prediction": lab.upper(), "confidence": 1.0} for lab in labels]
+
+    return score
+
+
+def test_concurrent_submits_share_one_batch():
+    calls = []
+    batcher = MicroBatcher(_fake_score(calls), window_ms=20, max_batch=64)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(f"label{i}") for i in range(10)))
+
+    results = asyncio.run(main())
+
+    assert [r["prediction"] for r in results] == [f"LABEL{i}" for i in range(10)]
+    assert len(calls) == 1
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["labels"] == 10
+    assert stats["flush_reasons"]["timer"] == 1
+
+
+def test_max_batch_flushes_early():
+    calls = []
+    batcher = MicroBatcher(_fake_score(calls), window_ms=1000, max_batch=4)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(str(i)) for i in range(8)))
+
+    results = asyncio.run(main())
+
+    assert len(results) == 8
+    assert [len(c) for c in calls] == [4, 4]
+    stats = batcher.stats()
+    assert stats["flush_reasons"]["full"] == 2
+    assert stats["batch_size_histogram"]["3-4"] == 2
+
+
+def test_errors_reach_every_caller():
+    def boom(labels):
+        raise RuntimeError("model exploded")
+
+    batcher = MicroBatcher(boom, window_ms=5, max_batch=8)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+    out = asyncio.run(main())
+    assert all(isinstance(e, RuntimeError) for e in out)
+
+
+def test_histogram_buckets_and_disabled_flag():
+    batcher = MicroBatcher(lambda labels: [], window_ms=0, max_batch=64)
+    assert not batcher.enabled
+    assert list(batcher.stats()["batch_size_histogram"]) == [
+        "1",
+        "2",
+        "3-4",
+        "5-8",
+        "9-16",
+        "17-32",
+        "33-64",
+    ]
+
+
+@pytest.mark.parametrize("max_batch", [1, 3])
+def test_odd_max_batch_sizes(max_batch):
+    calls = []
+    batcher = MicroBatcher(_fake_score(calls), window_ms=5, max_batch=max_batch)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(str(i)) for i in range(5)))
+
+    assert len(asyncio.run(main())) == 5
+    assert all(len(c) <= max_batch for c in calls)
@@ -0,0 +1,70 @@
+"""
+Tests for the NDJSON streaming helpers behind /predict_stream
+(backend/inference/stream.py).
+"""
+
+import json
+import pathlib
+
+import joblib
+import pytest
+
+from backend.inference.engine import predict_labels
+from backend.inference.stream import (
+    NDJSONLabelReader,
+    PredictionStream,
+    chunked,
+    labels_from_json,
+    read_ndjson_labels,
+)
+
+MODEL_PKL = pathlib.Path(__file__).resolve().parents[1] / "models" / "form_model.pkl"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(MODEL_PKL)
+
+
+def test_reader_handles_lines_split_across_chunks():
+    reader = NDJSONLabelReader()
+    assert reader.feed(b'"First Name"\n{"label": "Ema') == ["First Name"]
+    assert reader.feed(b'il"}\n\n["Phone", "City"]') == ["Email"]
+    assert reader.close() == ["Phone", "City"]
+
+
+def test_bad_line_raises_value_error():
+    with pytest.raises(ValueError):
+        read_ndjson_labels([b'"ok"\nnot json\n'])
+
+
+def test_labels_from_json_shapes():
+    assert labels_from_json(["a"]) == ["a"]
+    assert labels_from_json({"labels": ["a", "b"]}) == ["a", "b"]
+    with pytest.raises(ValueError):
+        labels_from_json({"labels": "a"})
+
+
+def test_stream_emits_indexed_lines_per_chunk_and_trailer(model):
+    calls = []
+
+    def score(labels):
+        calls.append(len(labels))
+        return predict_labels(model, labels, version="v1")
+
+    labels = ["First Name", "Email", "", "Phone Number", "City"]
+    stream = PredictionStream(score, version="v1")
+    pieces = list(stream.iter_lines(chunked(labels, 2)))
+
+    assert calls == [2, 2, 1]
+    assert len(pieces) == 4  # three scored chunks + the trailer
+    rows = [json.loads(line) for piece in pieces for line in piece.splitlines()]
+    assert [r["index"] for r in rows[:-1]] == list(range(5))
+    assert rows[1]["prediction"] == "email"
+    assert rows[2]["prediction"] is None
+    assert rows[-1] == {"done": True, "total": 5, "model_version": "v1"}
+
+
+@pytest.mark.parametrize("size", [0, -3])
+def test_chunked_clamps_a_non_positive_size(size):
+    assert list(chunked(["a", "b", "c"], size)) == [["a"], ["b"], ["c"]]
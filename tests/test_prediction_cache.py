@@ -0,0 +1,84 @@
+"""
+Unit tests for the label prediction cache
+-----------------------------------------
+
+Covers the LRU itself (hits/misses/evictions, version invalidation) and how
+the inference engine uses it.
+"""
+
+import pathlib
+
+import joblib
+import pytest
+
+from backend.inference.cache import PredictionCache, model_file_signature
+from backend.inference.engine import predict_labels
+from backend.inference.normalize import normalize_label
+
+MODEL_PKL = pathlib.Path(__file__).resolve().parents[1] / "models" / "form_model.pkl"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(MODEL_PKL)
+
+
+def test_normalize_label_matches_vectorizer_preprocessing():
+    assert normalize_label("  First   Name ") == "first name"
+    assert normalize_label("Código Postal") == "codigo postal"
+    assert normalize_label("E-MAIL\tAddress") == "e-mail address"
+
+
+def test_lru_evicts_oldest_and_counts():
+    cache = PredictionCache(maxsize=2)
+    cache.put("a", ("name", 0.9))
+    cache.put("b", ("email", 0.8))
+    assert cache.get("a") == ("name", 0.9)  # "a" is now most recent
+    cache.put("c", ("phone", 0.7))  # evicts "b"
+
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_bind_new_version_clears_entries():
+    cache = PredictionCache(maxsize=10)
+    cache.bind("v1")
+    cache.put("a", ("name", 0.9))
+    cache.bind("v1")
+    assert cache.get("a") is not None
+
+    cache.bind("v2")
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_model_file_signature_changes_with_file(tmp_path):
+    f = tmp_path / "m.pkl"
+    assert model_file_signature(str(f)) == "missing"
+    f.write_bytes(b"one")
+    first = model_file_signature(str(f))
+    f.write_bytes(b"three")
+    assert model_file_signature(str(f)) != first
+
+
+def test_engine_serves_repeat_labels_from_cache(model):
+    cache = PredictionCache(maxsize=100)
+    first = predict_labels(model, ["First Name", "Email Address"], cache=cache)
+    assert cache.stats()["misses"] == 2
+
+    # Different spacing/case -> same normalized key -> cache hit
+    again = predict_labels(model, ["first  name", "EMAIL ADDRESS"], cache=cache)
+    assert cache.stats()["hits"] == 2
+    assert [r["prediction"] for r in again] == [r["prediction"] for r in first]
+    assert [r["label"] for r in again] == ["first  name", "EMAIL ADDRESS"]
+
+
+def test_engine_scores_duplicates_once(model):
+    cache = PredictionCache(maxsize=100)
+    out = predict_labels(model, ["City", "city", " CITY "], cache=cache)
+    assert len({r["prediction"] for r in out}) == 1
+    assert cache.stats()["size"] == 1
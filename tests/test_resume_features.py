@@ -0,0 +1,150 @@
+"""
+Unit tests for the per-resume feature store (backend/resume_features.py).
+compute() is a small fake, so no NLTK / sentence-transformers needed.
+"""
+
+import io
+import threading
+
+import numpy as np
+
+from backend.resume_features import ResumeFeatures, ResumeFeatureStore, feature_version
+
+
+def fake_features(text, embedding=True):
+    words = text.lower().split()
+    terms = sorted(set(words))
+    return ResumeFeatures(
+        normalized=" ".join(words),
+        selector_text=text.lower(),
+        skills=[w for w in terms if w in {"python", "sql", "docker"}],
+        terms=terms,
+        counts=[words.count(t) for t in terms],
+        embedding=np.arange(4, dtype=np.float32) if embedding else None,
+        keywords=terms[:2],
+    )
+
+
+class CountingCompute:
+    def __init__(self, gate=None):
+        self.calls = 0
+        self.gate = gate
+
+    def __call__(self, text):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.calls += 1
+        return fake_features(text)
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def get(self, key):
+        return self.objects[key]
+
+    def put(self, key, data, content_type=None):
+        self.objects[key] = data
+
+    def delete(self, key):
+        self.objects.pop(key, None)
+
+
+def _store(tmp_path, compute=None, version="v1", **kwargs):
+    return ResumeFeatureStore(
+        tmp_path / "features", version=version, compute=compute or CountingCompute(), **kwargs
+    )
+
+
+def test_npz_roundtrip_without_embedding():
+    feats = fake_features("Python SQL python", embedding=False)
+    back = ResumeFeatures.from_bytes(feats.to_bytes())
+    assert back.normalized == "python sql python"
+    assert back.skills == ["python", "sql"]
+    assert back.term_counts() == {"python": 2, "sql": 1}
+    assert back.embedding is None
+
+
+def test_skills_version_roundtrip_and_old_files():
+    feats = fake_features("Python SQL")
+    feats.skills_version = "abc123"
+    assert ResumeFeatures.from_bytes(feats.to_bytes()).skills_version == "abc123"
+
+    # files written before skills were stamped read back as "" (= stale skills)
+    arrays = dict(np.load(io.BytesIO(feats.to_bytes())))
+    del arrays["skills_version"]
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **arrays)
+    assert ResumeFeatures.from_bytes(buf.getvalue()).skills_version == ""
+
+
+def test_replace_copies_instead_of_mutating():
+    feats = fake_features("Python SQL docker")
+    fresh = feats.replace(skills=["python"], skills_version="v2")
+
+    assert fresh is not feats and fresh.skills == ["python"] and fresh.skills_version == "v2"
+    assert feats.skills == ["docker", "python", "sql"] and feats.skills_version == ""
+    assert fresh.terms == feats.terms and np.array_equal(fresh.embedding, feats.embedding)
+
+
+def test_get_computes_once_then_loads_from_disk(tmp_path):
+    compute = CountingCompute()
+    store = _store(tmp_path, compute)
+    first = store.get("r1", lambda: "python docker")
+    assert store.get("r1", lambda: "ignored").normalized == first.normalized
+    assert compute.calls == 1
+
+    # fresh process: nothing in memory, file still there
+    restarted = _store(tmp_path, compute)
+    feats = restarted.load("r1")
+    assert feats is not None and np.array_equal(feats.embedding, first.embedding)
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_new_version_ignores_old_files(tmp_path):
+    compute = CountingCompute()
+    _store(tmp_path, compute, version="v1").get("r1", lambda: "python")
+    assert _store(tmp_path, compute, version="v2").load("r1") is None
+
+
+def test_feature_version_is_stable_and_sensitive():
+    assert feature_version(skills="a", embedding=None) == feature_version(
+        embedding=None, skills="a"
+    )
+    assert feature_version(skills="a") != feature_version(skills="b")
+
+
+def test_s3_mirror_and_delete(tmp_path):
+    s3 = FakeS3()
+    kwargs = dict(remote_get=s3.get, remote_put=s3.put, remote_delete=s3.delete)
+    store = _store(tmp_path, **kwargs)
+    store.compute_and_save("r1", "python sql", user_id="u1")
+    assert list(s3.objects) == ["users/u1/features/r1.v1.npz"]
+
+    # another machine: empty disk, same bucket
+    other = ResumeFeatureStore(tmp_path / "other", "v1", CountingCompute(), **kwargs)
+    assert other.load("r1", user_id="u1").skills == ["python", "sql"]
+
+    store.delete("r1", user_id="u1")
+    assert not s3.objects
+    assert not list((tmp_path / "features").glob("r1.*"))
+    assert store.load("r1") is None
+
+
+def test_read_waits_for_pending_upload_job(tmp_path):
+    gate = threading.Event()
+    compute = CountingCompute(gate)
+    store = _store(tmp_path, compute)
+    future = store.submit("r1", "python docker")
+
+    result = {}
+    reader = threading.Thread(target=lambda: result.update(f=store.get("r1", lambda: "x")))
+    reader.start()
+    gate.set()
+    reader.join(timeout=5)
+    future.result(timeout=5)
+
+    assert result["f"].skills == ["docker", "python"]
+    assert compute.calls == 1
+    assert store.stats()["pending"] == 0
@@ -0,0 +1,112 @@
+"""
+Unit tests for the per-user /select_resume TF-IDF index (backend/matcher/resume_index.py).
+"""
+
+import pathlib
+
+import numpy as np
+import pytest
+
+from backend.matcher.resume_index import ResumeTfidfIndexStore, UserTfidfIndex, bump_terms_in
+from backend.matcher.resume_selector import _tfidf_scores, prep_text, select_best_resume
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+RESUMES = [
+    {"id": "r1", "text": "Java Spring Boot SQL microservices on AWS"},
+    {"id": "r2", "text": "React Next.js AWS Docker CI/CD, some Python"},
+    {"id": "r3", "text": "Python data pipelines, SQL, Airflow and Docker"},
+]
+JDS = [
+    "React developer with AWS and Docker",
+    "Backend Java engineer, Spring Boot, SQL",
+    "Kotlin Android role",  # no overlap with anything
+    "",
+]
+
+
+def _index(resumes):
+    index = UserTfidfIndex()
+    for r in resumes:
+        index.add(r["id"], prep_text(r["text"]), r["text"])
+    return index
+
+
+def test_scores_match_the_per_call_refit_on_dataset():
+    paths = sorted((ROOT / "dataset" / "resumes").glob("*.txt"))
+    resumes = [{"id": p.stem, "text": p.read_text(encoding="utf-8")} for p in paths]
+    jds = [p.read_text(encoding="utf-8") for p in sorted((ROOT / "dataset" / "jobs").glob("*"))]
+    index = _index(resumes)
+    for jd in jds[:5] + JDS:
+        ids, sims = index.scores(prep_text(jd))
+        assert ids == [r["id"] for r in resumes]
+        np.testing.assert_allclose(sims, _tfidf_scores(jd, resumes), atol=1e-12)
+
+
+def test_ranking_with_index_scores_and_bump_terms_is_unchanged():
+    index = _index(RESUMES)
+    items = [{"id": r["id"], "bump_terms": bump_terms_in(r["text"])} for r in RESUMES]
+    for jd in JDS[:3]:
+        _, sims = index.scores(prep_text(jd))
+        _, expected = select_best_resume(jd, RESUMES)
+        _, ranking = select_best_resume(jd, items, tfidf_sims=sims)
+        assert [rid for rid, _ in ranking] == [rid for rid, _ in expected]
+        np.testing.assert_allclose([s for _, s in ranking], [s for _, s in expected], atol=1e-12)
+
+
+def test_incremental_updates_equal_a_fresh_build():
+    index = _index(RESUMES)
+    _, before = index.scores(prep_text(JDS[0]))  # builds + caches the matrix
+    index.remove("r1")
+    index.add("r4", prep_text("Go and Kubernetes on GCP"), "Go and Kubernetes on GCP")
+    index.add("r2", prep_text("React only"), "React only")  # re-upload replaces
+
+    fresh = _index(
+        [
+            RESUMES[2],
+            {"id": "r4", "text": "Go and Kubernetes on GCP"},
+            {"id": "r2", "text": "React only"},
+        ]
+    )
+    ids, sims = index.scores(prep_text(JDS[0]))
+    fresh_ids, fresh_sims = fresh.scores(prep_text(JDS[0]))
+    assert sorted(ids) == sorted(fresh_ids) == ["r2", "r3", "r4"]
+    np.testing.assert_allclose(sims[[ids.index(r) for r in fresh_ids]], fresh_sims, atol=1e-12)
+    assert not np.allclose(np.sort(before), np.sort(sims))
+
+
+def test_npz_roundtrip_and_store_sync(tmp_path):
+    store = ResumeTfidfIndexStore(tmp_path / "select_index")
+    loads = []
+
+    def load(row):
+        loads.append(row["id"])
+        return prep_text(row["text"]), row["text"]
+
+    rows = [(r["id"], r) for r in RESUMES]
+    index = store.sync("u1", rows, load)
+    assert loads == ["r1", "r2", "r3"] and store.path("u1").exists()
+
+    # a new process: everything comes back from disk, nothing is re-read
+    again = ResumeTfidfIndexStore(tmp_path / "select_index")
+    index2 = again.sync("u1", rows[:2], load)  # r3 deleted behind our back
+    assert loads == ["r1", "r2", "r3"]
+    assert index2.ids == ["r1", "r2"] and index2.bumps["r2"] == bump_terms_in(RESUMES[1]["text"])
+    np.testing.assert_allclose(
+        index2.scores(prep_text(JDS[0]))[1], _tfidf_scores(JDS[0], RESUMES[:2]), atol=1e-12
+    )
+    assert index.ids == ["r1", "r2", "r3"]  # the first store's copy is its own
+
+    again.add("u1", "r9", prep_text("Rust"), "Rust")
+    again.add("nobody-yet", "r10", prep_text("Rust"), "Rust")  # built on first select instead
+    assert "r9" in ResumeTfidfIndexStore(tmp_path / "select_index").get("u1")
+    assert again.get("nobody-yet") is None
+
+
+def test_empty_inputs_raise_like_the_refit():
+    index = _index([{"id": "r1", "text": "   "}])
+    with pytest.raises(ValueError):
+        index.scores("")
+    with pytest.raises(ValueError):
+        index.scores(prep_text("python"))
+    assert UserTfidfIndex().scores(prep_text("python"))[0] == []
@@ -1,3 +1,5 @@
+import pytest
+
 from backend.matcher.resume_selector import select_best_resume
 
 
@@ -10,3 +12,49 @@ def test_selector_basic():
     best, ranking = select_best_resume(jd, resumes)
     assert best["id"] == "r2"
     assert ranking and ranking[0][0] == "r2"
+
+
+class BagOfWordsEncoder:
+    """Stand-in for MatcherEmbeddings.embed_many: one vector per text, counts calls."""
+
+    VOCAB = ["react", "aws", "docker", "java", "spring", "sql"]
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(w in t.lower()) for w in self.VOCAB] + [0.1] for t in texts]
+
+
+RESUMES = [
+    {"id": "r1", "text": "Java Spring Boot SQL"},
+    {"id": "r2", "text": "React Next.js AWS Docker CI/CD"},
+    {"id": "r3", "text": "Java and some AWS"},
+]
+
+
+def test_embedding_mode_encodes_everything_in_one_call():
+    enc = BagOfWordsEncoder()
+    best, ranking = select_best_resume(
+        "React developer with AWS and Docker", RESUMES, method="embedding", embed_many=enc
+    )
+    assert best["id"] == "r2"
+    assert [rid for rid, _ in ranking][0] == "r2" and len(ranking) == 3
+    assert len(enc.calls) == 1 and len(enc.calls[0]) == 4  # JD + 3 resumes
+
+
+def test_stored_vectors_skip_the_encoder():
+    enc = BagOfWordsEncoder()
+    stored = enc([r["text"] for r in RESUMES])
+    enc.calls.clear()
+    _, ranking = select_best_resume(
+        "Java SQL", RESUMES, method="hybrid", embed_many=enc, vectors=stored
+    )
+    assert enc.calls == [["Java SQL"]]
+    assert ranking[0][0] == "r1"
+
+
+def test_embedding_mode_needs_an_encoder():
+    with pytest.raises(ValueError):
+        select_best_resume("jd", RESUMES, method="embedding")
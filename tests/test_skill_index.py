@@ -0,0 +1,93 @@
+"""
+Unit tests for the per-user skill bitset index (backend/matcher/skill_index.py).
+"""
+
+import numpy as np
+
+from backend.matcher.skill_index import SkillBitsetIndex
+
+VOCAB = ["python", "java", "sql", "docker", "aws", "react", "machine learning", "c++", "go"]
+
+
+def test_encode_decode_roundtrip_and_width():
+    index = SkillBitsetIndex(VOCAB)
+    row = index.encode(["sql", "go", "not-a-skill", "python"])
+
+    assert row.dtype == np.uint8 and row.shape == (2,)  # 9 terms -> 2 bytes
+    assert index.decode(row) == ["python", "sql", "go"]  # vocabulary order
+
+
+def test_gap_matches_set_arithmetic():
+    index = SkillBitsetIndex(VOCAB)
+    resumes = {
+        "a": ["python", "sql", "aws"],
+        "b": ["java", "docker", "aws", "go"],
+        "c": [],
+    }
+    index.sync("u1", resumes, lambda rids: [(rid, resumes[rid]) for rid in rids])
+    jd = ["python", "aws", "docker", "go"]
+
+    gap = index.gap("u1", jd)
+
+    assert gap["jd_skills"] == ["python", "docker", "aws", "go"]
+    for i, rid in enumerate(gap["ids"]):
+        have = set(resumes[rid])
+        assert set(gap["covered"][i]) == have & set(jd)
+        assert set(gap["missing"][i]) == set(jd) - have
+        assert gap["covered_count"][i] == len(have & set(jd))
+        assert gap["coverage"][i] == round(len(have & set(jd)) / len(jd), 4)
+
+
+def test_add_remove_only_touch_loaded_users():
+    index = SkillBitsetIndex(VOCAB)
+    index.add("u1", "x", ["python"])  # u1 not loaded yet: their first sync reads it
+    assert index.gap("u1", ["python"])["ids"] == []
+
+    index.sync("u1", ["a", "b"], lambda rids: [("a", ["python"]), ("b", ["java"])])
+    index.add("u1", "c", ["sql"])
+    index.add("u1", "a", ["react"])  # re-upload replaces the row
+    index.remove("u1", "b")
+    index.remove("someone-else", "a")  # not loaded: no-op
+
+    gap = index.gap("u1", ["react", "sql"])
+    assert gap["ids"] == ["a", "c"]
+    assert gap["covered"] == [["react"], ["sql"]]
+    assert index.gap("someone-else", ["python"])["ids"] == []
+
+
+def test_sync_keeps_rows_added_while_loading():
+    index = SkillBitsetIndex(VOCAB)
+    index.sync("u1", [], lambda rids: [])
+
+    def load(rids):
+        index.add("u1", "new", ["go"])  # an upload lands while we're reading
+        return [("old", ["java"])]
+
+    index.sync("u1", ["old"], load)
+
+    assert sorted(index.gap("u1", ["go", "java"])["ids"]) == ["new", "old"]
+
+
+def test_empty_jd_gives_zero_coverage():
+    index = SkillBitsetIndex(VOCAB)
+    index.sync("u1", ["a"], lambda rids: [("a", ["python"])])
+    gap = index.gap("u1", [])
+    assert gap["coverage"] == [0.0] and gap["missing"] == [[]]
+
+
+def test_sync_follows_the_db_and_only_loads_new_rows():
+    index = SkillBitsetIndex(VOCAB)
+    skills = {"a": ["python"], "b": ["java"], "c": ["sql"]}
+    loads = []
+
+    def load(rids):
+        loads.append(list(rids))
+        return [(rid, skills[rid]) for rid in rids if rid in skills]
+
+    index.sync("u1", ["a", "b"], load)
+    index.sync("u1", ["a", "b"], load)  # nothing changed: no read
+    # another worker uploaded c and deleted a
+    index.sync("u1", ["b", "c"], load)
+
+    assert loads == [["a", "b"], ["c"]]
+    assert index.gap("u1", ["java", "sql"])["ids"] == ["b", "c"]
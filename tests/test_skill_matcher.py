@@ -0,0 +1,75 @@
+"""
+Unit tests for the compiled skill matcher (backend/matcher/skill_matcher.py).
+"""
+
+import pathlib
+import re
+
+import pytest
+
+from backend.matcher import skill_matcher
+from backend.matcher.skill_matcher import SkillMatcher, trie_pattern
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+ENGINES = ["regex"] + (["aho-corasick"] if skill_matcher.ahocorasick is not None else [])
+
+
+def old_extract(terms, text):
+    """extract_skills_from_text as it was before SkillMatcher."""
+    t = " ".join(text.lower().split())
+    hits = set()
+    for m in [s for s in terms if " " in s]:
+        if m in t:
+            hits.add(m)
+    tokens = set(re.split(r"[^a-z0-9\+#\.]+", t))
+    for s in [s for s in terms if " " not in s]:
+        if s in tokens:
+            hits.add(s)
+    return sorted(hits)
+
+
+@pytest.fixture(scope="module")
+def terms():
+    lines = (ROOT / "backend" / "skill_terms.txt").read_text(encoding="utf-8").splitlines()
+    return list(dict.fromkeys(x.strip().lower() for x in lines if x.strip() and x[0] != "#"))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_same_hits_as_old_function_on_dataset(terms, engine):
+    matcher = SkillMatcher(terms, engine=engine)
+    paths = sorted((ROOT / "dataset" / "resumes").glob("*.txt"))
+    paths += sorted((ROOT / "dataset" / "jobs").glob("*.txt"))
+    assert paths
+    texts = [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+    for text in texts + [" ".join(texts)]:
+        assert matcher.extract(text) == old_extract(terms, text)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_overlapping_phrases_and_token_boundaries(engine):
+    terms = ["asp.net core", ".net core", "net core", "spring boot", "spring", "c", "c++",
+             "java", "ci/cd", "machine learning", "learning rate"]
+    matcher = SkillMatcher(terms, engine=engine)
+    text = "Built ASP.NET  Core APIs, Spring Boot, C++ and javascript; CI/CD; machine learning rate"
+
+    hits = matcher.extract(text)
+
+    assert hits == old_extract(terms, text)
+    assert {"asp.net core", ".net core", "net core"} <= set(hits)  # nested phrases all count
+    assert {"machine learning", "learning rate"} <= set(hits)  # phrases that cross each other
+    assert "c++" in hits and "c" not in hits  # single words are whole tokens only
+    assert "java" not in hits  # not inside "javascript"
+    assert "ci/cd" not in hits  # "/" splits tokens, so this never matched before either
+
+
+def test_trie_pattern_prefers_longest_phrase():
+    rx = re.compile(trie_pattern(["spring", "spring boot", "spring mvc"]))
+    assert rx.match("spring boot app").group(0) == "spring boot"
+    assert rx.match("spring cleaning").group(0) == "spring"
+
+
+def test_empty_and_unknown_engine():
+    assert SkillMatcher([]).extract("python and sql") == []
+    assert SkillMatcher(["python"]).extract(None) == []
+    with pytest.raises(ValueError):
+        SkillMatcher(["python"], engine="nope")
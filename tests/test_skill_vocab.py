@@ -0,0 +1,72 @@
+"""
+Unit tests for the hot-reloadable skill vocabulary (backend/matcher/skill_vocab.py).
+"""
+
+import os
+
+from backend.matcher.skill_vocab import SkillVocabulary, vocabulary_version
+
+
+def read_terms(path):
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return list(dict.fromkeys(x.strip().lower() for x in lines if x.strip() and x[0] != "#"))
+
+
+def _write(path, text, bump_ns=0):
+    path.write_text(text, encoding="utf-8")
+    if bump_ns:  # make sure mtime moves even on coarse filesystem clocks
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_reload_swaps_matcher_index_and_version_together(tmp_path):
+    terms = tmp_path / "skills.txt"
+    _write(terms, "python\nsql\n")
+    vocab = SkillVocabulary(terms, load=read_terms)
+    before = vocab.current
+    assert before.matcher.extract("Python and Go") == ["python"]
+    before.index.sync("u1", ["r1"], lambda rids: [("r1", ["python"])])
+
+    _write(terms, "python\nsql\ngo\n# comment\n", bump_ns=10**9)
+    assert vocab.check() is True
+
+    after = vocab.current
+    assert after is not before
+    assert after.version == vocabulary_version(["python", "sql", "go"]) != before.version
+    assert after.matcher.extract("Python and Go") == ["go", "python"]
+    assert after.index.vocabulary == ("python", "sql", "go")
+    # users reload lazily (next sync) against the new columns
+    assert after.index.gap("u1", ["python"])["ids"] == []
+    assert before.matcher.extract("Python and Go") == ["python"]  # old snapshot untouched
+    assert vocab.stats()["reloads"] == 1
+
+
+def test_touch_without_change_and_missing_file_keep_current(tmp_path):
+    terms = tmp_path / "skills.txt"
+    _write(terms, "python\n")
+    vocab = SkillVocabulary(terms, load=read_terms)
+    current = vocab.current
+
+    assert vocab.check() is False  # nothing moved
+    _write(terms, "Python\n\n", bump_ns=10**9)  # same terms after parsing
+    assert vocab.check() is False
+    terms.unlink()  # editors that save via delete + rename
+    assert vocab.check() is False
+    assert vocab.current is current and vocab.stats()["reloads"] == 0
+
+
+def test_failed_load_keeps_current_and_reports_error(tmp_path):
+    terms = tmp_path / "skills.txt"
+    _write(terms, "python\n")
+    calls = []
+
+    def flaky(path):
+        calls.append(path)
+        if len(calls) > 1:
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "bad byte")
+        return read_terms(path)
+
+    vocab = SkillVocabulary(terms, load=flaky)
+    assert vocab.reload() is False
+    assert vocab.current.terms == ("python",)
+    assert "UnicodeDecodeError" in vocab.stats()["error"]
@@ -121,3 +121,46 @@ def test_skills_by_resume_multiple_ids(client, monkeypatch):
 
         # Each should have at least one recognizable skill
         assert len(data["skills"]) >= 1
+
+
+def test_skills_extract_batch_mixes_texts_and_ids(client, monkeypatch):
+    """
+    /skills/extract_batch: raw texts keyed by their index (or given key),
+    stored resumes keyed by id, unknown ids listed in not_found.
+    """
+    texts = {"r1": "C++, Linux, Bash; Kubernetes on GCP.", "r2": "TypeScript and PostgreSQL."}
+
+    def fake_load(rid):
+        if rid not in texts:
+            return None
+        return {"id": rid, "name": f"{rid}.pdf", "text": texts[rid]}
+
+    monkeypatch.setattr(api, "load_resume_for_skills", fake_load)
+
+    resp = client.post(
+        "/skills/extract_batch",
+        json={"texts": ["Python and SQL", ""], "resume_ids": ["r1", "r2", "nope", "r1"]},
+    )
+    assert resp.status_code == 200
+    data = resp.get_json()
+
+    assert set(data["texts"]) == {"0", "1"}
+    assert data["texts"]["0"]["skills"] == api.extract_skills_from_text("Python and SQL")
+    assert data["texts"]["1"]["skills"] == []
+    assert set(data["resumes"]) == {"r1", "r2"}
+    assert data["resumes"]["r1"]["name"] == "r1.pdf"
+    assert data["resumes"]["r2"]["skills"] == api.extract_skills_from_text(texts["r2"])
+    assert data["not_found"] == ["nope"]
+
+
+def test_skills_extract_batch_validates_body(client):
+    assert client.post("/skills/extract_batch", json={}).status_code == 400
+    assert client.post("/skills/extract_batch", json={"texts": "just one"}).status_code == 400
+    too_many = {"texts": ["x"] * (api.SKILLS_BATCH_MAX + 1)}
+    assert client.post("/skills/extract_batch", json=too_many).status_code == 400
+
+
+def test_skills_gap_requires_job_description(client):
+    resp = client.post("/skills/gap", json={"job_description": "  "})
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
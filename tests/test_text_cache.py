@@ -0,0 +1,120 @@
+"""
+Unit tests for the normalized text cache (matcher/text_cache.py).
+A counting fake stands in for normalize_text, so no NLTK needed.
+"""
+
+from matcher.text_cache import NormalizedTextCache
+
+
+class CountingNormalizer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return " ".join(w for w in text.lower().split() if w.isalpha())
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def get(self, key):
+        if key not in self.objects:
+            raise KeyError(key)
+        return self.objects[key]
+
+    def put(self, key, data):
+        self.objects[key] = data
+
+    def delete(self, key):
+        self.objects.pop(key, None)
+
+
+RESUME = "Senior Python Developer with 5 years of Flask and SQL"
+
+
+def test_memory_hit_skips_normalizer():
+    norm = CountingNormalizer()
+    cache = NormalizedTextCache(norm, maxsize=8)
+
+    first = cache.normalize(RESUME)
+    assert cache.normalize(RESUME) == first == norm(RESUME)
+    assert norm.calls == 2  # one from the cache miss, one from the assert above
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    norm = CountingNormalizer()
+    NormalizedTextCache(norm, disk_dir=tmp_path).normalize(RESUME)
+    assert norm.calls == 1
+
+    # new process: empty memory, same disk dir
+    restarted = NormalizedTextCache(norm, disk_dir=tmp_path)
+    assert restarted.normalize(RESUME) == norm(RESUME)
+    assert norm.calls == 2  # only the direct call above
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_changed_text_or_version_is_a_miss(tmp_path):
+    norm = CountingNormalizer()
+    cache = NormalizedTextCache(norm, disk_dir=tmp_path)
+    cache.normalize(RESUME)
+    cache.normalize(RESUME + " Docker")
+    assert norm.calls == 2
+
+    bumped = NormalizedTextCache(norm, disk_dir=tmp_path, version="2")
+    bumped.normalize(RESUME)
+    assert norm.calls == 3
+
+
+def test_adhoc_text_stays_in_memory(tmp_path):
+    norm = CountingNormalizer()
+    cache = NormalizedTextCache(norm, disk_dir=tmp_path)
+    cache.normalize("job description text", persist=False)
+    assert not any(tmp_path.rglob("*.txt"))
+    cache.normalize("job description text", persist=False)
+    assert norm.calls == 1
+
+
+def test_s3_tier_under_user_prefix(tmp_path):
+    s3 = FakeS3()
+    norm = CountingNormalizer()
+    kwargs = dict(remote_get=s3.get, remote_put=s3.put, remote_delete=s3.delete)
+
+    NormalizedTextCache(norm, **kwargs).normalize(RESUME, user_id="u1")
+    assert norm.calls == 1
+    (key,) = s3.objects
+    assert key.startswith("users/u1/normalized/")
+
+    # another worker with a cold memory + disk picks it up from S3
+    other = NormalizedTextCache(norm, disk_dir=tmp_path, **kwargs)
+    assert other.normalize(RESUME, user_id="u1") == norm(RESUME)
+    assert norm.calls == 2
+    assert other.stats()["remote_hits"] == 1
+    assert any(tmp_path.rglob("*.txt"))  # and keeps a local copy
+
+
+def test_forget_drops_every_tier(tmp_path):
+    s3 = FakeS3()
+    norm = CountingNormalizer()
+    cache = NormalizedTextCache(
+        norm, disk_dir=tmp_path, remote_get=s3.get, remote_put=s3.put, remote_delete=s3.delete
+    )
+    cache.normalize(RESUME, user_id="u1")
+    cache.forget(RESUME, user_id="u1")
+
+    assert not s3.objects
+    assert not any(tmp_path.rglob("*.txt"))
+    cache.normalize(RESUME, user_id="u1")
+    assert norm.calls == 2
+
+
+def test_lru_evicts_oldest():
+    norm = CountingNormalizer()
+    cache = NormalizedTextCache(norm, maxsize=2)
+    for text in ("a b", "c d", "e f"):
+        cache.normalize(text)
+    assert cache.stats()["size"] == 2
+    cache.normalize("a b")
+    assert norm.calls == 4